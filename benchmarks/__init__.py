@@ -0,0 +1 @@
+"""Benchmarks for Munim. Run each module with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,134 @@
+"""Benchmark loading parsed history from JSON outputs and from an archive.
+
+Five years of synthetic transactions over a few accounts are written as
+pretty JSON outputs, one per account and month, and converted into one
+archive with ``archive_outputs``. The history is then loaded whole as
+dicts, and one year's spending is summed: by parsing every output, and
+from the archive's mapped date and amount columns. Results must agree.
+
+Usage: python -m benchmarks.archive [--rows N] [--accounts N]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from parser.archive import Archive
+from parser.writer import JsonWriter, archive_outputs, read_transactions
+from pathlib import Path
+
+from benchmarks.generate import MERCHANTS
+
+CATEGORIES = ("food", "grocery", "fuel", "travel", "shopping", "bills", "salary")
+YEARS = 5
+
+
+def history(rows: int, accounts: int, seed: int = 7) -> dict:
+    """Return ``{output name: transactions}`` spread over ``YEARS`` years."""
+    rng = random.Random(seed)
+    first = date(2020, 1, 1)
+    days = YEARS * 365
+    outputs: dict = {}
+    for i in range(rows):
+        day = first + timedelta(days=i * days // rows)
+        account = f"bank{i % accounts}"
+        debit = rng.random() < 0.75
+        amount = rng.randint(100, 25_000_000) / 100
+        outputs.setdefault(f"{account}_{day:%Y_%m}", []).append(
+            {
+                "date": day.isoformat(),
+                "description": f"{rng.choice(MERCHANTS)}-{rng.randint(1, 5000)}",
+                "dr_amount": amount if debit else 0.0,
+                "cr_amount": 0.0 if debit else amount,
+                "account": account,
+                "category": rng.choice(CATEGORIES),
+                "type": "debit" if debit else "credit",
+            }
+        )
+    return outputs
+
+
+def load_json(directory: Path) -> list:
+    """Return every transaction of the JSON outputs."""
+    return [
+        t for path in sorted(directory.glob("*.json")) for t in read_transactions(path)
+    ]
+
+
+def spent_json(directory: Path, start: str, end: str) -> int:
+    """Return the paise spent from ``start`` through ``end``, parsing every output."""
+    total = 0
+    for path in sorted(directory.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            for transaction in json.load(f):
+                if start <= transaction["date"] <= end:
+                    total += round(transaction["dr_amount"] * 100)
+    return total
+
+
+def spent_archive(path: Path, start: str, end: str) -> int:
+    """Return the paise spent from ``start`` through ``end`` from the archive."""
+    with Archive(path) as archive:
+        amounts = archive.column("dr_amount", start, end)
+        total = sum(amounts)
+        amounts.release()
+    return total
+
+
+def timed(func, *args):
+    """Return ``(result, seconds)`` of one call."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def report(label: str, json_seconds: float, archive_seconds: float):
+    """Print one query's timings."""
+    speedup = json_seconds / archive_seconds
+    print(f"{label:<20} {json_seconds:>8.3f} {archive_seconds:>10.3f} {speedup:>8.1f}x")
+
+
+def write_history(workdir: Path, rows: int, accounts: int) -> tuple:
+    """Write the JSON outputs, convert them and return ``(json_dir, archive path)``."""
+    json_dir = workdir / "json"
+    json_dir.mkdir()
+    for name, transactions in history(rows, accounts).items():
+        with JsonWriter(json_dir / f"{name}.json") as writer:
+            writer.write_many(transactions)
+    path = workdir / "history.munim"
+    (outputs, rows), seconds = timed(archive_outputs, json_dir, path)
+    json_size = sum(p.stat().st_size for p in json_dir.iterdir()) / 2**20
+    archive_size = path.stat().st_size / 2**20
+    print(f"{rows:,} transactions in {outputs:,} outputs")
+    print(f"converted in {seconds:.2f}s: {json_size:.1f} MB JSON, ", end="")
+    print(f"{archive_size:.1f} MB archive")
+    return json_dir, path
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    arg_parser.add_argument("--accounts", type=int, default=4)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        json_dir, path = write_history(Path(workdir), args.rows, args.accounts)
+        print(f"{'query':<20} {'JSON s':>8} {'archive s':>10} {'speedup':>9}")
+        expected, json_seconds = timed(load_json, json_dir)
+        with Archive(path) as archive:
+            loaded, archive_seconds = timed(list, archive.transactions())
+        assert loaded == sorted(expected, key=lambda t: t["date"]), "load diverged"
+        report("load all as dicts", json_seconds, archive_seconds)
+
+        start, end = "2023-01-01", "2023-12-31"
+        expected, json_seconds = timed(spent_json, json_dir, start, end)
+        total, archive_seconds = timed(spent_archive, path, start, end)
+        assert total == expected, "sum diverged"
+        report("spent in 2023", json_seconds, archive_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark the batch columnar engine against per-row parsing, per bank layout.
+
+Rows are generated in memory in each bank's layout (see
+``benchmarks.generate``) and parsed by ``parse_rows`` and by ``parse_batch``
+in blocks of ``BATCH_ROWS``; the records must be identical.
+
+Usage: python -m benchmarks.batch [--rows N] [--banks hdfc,sbi]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from parser import batch
+from parser.dates import DateNormalizer
+
+from benchmarks.generate import LAYOUTS
+
+
+def timed(parser, parse_rows, rows: list, block: int):
+    """Parse ``rows`` in blocks with a fresh date cache; return (records, seconds)."""
+    parser.date_normalizer = DateNormalizer()
+    start = time.perf_counter()
+    records = []
+    for first in range(0, len(rows), block):
+        last = first + block
+        records.extend(parse_rows(rows[first:last]))
+    return records, time.perf_counter() - start
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    arg_parser.add_argument("--banks", default=",".join(LAYOUTS))
+    args = arg_parser.parse_args()
+
+    from cli import PARSERS  # pylint: disable=import-outside-toplevel
+
+    engine = "numpy" if batch.np is not None else "array"
+    print(f"{args.rows:,} rows per bank, batch amounts via {engine}")
+    print(f"{'bank':<10} {'row':>10} {'batch':>10} {'speedup':>8}")
+    for bank in args.banks.split(","):
+        rng = random.Random(7)
+        build_row = LAYOUTS[bank][3]
+        start = date(2015, 1, 1)
+        rows = [
+            build_row(rng, start + timedelta(days=i * 3650 // args.rows), i)
+            for i in range(args.rows)
+        ]
+        parser = PARSERS[bank]()
+        expected, row_seconds = timed(parser, parser.parse_rows, rows, batch.BATCH_ROWS)
+        records, batch_seconds = timed(
+            parser, parser.parse_batch, rows, batch.BATCH_ROWS
+        )
+        assert records == [tx.to_dict() for tx in expected], f"{bank} diverged"
+        print(
+            f"{bank:<10} {row_seconds:>9.2f}s {batch_seconds:>9.2f}s "
+            f"{row_seconds / batch_seconds:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark the compiled keyword matcher against the nested keyword loop.
+
+The compiled matcher also runs behind the per-merchant category cache of
+``ExpenseMapper.categorize``, which strips reference numbers before lookup.
+
+Usage: python -m benchmarks.categorize [--rows N] [--keywords N]
+"""
+
+import argparse
+import random
+import string
+import time
+from parser.mapper import ExpenseMapper, MapperState
+from parser.matcher import UNCATEGORIZED, KeywordMatcher
+from parser.merchant import MerchantCache, MerchantNormalizer, pinned_keywords
+from pathlib import Path
+
+import yaml
+
+
+def nested_loop(expense_mapper: dict, description: str) -> str:
+    """Reference implementation: the original per-keyword substring scan."""
+    ret_category = UNCATEGORIZED
+    desc_lower = description.lower()
+    for category, keywords in expense_mapper.items():
+        for keyword in keywords:
+            if keyword.lower() in desc_lower:
+                ret_category = category
+    return ret_category
+
+
+def build_mapper(extra_keywords: int, rng: random.Random) -> dict:
+    """Load expense_mapper.yaml and pad it with synthetic merchant keywords."""
+    with open(Path(".") / "expense_mapper.yaml", "r", encoding="utf-8") as f:
+        mapper = yaml.safe_load(f)
+    categories = list(mapper)
+    for _ in range(extra_keywords):
+        merchant = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(6, 14)))
+        mapper[rng.choice(categories)].append(f"UPI-{merchant}")
+    return mapper
+
+
+def build_descriptions(mapper: dict, rows: int, rng: random.Random) -> list:
+    """Generate descriptions, roughly half of which contain a known keyword."""
+    keywords = [kw for kws in mapper.values() for kw in kws]
+    descriptions = []
+    for _ in range(rows):
+        ref = "".join(rng.choices(string.digits, k=12))
+        if rng.random() < 0.5:
+            descriptions.append(f"UPI-{rng.choice(keywords)}-{ref}@okaxis-UPI")
+        else:
+            noise = "".join(rng.choices(string.ascii_uppercase + " ", k=24))
+            descriptions.append(f"POS {noise} {ref}")
+    return descriptions
+
+
+def timed(label: str, func, descriptions: list) -> list:
+    """Run func over every description and print the throughput."""
+    start = time.perf_counter()
+    result = [func(description) for description in descriptions]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {elapsed:8.2f}s  {len(descriptions) / elapsed:>12,.0f} rows/s")
+    return result
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    arg_parser.add_argument("--keywords", type=int, default=3000)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mapper = build_mapper(args.keywords, rng)
+    descriptions = build_descriptions(mapper, args.rows, rng)
+    total = sum(len(kws) for kws in mapper.values())
+    print(f"{args.rows:,} descriptions, {len(mapper)} categories, {total:,} keywords")
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(mapper)
+    print(f"{'build':<14} {time.perf_counter() - start:8.2f}s")
+
+    compiled = timed("compiled", matcher.match, descriptions)
+    cached_mapper = ExpenseMapper()
+    cached_mapper.state = MapperState(
+        "benchmark",
+        mapper,
+        matcher,
+        pinned_keywords(matcher.literals),
+        MerchantCache("benchmark"),
+    )
+    normalizer = MerchantNormalizer()
+    cached = timed(
+        "merchant cache",
+        lambda d: cached_mapper.categorize(d, normalizer),
+        descriptions,
+    )
+    assert cached == compiled, "merchant cache diverged from the matcher"
+    nested = timed("nested loop", lambda d: nested_loop(mapper, d), descriptions)
+    assert compiled == nested, "compiled matcher diverged from the nested loop"
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Generate synthetic bank statements in each bank's exact layout.
+
+Usage: python -m benchmarks.generate BANK [--rows N] [--out DIR] [--seed N]
+"""
+
+import argparse
+import csv
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+MERCHANTS = [
+    "UPI-SWIGGY-swiggy@icici",
+    "UPI-MUKESH SEERVE-paytmqr28100505@paytm",
+    "POS 4591XXXXXXXX1234 DMART HOODI",
+    "NEFT CR-HDFC0000001-ACME TECHNOLOGIES SALARY",
+    "UPI-ZEPTO-zepto.payu@hdfcbank",
+    "ATW-512345XXXXXX6789-S1ANBG23-BANGALORE",
+    "ACH D- TP ACH ICICIPRULIFE-1234567",
+    "AMAZON PAY INDIA PRIVATE LIMITED",
+    "IRCTC UTS MUMBAI",
+    "BBPS PAYMENT CREDIT CARD 4375XXXXXXXX1234",
+]
+
+
+def _amount(rng: random.Random, grouped: bool) -> str:
+    """Return a random rupee amount, with Indian thousands grouping if asked."""
+    value = rng.randint(100, 25_000_000) / 100
+    return f"{value:,.2f}" if grouped else f"{value:.2f}"
+
+
+def _split(rng: random.Random, grouped: bool = True):
+    """Return (debit, credit) with roughly three debits per credit."""
+    amount = _amount(rng, grouped)
+    return (amount, "") if rng.random() < 0.75 else ("", amount)
+
+
+def _hdfc(rng, day: date, i: int):
+    debit, credit = _split(rng)
+    narration = f"{rng.choice(MERCHANTS)}-{rng.randint(10**11, 10**12 - 1)}"
+    when = day.strftime("%d/%m/%y")
+    return [when, narration, when, debit, credit, f"{i:016d}", _amount(rng, True)]
+
+
+def _icici(rng, day: date, i: int):
+    debit, credit = _split(rng)
+    narration = f"{rng.choice(MERCHANTS)}/{i}"
+    when = day.strftime("%d-%m-%Y")
+    return [
+        when,
+        rng.choice(["UPI", "NEFT", "POS", ""]),
+        narration,
+        credit,
+        debit,
+        "1.00",
+    ]
+
+
+def _sbi(rng, day: date, i: int):
+    debit, credit = _split(rng)
+    when = day.strftime("%d-%b-%y")
+    narration = f"TO TRANSFER-{rng.choice(MERCHANTS)}"
+    return [when, when, narration, f"TRANSFER {i}", debit, credit, _amount(rng, True)]
+
+
+def _axis(rng, day: date, i: int):
+    debit, credit = _split(rng)
+    when = day.strftime("%d-%m-%Y")
+    narration = f"{rng.choice(MERCHANTS)}/{i}"
+    return [when, "", narration, debit, credit, _amount(rng, True), "4321"]
+
+
+def _cc_hdfc(rng, day: date, i: int):
+    when = f"{day.strftime('%d/%m/%Y')} {rng.randint(0, 23):02d}:{i % 60:02d}:00"
+    return [
+        "Domestic~",
+        "~ABHISHEK~",
+        f"~{when}~",
+        f"~{rng.choice(MERCHANTS)}~",
+        f"~ {_amount(rng, True)}~",
+        "~~",
+        f"~{rng.randint(0, 50)}",
+    ]
+
+
+def _cc_icici(rng, day: date, i: int):
+    return [
+        day.strftime("%d/%m/%Y"),
+        str(i),
+        rng.choice(MERCHANTS),
+        str(rng.randint(0, 40)),
+        "",
+        _amount(rng, False),
+        "",
+    ]
+
+
+# bank -> (delimiter, header, preamble rows, row builder)
+LAYOUTS = {
+    "hdfc": (
+        ",",
+        [
+            "Date",
+            "Narration",
+            "Value Date",
+            "Debit Amount",
+            "Credit Amount",
+            "Chq/Ref Number",
+            "Closing Balance",
+        ],
+        [],
+        _hdfc,
+    ),
+    "icici": (
+        ",",
+        ["DATE", "MODE", "PARTICULARS", "DEPOSITS", "WITHDRAWALS", "BALANCE"],
+        [["ACCOUNT TYPE", "ACCOUNT NUMBER"], ["Savings", "XXXXXXXX1234"]],
+        _icici,
+    ),
+    "sbi": (
+        ",",
+        [
+            "Txn Date",
+            "Value Date",
+            "Description",
+            "Ref No./Cheque No.",
+            "Debit",
+            "Credit",
+            "Balance",
+        ],
+        [],
+        _sbi,
+    ),
+    "axis": (
+        ",",
+        ["Tran Date", "CHQNO", "PARTICULARS", "DR", "CR", "BAL", "SOL"],
+        [],
+        _axis,
+    ),
+    "cc_hdfc": (
+        "|",
+        [
+            "Transaction type~",
+            "~Primary / Addon Customer Name~",
+            "~DATE~",
+            "~Description~",
+            "~AMT~",
+            "~Debit /Credit~",
+            "~Base NeuCoins*",
+        ],
+        [],
+        _cc_hdfc,
+    ),
+    "cc_icici": (
+        ",",
+        [
+            "Date",
+            "Sr.No.",
+            "Transaction Details",
+            "Reward Point Header",
+            "Intl.Amount",
+            "Amount(in Rs)",
+            "BillingAmountSign",
+        ],
+        [],
+        _cc_icici,
+    ),
+}
+
+
+def write_statement(bank: str, path: Path, rows: int, seed: int = 7) -> Path:
+    """Write a synthetic statement for ``bank`` with ``rows`` transactions."""
+    delimiter, header, preamble, build_row = LAYOUTS[bank]
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(preamble)
+        for i in range(rows):
+            day = start + timedelta(days=i * 3650 // max(rows, 1))
+            writer.writerow(build_row(rng, day, i))
+    return path
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("bank", choices=sorted(LAYOUTS))
+    arg_parser.add_argument("--rows", type=int, default=10_000)
+    arg_parser.add_argument("--out", default="./data/statement")
+    arg_parser.add_argument("--seed", type=int, default=7)
+    args = arg_parser.parse_args()
+    path = Path(args.out) / f"{args.bank}_synthetic.csv"
+    write_statement(args.bank, path, args.rows, args.seed)
+    print(f"Wrote {args.rows:,} rows to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark memory-mapped block reading against text-mode ``read_csv``.
+
+A synthetic statement is written in a bank's layout, in UTF-8 and in
+cp1252, and its rows are read three ways: the previous ``read_csv`` (a
+text-mode file with a fixed encoding, decoded as ``csv.reader`` asks for
+lines) and a ``MappedStatement`` read through ``csv.reader``, with and
+without the CSV parsing. Rows must be identical. Sniffing and routing of a file under
+a generic name are timed too.
+
+Usage: python -m benchmarks.ingest [--rows N] [--bank hdfc]
+"""
+
+import argparse
+import csv
+import tempfile
+import time
+from parser.banks import LAYOUTS as BANKS
+from parser.ingest import MappedStatement, route
+from pathlib import Path
+
+from benchmarks.generate import LAYOUTS, write_statement
+
+
+def text_rows(path: Path, encoding: str, delimiter: str):
+    """Yield rows as ``read_csv`` did: a text-mode file with a fixed encoding."""
+    with open(path, "r", encoding=encoding) as f:
+        yield from csv.reader(f, delimiter=delimiter)
+
+
+def mapped_rows(path: Path, _, delimiter: str):
+    """Yield rows from the memory-mapped statement, decoded in blocks."""
+    with MappedStatement(path) as statement:
+        yield from csv.reader(statement, delimiter=delimiter)
+
+
+def text_lines(path: Path, encoding: str, _):
+    """Yield the lines of a text-mode file, without CSV parsing."""
+    with open(path, "r", encoding=encoding) as f:
+        yield from f
+
+
+def mapped_lines(path: Path, *_):
+    """Yield the lines of the memory-mapped statement, without CSV parsing."""
+    with MappedStatement(path) as statement:
+        yield from statement
+
+
+def count(rows) -> int:
+    """Consume ``rows`` and return how many there were."""
+    return sum(1 for _ in rows)
+
+
+def best(func, *args, repeat: int = 5) -> float:
+    """Return the best seconds of ``repeat`` runs of ``func``, without keeping rows."""
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count(func(*args))
+        seconds = min(seconds, time.perf_counter() - start)
+    return seconds
+
+
+def compare(label: str, path: Path, encoding: str, delimiter: str, size_mb: float):
+    """Print the throughput of each way of reading one statement."""
+    rows = list(text_rows(path, encoding, delimiter))
+    assert list(mapped_rows(path, encoding, delimiter)) == rows, "diverged"
+    for name, func in (
+        ("text csv.reader", text_rows),
+        ("mapped csv.reader", mapped_rows),
+        ("text lines only", text_lines),
+        ("mapped lines only", mapped_lines),
+    ):
+        seconds = best(func, path, encoding, delimiter)
+        print(
+            f"{label:<8} {name:<20} {seconds:>7.2f}s "
+            f"{size_mb / seconds:>8.0f} {len(rows) / seconds:>11,.0f}"
+        )
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    arg_parser.add_argument("--bank", default="hdfc", choices=sorted(LAYOUTS))
+    args = arg_parser.parse_args()
+    delimiter = LAYOUTS[args.bank][0]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        utf8 = write_statement(args.bank, Path(workdir) / "statement.csv", args.rows)
+        cp1252 = Path(workdir) / "statement-cp1252.csv"
+        text = utf8.read_text(encoding="utf-8").replace("DMART", "DMÅRT")
+        cp1252.write_text(text, encoding="cp1252")
+        size_mb = utf8.stat().st_size / 2**20
+        print(f"{args.bank}: {args.rows:,} rows, {size_mb:.0f} MB")
+        print(f"{'file':<8} {'read':<20} {'seconds':>8} {'MB/s':>8} {'rows/s':>11}")
+        compare("utf-8", utf8, "utf-8-sig", delimiter, size_mb)
+        compare("cp1252", cp1252, "cp1252", delimiter, size_mb)
+
+        start = time.perf_counter()
+        bank = route(utf8, {bank: spec["prefix"] for bank, spec in BANKS.items()})
+        sniff_ms = (time.perf_counter() - start) * 1000
+        assert bank == args.bank, bank
+        print(f"sniff and route {utf8.name} to {bank}: {sniff_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
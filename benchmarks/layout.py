@@ -0,0 +1,70 @@
+"""Benchmark parsers compiled from bank layouts against the generic parse.
+
+Rows are generated in memory in each bank's layout and parsed by the
+compiled ``parse`` of the bank's parser and by the generic, mapping-driven
+``BaseParser.parse``; the records must be identical. Layouts with a single
+amount column have no generic equivalent and are timed alone.
+
+Usage: python -m benchmarks.layout [--rows N] [--banks hdfc,sbi]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from parser.base import BaseParser
+from parser.dates import DateNormalizer
+
+from benchmarks.generate import LAYOUTS
+
+
+def timed(parser, parse, rows: list, repeat: int = 3) -> tuple:
+    """Parse ``rows`` with a fresh date cache; return (records, best seconds).
+
+    Categories are cached per merchant across runs, so the first, cold run
+    is only a warm-up when ``repeat`` is more than one.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        parser.date_normalizer = DateNormalizer(preferred=parser.layout.date_format)
+        parser.occurrences.reset()
+        start = time.perf_counter()
+        records = [parse(parser, row) for row in rows]
+        best = min(best, time.perf_counter() - start)
+    return records, best
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    arg_parser.add_argument("--banks", default=",".join(LAYOUTS))
+    args = arg_parser.parse_args()
+
+    from cli import PARSERS  # pylint: disable=import-outside-toplevel
+
+    print(f"{args.rows:,} rows per bank")
+    print(f"{'bank':<10} {'generic':>10} {'compiled':>10} {'speedup':>8}")
+    for bank in args.banks.split(","):
+        rng = random.Random(7)
+        build_row = LAYOUTS[bank][3]
+        start = date(2015, 1, 1)
+        rows = [
+            build_row(rng, start + timedelta(days=i * 3650 // args.rows), i)
+            for i in range(args.rows)
+        ]
+        parser = PARSERS[bank]()
+        records, compiled_seconds = timed(parser, type(parser).parse, rows)
+        if parser.layout.credit:
+            print(f"{bank:<10} {'-':>10} {compiled_seconds:>9.2f}s {'-':>8}")
+            continue
+        expected, generic_seconds = timed(parser, BaseParser.parse, rows)
+        assert records == expected, f"{bank} diverged"
+        print(
+            f"{bank:<10} {generic_seconds:>9.2f}s {compiled_seconds:>9.2f}s "
+            f"{generic_seconds / compiled_seconds:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark loading the expense mapper: YAML and compile vs the pickle cache.
+
+A mapper padded with synthetic keywords is written to a temporary directory
+and loaded by fresh ``ExpenseMapper`` instances, once without a cache and
+once from the cache the first load wrote.
+
+Usage: python -m benchmarks.mapper [--keywords N] [--repeat N]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from parser.mapper import ExpenseMapper
+from pathlib import Path
+
+import yaml
+
+from benchmarks.categorize import build_mapper
+
+
+def best_of(repeat: int, func) -> float:
+    """Return the fastest of ``repeat`` timed calls of ``func``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--keywords", type=int, default=20_000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    mapper = build_mapper(args.keywords, random.Random(42))
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "expense_mapper.yaml"
+        path.write_text(yaml.safe_dump(mapper), encoding="utf-8")
+        cache_dir = Path(workdir) / "cache"
+
+        def cold():
+            for stale in cache_dir.glob("*"):
+                stale.unlink()
+            ExpenseMapper(path, cache_dir).refresh()
+
+        cold_seconds = best_of(args.repeat, cold)
+        cached_seconds = best_of(
+            args.repeat, lambda: ExpenseMapper(path, cache_dir).refresh()
+        )
+
+    total = sum(len(keywords) for keywords in mapper.values())
+    print(f"{len(mapper)} categories, {total:,} keywords")
+    print(f"{'yaml + compile':<16} {cold_seconds * 1000:9.1f} ms")
+    print(f"{'cache':<16} {cached_seconds * 1000:9.1f} ms")
+    print(f"speedup: {cold_seconds / cached_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark the read/parse/write pipeline against a serial run on slow storage.
+
+Synthetic HDFC statements are parsed serially and with ``--pipeline`` in a
+temporary directory. Network-mounted storage is simulated by sleeping for
+``--latency-ms`` on every 64 KiB read or written by the parser and the
+writers; the outputs of both runs must be identical.
+
+Usage: python -m benchmarks.pipeline [--files N] [--rows N] [--latency-ms N]
+"""
+
+import argparse
+import io
+import logging
+import os
+import tempfile
+import time
+from parser import base, writer
+from parser.runner import Runner
+from pathlib import Path
+
+from benchmarks.generate import write_statement
+
+BLOCK = 64 * 1024
+
+
+def slow_open(latency: float):
+    """Return an ``open`` for text files that sleeps ``latency`` per block."""
+
+    class SlowFile(io.FileIO):
+        """A raw file that waits on every read and write, like a network mount."""
+
+        def readinto(self, buffer):
+            time.sleep(latency)
+            return super().readinto(buffer)
+
+        def write(self, data):
+            time.sleep(latency)
+            return super().write(data)
+
+    def opener(path, mode="r", encoding=None):
+        raw = SlowFile(path, "r" if "r" in mode else "w")
+        if "r" in mode:
+            buffered = io.BufferedReader(raw, BLOCK)
+        else:
+            buffered = io.BufferedWriter(raw, BLOCK)
+        return io.TextIOWrapper(buffered, encoding=encoding)
+
+    return opener
+
+
+def timed_run(pipeline: bool) -> float:
+    """Parse every statement in the working directory and return the seconds."""
+    # pylint: disable-next=import-outside-toplevel
+    from parser.registry import PARSERS
+
+    runner = Runner(logging.getLogger("munim"), force=True, pipeline=pipeline)
+    start = time.perf_counter()
+    assert runner.run([("hdfc", PARSERS["hdfc"]())]) == 0
+    return time.perf_counter() - start
+
+
+def outputs(json_dir: Path) -> dict:
+    """Return the text of every JSON output."""
+    return {path.name: path.read_text(encoding="utf-8") for path in json_dir.iterdir()}
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--files", type=int, default=8)
+    arg_parser.add_argument("--rows", type=int, default=50_000)
+    arg_parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = arg_parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        statement_dir = Path(workdir) / "data" / "statement"
+        statement_dir.mkdir(parents=True)
+        json_dir = Path(workdir) / "data" / "json"
+        json_dir.mkdir()
+        for i in range(args.files):
+            write_statement("hdfc", statement_dir / f"hdfc_{i:03}.csv", args.rows, i)
+        os.chdir(workdir)
+        opener = slow_open(args.latency_ms / 1000)
+        for module in (base, writer):
+            setattr(module, "open", opener)
+        try:
+            serial = timed_run(pipeline=False)
+            expected = outputs(json_dir)
+            pipelined = timed_run(pipeline=True)
+            assert outputs(json_dir) == expected, "pipelined outputs diverged"
+        finally:
+            for module in (base, writer):
+                delattr(module, "open")
+            os.chdir(cwd)
+
+    print(
+        f"{args.files} files x {args.rows:,} rows, "
+        f"{args.latency_ms:g} ms per {BLOCK // 1024} KiB read or written"
+    )
+    print(f"serial    {serial:>8.2f}s")
+    print(f"pipeline  {pipelined:>8.2f}s  ({serial / pipelined:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark pairing transfers across accounts.
+
+Synthetic transactions are generated for six accounts over several years,
+with a monthly card payment per card and a few transfers between savings
+accounts, each showing up a day or two later on the other side. Pairing
+is timed in memory and over JSON outputs, one per account and month.
+
+Usage: python -m benchmarks.reconcile [--years N] [--rows N]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from parser.reconcile import pair_transfers, reconcile_outputs
+from parser.writer import JsonWriter
+from pathlib import Path
+
+from benchmarks.generate import MERCHANTS
+
+SAVINGS = ("Hdfc", "Icici", "Sbi", "Axis")
+CARDS = ("Hdfc-CC", "Icici-CC")
+
+
+def transaction(day: date, account: str, dr_amount=0.0, cr_amount=0.0) -> dict:
+    """Return one output transaction."""
+    return {
+        "date": day.isoformat(),
+        "description": MERCHANTS[day.toordinal() % len(MERCHANTS)],
+        "dr_amount": dr_amount,
+        "cr_amount": cr_amount,
+        "account": account,
+        "category": "uncategorized",
+        "type": "expense" if dr_amount > 0 else "deposit",
+    }
+
+
+def generate(years: int, rows: int, rng: random.Random) -> tuple:
+    """Return ``(transactions, transfers)`` over ``years`` of activity."""
+    transactions = []
+    transfers = 0
+    first = date(2015, 1, 1)
+    for month in range(years * 12):
+        start = first + timedelta(days=month * 365 // 12)
+        for account in SAVINGS + CARDS:
+            for _ in range(rows):
+                day = start + timedelta(days=rng.randrange(30))
+                amount = rng.randint(100, 500_000) / 100
+                if rng.random() < 0.75:
+                    transactions.append(transaction(day, account, dr_amount=amount))
+                else:
+                    transactions.append(transaction(day, account, cr_amount=amount))
+        payments = [(rng.choice(SAVINGS), card) for card in CARDS]
+        payments.append(tuple(rng.sample(SAVINGS, 2)))
+        for source, target in payments:
+            day = start + timedelta(days=rng.randrange(28))
+            amount = rng.randint(100_000, 20_000_000) / 100
+            lag = timedelta(days=rng.randint(0, 2))
+            transactions.append(transaction(day, source, dr_amount=amount))
+            transactions.append(transaction(day + lag, target, cr_amount=amount))
+            transfers += 1
+    return transactions, transfers
+
+
+def write_outputs(json_dir: Path, transactions: list) -> int:
+    """Write one JSON output per account and month; return how many."""
+    outputs: dict = {}
+    for t in transactions:
+        outputs.setdefault((t["account"], t["date"][:7]), []).append(t)
+    for (account, month), rows in outputs.items():
+        with JsonWriter(json_dir / f"{account.lower()}_{month}.json") as writer:
+            writer.write_many(rows)
+    return len(outputs)
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--years", type=int, default=10)
+    arg_parser.add_argument("--rows", type=int, default=150, help="per account-month")
+    args = arg_parser.parse_args()
+
+    transactions, transfers = generate(args.years, args.rows, random.Random(5))
+    start = time.perf_counter()
+    pairs = pair_transfers(transactions)
+    pair_seconds = time.perf_counter() - start
+    assert len(pairs) >= transfers, "planted transfers were not all paired"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        json_dir = Path(workdir)
+        outputs = write_outputs(json_dir, transactions)
+        start = time.perf_counter()
+        reconcile_outputs(json_dir)
+        first_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        reconcile_outputs(json_dir)
+        again_seconds = time.perf_counter() - start
+
+    print(
+        f"{len(transactions):,} transactions, {len(SAVINGS + CARDS)} accounts, "
+        f"{args.years} years: {len(pairs):,} pairs ({transfers:,} planted)"
+    )
+    print(f"pair in memory             {pair_seconds:>8.3f}s")
+    print(f"reconcile {outputs:,} outputs     {first_seconds:>8.3f}s")
+    print(f"reconcile again (no-op)    {again_seconds:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Measure memory held by parsed transactions: per-row dicts vs Transaction records.
+
+Rows are generated in the HDFC layout and parsed once up front; tracemalloc
+then measures the memory still held by a list of 1M dicts (the old
+``parse`` output) and by a list of 1M records.
+
+Usage: python -m benchmarks.records [--rows 1000000]
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import date, timedelta
+from parser.registry import PARSERS
+
+from benchmarks.generate import LAYOUTS
+
+
+def held_bytes(build) -> tuple:
+    """Return (bytes still allocated after build(), the built object)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(7)
+    build_row = LAYOUTS["hdfc"][3]
+    start = date(2015, 1, 1)
+    rows = [
+        build_row(rng, start + timedelta(days=i * 3650 // args.rows), i)
+        for i in range(args.rows)
+    ]
+    parser = PARSERS["hdfc"]()
+
+    dict_bytes, dicts = held_bytes(
+        lambda: [parser.parse(row).to_dict() for row in rows]
+    )
+    del dicts
+    record_bytes, records = held_bytes(lambda: [parser.parse(row) for row in rows])
+    del records
+
+    scale = 1_000_000 / args.rows
+    print(f"{args.rows:,} transactions")
+    print(
+        f"{'dicts':<10} {dict_bytes / 2**20:>9.1f} MB  {dict_bytes / args.rows:>6.0f} B/tx"
+    )
+    print(
+        f"{'records':<10} {record_bytes / 2**20:>9.1f} MB  "
+        f"{record_bytes / args.rows:>6.0f} B/tx"
+    )
+    saved = (dict_bytes - record_bytes) * scale / 2**20
+    print(
+        f"saved per 1M transactions: {saved:.1f} MB ({1 - record_bytes / dict_bytes:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
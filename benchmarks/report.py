@@ -0,0 +1,99 @@
+"""Benchmark reports from rollups against rescanning every output.
+
+Synthetic JSON outputs (one per month) are written to a temporary
+directory. A rescan reads every transaction to total spending by month and
+category; the rollups are built once, then loaded and queried, and then
+refreshed after one more month is added. Both give the same totals.
+
+Usage: python -m benchmarks.report [--months N] [--rows N]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from parser.rollup import Rollups, cents
+from parser.writer import JsonWriter, read_transactions
+from pathlib import Path
+
+from benchmarks.generate import MERCHANTS
+
+CATEGORIES = ("food", "grocery", "fuel", "shopping", "bills", "uncategorized")
+
+
+def write_month(path: Path, month: int, rows: int, rng: random.Random):
+    """Write one month of synthetic transactions as a JSON output."""
+    first = date(2015, 1, 1) + timedelta(days=month * 31)
+    with JsonWriter(path) as writer:
+        for i in range(rows):
+            dr_amount = round(rng.uniform(10, 5000), 2)
+            writer.write(
+                {
+                    "date": (first + timedelta(days=i * 28 // rows)).isoformat(),
+                    "description": rng.choice(MERCHANTS),
+                    "dr_amount": dr_amount,
+                    "cr_amount": 0.0,
+                    "account": rng.choice(("Hdfc", "Icici", "Sbi")),
+                    "category": rng.choice(CATEGORIES),
+                    "type": "expense",
+                }
+            )
+
+
+def rescan(json_dir: Path) -> dict:
+    """Total every output by month and category the slow way."""
+    totals: dict = {}
+    for path in sorted(json_dir.glob("*.json")):
+        for transaction in read_transactions(path):
+            key = (transaction["date"][:7], transaction["category"])
+            total = totals.setdefault(key, [0, 0, 0])
+            total[0] += cents(transaction["dr_amount"])
+            total[1] += cents(transaction["cr_amount"])
+            total[2] += 1
+    return dict(sorted(totals.items()))
+
+
+def timed(func):
+    """Return ``(result, seconds)`` of calling ``func``."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--months", type=int, default=60)
+    arg_parser.add_argument("--rows", type=int, default=20_000)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as workdir:
+        json_dir = Path(workdir)
+        for month in range(args.months):
+            write_month(json_dir / f"hdfc_{month:03}.json", month, args.rows, rng)
+
+        expected, rescan_seconds = timed(lambda: rescan(json_dir))
+        _, build_seconds = timed(lambda: Rollups(json_dir).refresh())
+
+        def report():
+            rollups = Rollups(json_dir)
+            rollups.refresh()
+            return rollups.totals()
+
+        totals, report_seconds = timed(report)
+        assert totals == expected, "rollups diverged from a rescan"
+
+        write_month(json_dir / "hdfc_new.json", args.months, args.rows, rng)
+        _, update_seconds = timed(report)
+
+    print(f"{args.months} outputs x {args.rows:,} transactions")
+    print(f"rescan every transaction   {rescan_seconds:>8.3f}s")
+    print(f"build rollups (first run)  {build_seconds:>8.3f}s")
+    print(f"report from rollups        {report_seconds:>8.3f}s")
+    print(f"report after one new file  {update_seconds:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
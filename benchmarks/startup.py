@@ -0,0 +1,95 @@
+"""Measure CLI startup: ``python -X importtime`` of ``cli`` and ``munim --help``.
+
+Each measurement runs in a fresh interpreter. The report shows the best
+cumulative import time of ``cli``, the modules with the largest self time
+and the wall time of ``munim --help``; it exits non-zero when the import
+time exceeds the budget or a lazily loaded module was imported.
+
+Usage: python -m benchmarks.startup [--repeat N] [--top N]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+# Budget for the cumulative import time of ``cli``, in milliseconds.
+IMPORT_BUDGET_MS = 150
+
+# Modules that must only be imported once a command actually needs them.
+LAZY_MODULES = (
+    "yaml",
+    "csv",
+    "sqlite3",
+    "cProfile",
+    "multiprocessing",
+    "parser.base",
+    "parser.mapper",
+    "parser.runner",
+    "parser.writer",
+    "parser.layout",
+)
+
+
+def import_times(module: str = "cli") -> dict:
+    """Return ``{module: (self_us, cumulative_us)}`` for importing ``module``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    prefix = "import time:"
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith(prefix) or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix(prefix).split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def help_seconds() -> float:
+    """Return the wall time of one ``munim --help`` run."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(REPO / "munim"), "--help"],
+        cwd=REPO,
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--top", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    runs = [import_times() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times["cli"][1])
+    cli_ms = best["cli"][1] / 1000
+    wall_ms = min(help_seconds() for _ in range(args.repeat)) * 1000
+
+    print(f"{'import cli':<28} {cli_ms:8.1f} ms  (budget {IMPORT_BUDGET_MS} ms)")
+    print(f"{'munim --help':<28} {wall_ms:8.1f} ms")
+    print(f"\nTop {args.top} modules by self time:")
+    by_self_time = sorted(best.items(), key=lambda item: -item[1][0])
+    for name, (self_us, _) in by_self_time[: args.top]:
+        print(f"  {name:<26} {self_us / 1000:8.1f} ms")
+
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        print(f"\nImported eagerly: {', '.join(eager)}")
+    if eager or cli_ms > IMPORT_BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Show that peak RSS stays flat when streaming a large statement to JSON.
+
+Each measurement runs in a fresh interpreter so ``ru_maxrss`` reflects that
+run alone. The buffered mode reproduces the old behaviour of collecting
+``parser.transactions`` before a single ``json.dump``.
+
+Usage: python -m benchmarks.streaming [--rows 5000000] [--steps 5]
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.generate import write_statement
+
+
+def child(workdir: str, mode: str, fmt: str):
+    """Parse the statement in ``workdir`` and print elapsed time and peak RSS."""
+    os.chdir(workdir)
+    # pylint: disable=import-outside-toplevel
+    from parser.registry import PARSERS
+    from parser.runner import parse_file
+
+    parser = PARSERS["hdfc"]()
+    start = time.perf_counter()
+    for file_path in parser.files:
+        if mode == "stream":
+            count = parse_file(parser, file_path, fmt=fmt)
+        else:
+            parser.transactions = list(parser.iter_transactions(file_path))
+            with open(parser.json_path(file_path), "w", encoding="utf-8") as f:
+                json.dump(parser.transactions, f, indent=2, ensure_ascii=False)
+            count = len(parser.transactions)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps({"rows": count, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024})
+    )
+
+
+def measure(workdir: Path, mode: str, fmt: str) -> dict:
+    """Run one measurement in a fresh interpreter."""
+    repo = Path(__file__).resolve().parent.parent
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.streaming",
+            "--child",
+            str(workdir),
+            mode,
+            fmt,
+        ],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=5_000_000)
+    arg_parser.add_argument("--steps", type=int, default=5)
+    arg_parser.add_argument(
+        "--buffered", action="store_true", help="also run buffered mode"
+    )
+    arg_parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    repo = Path(__file__).resolve().parent.parent
+    modes = [("stream", "json"), ("stream", "jsonl")]
+    if args.buffered:
+        modes.append(("buffered", "json"))
+    print(f"{'rows':>10} {'mode':<16} {'seconds':>9} {'rows/s':>10} {'peak RSS':>10}")
+    for step in range(1, args.steps + 1):
+        rows = args.rows * step // args.steps
+        with tempfile.TemporaryDirectory() as workdir:
+            workdir = Path(workdir)
+            (workdir / "data" / "statement").mkdir(parents=True)
+            (workdir / "data" / "json").mkdir()
+            shutil.copy(repo / "expense_mapper.yaml", workdir)
+            write_statement(
+                "hdfc", workdir / "data" / "statement" / "hdfc_bench.csv", rows
+            )
+            for mode, fmt in modes:
+                result = measure(workdir, mode, fmt)
+                print(
+                    f"{result['rows']:>10,} {mode + '/' + fmt:<16} {result['seconds']:>9.2f} "
+                    f"{result['rows'] / result['seconds']:>10,.0f} "
+                    f"{result['peak_rss_mb']:>8.1f}MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark suggestion lookups against pairwise comparison.
+
+A synthetic history of categorized merchants is built from brand names
+in a few spellings (``UPI-ZEPRO-#``, ``POS # ZEPRO BANGALORE``, ...), each
+brand in one category. Queries are unseen spellings of known brands. The
+inverted index is compared with scoring every categorized merchant by
+the same weights; the best similarity found must agree.
+
+Usage: python -m benchmarks.suggest [--merchants N] [--queries N]
+"""
+
+import argparse
+import math
+import random
+import string
+import time
+from parser.suggest import SuggestionIndex, merchant_grams
+
+CATEGORIES = ("food", "grocery", "fuel", "travel", "shopping", "bills", "health")
+FORMS = ("UPI-{}-#", "POS # {} BANGALORE", "{} PVT LTD", "BBPS {} #", "TO TRANSFER-{}")
+
+
+def brand(rng: random.Random) -> str:
+    """Return a random pronounceable brand name."""
+    syllables = rng.randint(2, 4)
+    return "".join(
+        rng.choice("BCDFGHJKLMNPRSTVZ") + rng.choice("AEIOU") for _ in range(syllables)
+    )
+
+
+def history(count: int, seed: int = 7) -> tuple:
+    """Return ``({merchant: {category: count}}, [(query, category)])``."""
+    rng = random.Random(seed)
+    merchants: dict = {}
+    queries = []
+    names = set()
+    while len(merchants) < count:
+        name, category = brand(rng), rng.choice(CATEGORIES)
+        if name in names:
+            continue
+        names.add(name)
+        forms = rng.sample(FORMS, 3)
+        for form in forms[:2]:
+            merchants[form.format(name)] = {category: rng.randint(1, 50)}
+        suffix = "".join(rng.choices(string.ascii_uppercase, k=3))
+        queries.append((forms[2].format(f"{name}{suffix}"), category))
+    return merchants, queries
+
+
+def pairwise(index: SuggestionIndex, merchant: str) -> float:
+    """Return the best similarity found by scoring every merchant."""
+    weight = index._weight  # pylint: disable=protected-access
+    query = merchant_grams(merchant)
+    norm = math.sqrt(sum(weight(gram) ** 2 for gram in query))
+    best = 0.0
+    for doc, other in enumerate(index.merchants):
+        shared = sum(weight(gram) ** 2 for gram in query & merchant_grams(other))
+        if shared:
+            best = max(best, shared / (norm * index.norms[doc]))
+    return best
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--merchants", type=int, default=200_000)
+    arg_parser.add_argument("--queries", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    merchants, queries = history(args.merchants)
+    queries = random.Random(1).sample(queries, args.queries)
+    start = time.perf_counter()
+    index = SuggestionIndex(merchants)
+    build = time.perf_counter() - start
+    print(f"{len(index):,} categorized merchants indexed in {build:.2f}s")
+
+    start = time.perf_counter()
+    indexed = [index.suggest(query) for query, _ in queries]
+    indexed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    start = time.perf_counter()
+    brute = [pairwise(index, query) for query, _ in queries]
+    pairwise_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    nearest = [index.neighbours(query, 1) for query, _ in queries]
+    agree = sum(
+        math.isclose(found[0][0] if found else 0.0, best)
+        for found, best in zip(nearest, brute)
+    )
+    correct = sum(
+        bool(suggestions) and suggestions[0].category == category
+        for suggestions, (_, category) in zip(indexed, queries)
+    )
+    print(f"{'lookup':<10} {'ms/query':>9}")
+    print(f"{'indexed':<10} {indexed_ms:>9.2f}")
+    print(f"{'pairwise':<10} {pairwise_ms:>9.2f}")
+    print(f"speedup {pairwise_ms / indexed_ms:.0f}x")
+    print(f"best similarity agrees with pairwise on {agree}/{len(queries)} queries")
+    print(f"top category is the brand's on {correct}/{len(queries)} queries")
+
+
+if __name__ == "__main__":
+    main()
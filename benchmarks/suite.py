@@ -0,0 +1,161 @@
+"""Per-parser benchmark suite: rows/sec, peak memory and per-stage time.
+
+Every class in ``cli.PARSERS`` is benchmarked on a synthetic statement in
+its bank's layout (see ``benchmarks.generate``), each in a fresh interpreter
+so peak RSS belongs to that parser alone. Stages are timed separately over
+materialized rows: CSV read, date normalization, categorization, the full
+``parse`` call (``fields`` is what remains of it after dates and
+categories) and the JSON write.
+
+Usage:
+    python -m benchmarks.suite [--rows N] [--banks hdfc,sbi] [--output FILE]
+                               [--compare BASELINE.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from parser.dates import DateNormalizer
+from pathlib import Path
+
+from benchmarks.generate import LAYOUTS, write_statement
+
+REPO = Path(__file__).resolve().parent.parent
+STAGES = ("read", "date", "categorize", "fields", "parse", "write")
+
+
+def _timed(func):
+    """Call func and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def run_bank(bank: str, workdir: str) -> dict:
+    """Benchmark one parser on the statement in ``workdir``."""
+    os.chdir(workdir)
+    from cli import PARSERS  # pylint: disable=import-outside-toplevel
+
+    parser = PARSERS[bank]()
+    file_path = parser.files[0]
+    mapping = parser.attrs_mapping
+    stages = {}
+
+    rows, stages["read"] = _timed(
+        lambda: [
+            row for row in parser.read_csv(str(file_path)) if parser.is_transaction(row)
+        ]
+    )
+    dates = [row[mapping["date"]].strip().strip("~") for row in rows]
+    descriptions = [row[mapping["description"]].strip().strip("~") for row in rows]
+
+    parser.date_normalizer = DateNormalizer(preferred=parser.date_normalizer.preferred)
+    _, stages["date"] = _timed(lambda: [parser.normalize_date(d) for d in dates])
+    _, stages["categorize"] = _timed(
+        lambda: [parser.categorize_transactions(d) for d in descriptions]
+    )
+
+    parser.date_normalizer = DateNormalizer(preferred=parser.date_normalizer.preferred)
+    transactions, stages["parse"] = _timed(lambda: [parser.parse(row) for row in rows])
+    stages["fields"] = max(stages["parse"] - stages["date"] - stages["categorize"], 0.0)
+    _, stages["write"] = _timed(lambda: parser.write_json(file_path, transactions))
+
+    total = stages["read"] + stages["parse"] + stages["write"]
+    return {
+        "rows": len(rows),
+        "seconds": total,
+        "rows_per_sec": len(rows) / total if total else 0.0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stages": stages,
+    }
+
+
+def measure(bank: str, rows: int, seed: int) -> dict:
+    """Generate a statement and benchmark it in a fresh interpreter."""
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        (workdir / "data" / "statement").mkdir(parents=True)
+        (workdir / "data" / "json").mkdir()
+        shutil.copy(REPO / "expense_mapper.yaml", workdir)
+        statement = workdir / "data" / "statement" / f"{bank}_bench.csv"
+        write_statement(bank, statement, rows, seed)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "--child", bank, str(workdir)],
+            cwd=REPO,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return json.loads(output)
+
+
+def print_table(results: dict, baseline: dict = None):
+    """Print one line per parser, with the rows/sec change against a baseline."""
+    header = f"{'bank':<10} {'rows':>9} {'rows/s':>10} {'peak RSS':>10}"
+    header += "".join(f" {stage:>10}" for stage in STAGES)
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    for bank, result in results.items():
+        line = (
+            f"{bank:<10} {result['rows']:>9,} {result['rows_per_sec']:>10,.0f} "
+            f"{result['peak_rss_mb']:>8.1f}MB"
+        )
+        line += "".join(f" {result['stages'][stage]:>9.3f}s" for stage in STAGES)
+        if baseline and bank in baseline:
+            change = result["rows_per_sec"] / baseline[bank]["rows_per_sec"] - 1
+            line += f" {change:>+8.1%}"
+        print(line)
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    arg_parser.add_argument("--banks", default=",".join(LAYOUTS))
+    arg_parser.add_argument("--seed", type=int, default=7)
+    arg_parser.add_argument("--output", help="write results to this JSON file")
+    arg_parser.add_argument("--compare", help="baseline results JSON to compare with")
+    arg_parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+    if args.child:
+        print(json.dumps(run_bank(*args.child)))
+        return
+
+    results = {
+        bank: measure(bank, args.rows, args.seed) for bank in args.banks.split(",")
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_table(results, baseline)
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "rows": args.rows,
+                "seed": args.seed,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
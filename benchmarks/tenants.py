@@ -0,0 +1,101 @@
+"""Benchmark parsing many households from one process.
+
+Each tenant gets its own directory with HDFC and ICICI statements and a
+copy of ``expense_mapper.yaml``. Every tenant is parsed one after the
+other, then on a thread pool and on a process pool via ``parse_tenants``.
+Outputs must be identical in every mode. The tenants' copies of one
+mapper share a single compiled matcher, which is checked too.
+
+Usage: python -m benchmarks.tenants [--tenants N] [--rows N] [--jobs N]
+"""
+
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+from parser.tenant import Tenant, parse_tenants
+from pathlib import Path
+
+from benchmarks.generate import write_statement
+
+REPO = Path(__file__).resolve().parent.parent
+BANKS = ("hdfc", "icici")
+
+
+def make_tenants(workdir: Path, tenants: int, rows: int) -> list:
+    """Create ``tenants`` tenant directories and return their ``Tenant``."""
+    result = []
+    for index in range(tenants):
+        root = workdir / f"household{index:03d}"
+        (root / "data" / "statement").mkdir(parents=True)
+        (root / "data" / "json").mkdir()
+        shutil.copy(REPO / "expense_mapper.yaml", root)
+        for bank in BANKS:
+            write_statement(
+                bank, root / "data" / "statement" / f"{bank}_bench.csv", rows
+            )
+        result.append(Tenant(root))
+    return result
+
+
+def outputs(tenants: list) -> dict:
+    """Return every tenant's output bytes, and remove them for the next mode."""
+    result = {}
+    for tenant in tenants:
+        for path in sorted(tenant.output_dir.iterdir()):
+            if path.name != "manifest.json":
+                result[path.relative_to(tenant.root.parent)] = path.read_bytes()
+            path.unlink()
+    return result
+
+
+def serial(tenants: list, _):
+    """Parse each tenant in turn on the calling thread."""
+    return {tenant.name: tenant.parse(BANKS) for tenant in tenants}
+
+
+def threads(tenants: list, jobs: int):
+    """Parse tenants on a thread pool."""
+    return parse_tenants(tenants, jobs, banks=BANKS)
+
+
+def processes(tenants: list, jobs: int):
+    """Parse tenants on a process pool."""
+    return parse_tenants(tenants, jobs, processes=True, banks=BANKS)
+
+
+def main():
+    """Entry point."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--tenants", type=int, default=32)
+    arg_parser.add_argument("--rows", type=int, default=20_000)
+    arg_parser.add_argument("--jobs", type=int, default=4)
+    args = arg_parser.parse_args()
+    logging.getLogger("munim").disabled = True
+
+    with tempfile.TemporaryDirectory() as workdir:
+        tenants = make_tenants(Path(workdir), args.tenants, args.rows)
+        total = args.tenants * len(BANKS) * args.rows
+        print(f"{args.tenants} tenants x {len(BANKS)} statements x {args.rows:,} rows")
+        print(f"{'mode':<10} {'seconds':>8} {'rows/s':>11}")
+        expected = None
+        for name, func in (
+            ("serial", serial),
+            ("threads", threads),
+            ("processes", processes),
+        ):
+            start = time.perf_counter()
+            failures = func(tenants, args.jobs)
+            seconds = time.perf_counter() - start
+            assert not any(failures.values()), failures
+            print(f"{name:<10} {seconds:>8.2f} {total / seconds:>11,.0f}")
+            result = outputs(tenants)
+            assert expected is None or result == expected, f"{name} diverged"
+            expected = result
+        matchers = {id(tenant.mapper.matcher) for tenant in tenants}
+        print(f"{len(tenants)} mappers share {len(matchers)} compiled matcher(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,15 @@
 
 import logging
 import sys
-from parser.axis_parser import AxisParser
-from parser.cc_hdfc_parser import CcHdfcParser
-from parser.cc_icici_parser import CcIciciParser
-from parser.hdfc_parser import HdfcParser
-from parser.icici_parser import IciciParser
-from parser.sbi_parser import SbiParser
+from parser.registry import PARSERS
 
 import click
 
-PARSERS = {
-    "hdfc": HdfcParser,
-    "icici": IciciParser,
-    "sbi": SbiParser,
-    "axis": AxisParser,
-    "cc_hdfc": CcHdfcParser,
-    "cc_icici": CcIciciParser,
-}
+# Output formats of parser.writer, listed here so --help does not import it.
+FORMATS = ("json", "jsonl", "archive")
+
+# Parse engines of parser.batch, likewise.
+ENGINES = ("row", "batch")
 
 
 def setup_logging(verbose, log_file="munim.log"):
@@ -54,18 +46,156 @@ def setup_logging(verbose, log_file="munim.log"):
     "--verbose", "-v", is_flag=True, help="Enable verbose output with stderr logging."
 )
 @click.option("--log-file", default="munim.log", help="Log file path.")
+@click.option(
+    "--metrics",
+    is_flag=True,
+    help="Print per-stage time, row counts and peak memory per file.",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False),
+    help="Also write the metrics as JSON to this file.",
+)
+@click.option(
+    "--profile",
+    "profile_dir",
+    type=click.Path(file_okay=False),
+    help="Dump a cProfile of each statement file into this directory.",
+)
 @click.pass_context
-def cli(ctx, verbose, log_file):
+def cli(
+    ctx, verbose, log_file, metrics, metrics_file, profile_dir
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
     """Munim - Bank statement parser and expense categorizer for Indian banks."""
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = verbose
     ctx.obj["log_file"] = log_file
+    ctx.obj["metrics"] = metrics or metrics_file is not None
+    ctx.obj["metrics_file"] = metrics_file
+    ctx.obj["profile_dir"] = profile_dir
+
+
+def make_runner(ctx, logger, options):
+    """Build a Runner from the parse options and the group's metrics options."""
+    from parser.runner import Runner  # pylint: disable=import-outside-toplevel
+
+    if options["chunk_size"] and options["fmt"] == "archive":
+        raise click.UsageError(
+            "--chunk-size needs a streaming format; archives are written in one piece."
+        )
+    if options["pipeline"] and (
+        options["jobs"] > 1 or options["chunk_size"] or options["dedup"]
+    ):
+        raise click.UsageError(
+            "--pipeline only applies to serial runs without --chunk-size or --dedup."
+        )
+    return Runner(
+        logger,
+        metrics=ctx.obj["metrics"],
+        profile_dir=ctx.obj["profile_dir"],
+        **options,
+    )
+
+
+def report_metrics(ctx, runner):
+    """Print the metrics summary table and write the metrics file, if enabled."""
+    if not ctx.obj["metrics"]:
+        return
+    # pylint: disable-next=import-outside-toplevel
+    from parser.metrics import format_table, write_metrics
+
+    click.echo(format_table(runner.metrics))
+    if ctx.obj["metrics_file"]:
+        write_metrics(runner.metrics, ctx.obj["metrics_file"])
+
+
+def validate_store(ctx, param, value):  # pylint: disable=unused-argument
+    """Check that a --store spec can be opened before parsing starts."""
+    if value is None:
+        return None
+    import sqlite3  # pylint: disable=import-outside-toplevel
+    from parser.store import open_store  # pylint: disable=import-outside-toplevel
+
+    try:
+        open_store(value).close()
+    except (ValueError, sqlite3.Error) as e:
+        raise click.BadParameter(str(e)) from e
+    return value
+
+
+PARSE_OPTIONS = (
+    click.option(
+        "--jobs",
+        "-j",
+        default=1,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Number of worker processes to parse files with.",
+    ),
+    click.option(
+        "--force",
+        is_flag=True,
+        help="Re-parse every statement, ignoring the manifest of unchanged files.",
+    ),
+    click.option(
+        "--format",
+        "fmt",
+        type=click.Choice(FORMATS),
+        default="json",
+        show_default=True,
+        help="Output format: pretty JSON array, compact JSON Lines or a columnar archive.",
+    ),
+    click.option(
+        "--chunk-size",
+        type=click.IntRange(min=1),
+        help="Parse and flush this many transactions at a time, with checkpoints "
+        "so an interrupted run resumes from the last committed chunk.",
+    ),
+    click.option(
+        "--engine",
+        type=click.Choice(ENGINES),
+        default="row",
+        show_default=True,
+        help="Parse row by row, or in column blocks (same output, faster on large files).",
+    ),
+    click.option(
+        "--pipeline",
+        is_flag=True,
+        help="Read the next file and write the previous output while parsing "
+        "(serial runs without --chunk-size or --dedup).",
+    ),
+    click.option(
+        "--dedup",
+        is_flag=True,
+        help="Drop transactions already parsed from another (overlapping) statement. "
+        "Files are parsed serially.",
+    ),
+    click.option(
+        "--reconcile",
+        is_flag=True,
+        help="After parsing, tag card payments and transfers between accounts "
+        "so reports do not count them twice.",
+    ),
+    click.option(
+        "--store",
+        callback=validate_store,
+        help="Also upsert transactions into an indexed store, e.g. sqlite:munim.db.",
+    ),
+)
+
+
+def parse_options(command):
+    """Apply the options shared by parse and parse-all; they map onto Runner."""
+    for option in reversed(PARSE_OPTIONS):
+        command = option(command)
+    return command
 
 
 @cli.command()
 @click.argument("bank", type=click.Choice(list(PARSERS.keys()), case_sensitive=False))
+@parse_options
 @click.pass_context
-def parse(ctx, bank):
+def parse(ctx, bank, **options):
     """Parse bank statements for a specific bank."""
     verbose = ctx.obj["verbose"]
     log_file = ctx.obj["log_file"]
@@ -82,21 +212,12 @@ def parse(ctx, bank):
             logger.warning("No files found for %s", bank_lower)
             return
 
-        for file_path in parser.files:
-            logger.info("Processing file: %s", file_path)
-            parser.transactions = []
-
-            for row in parser.read_csv(str(file_path)):
-                if len(row) == parser.tx_row_col_count:
-                    transaction = parser.parse(row)
-                    parser.transactions.append(transaction)
-
-            parser.write_json(file_path)
-            logger.info(
-                "✅ Parsed %s - %d transactions",
-                file_path.name,
-                len(parser.transactions),
-            )
+        runner = make_runner(ctx, logger, options)
+        failures = runner.run([(bank_lower, parser)])
+        report_metrics(ctx, runner)
+        if failures:
+            logger.error("❌ %d file(s) failed for %s", failures, bank)
+            sys.exit(1)
 
         logger.info("✅ All files processed for %s", bank)
 
@@ -106,8 +227,9 @@ def parse(ctx, bank):
 
 
 @cli.command()
+@parse_options
 @click.pass_context
-def parse_all(ctx):
+def parse_all(ctx, **options):
     """Parse statements for all supported banks."""
     verbose = ctx.obj["verbose"]
     log_file = ctx.obj["log_file"]
@@ -116,29 +238,15 @@ def parse_all(ctx):
     try:
         logger.info("Starting parse for all banks")
 
-        for bank_name, parser_class in PARSERS.items():
-            logger.info("Processing bank: %s", bank_name)
-            parser = parser_class()
-
-            if not parser.files:
-                logger.warning("No files found for %s", bank_name)
-                continue
-
-            for file_path in parser.files:
-                logger.info("Processing file: %s", file_path)
-                parser.transactions = []
-
-                for row in parser.read_csv(str(file_path)):
-                    if len(row) == parser.tx_row_col_count:
-                        transaction = parser.parse(row)
-                        parser.transactions.append(transaction)
-
-                parser.write_json(file_path)
-                logger.info(
-                    "✅ Parsed %s - %d transactions",
-                    file_path.name,
-                    len(parser.transactions),
-                )
+        plan = [
+            (bank_name, parser_class()) for bank_name, parser_class in PARSERS.items()
+        ]
+        runner = make_runner(ctx, logger, options)
+        failures = runner.run(plan, announce=True)
+        report_metrics(ctx, runner)
+        if failures:
+            logger.error("❌ %d file(s) failed", failures)
+            sys.exit(1)
 
         logger.info("✅ All banks processed")
 
@@ -147,5 +255,182 @@ def parse_all(ctx):
         sys.exit(1)
 
 
+@cli.command()
+@click.option(
+    "--interval",
+    default=0.2,
+    show_default=True,
+    type=click.FloatRange(min=0.01),
+    help="Seconds between polls of data/statement.",
+)
+@parse_options
+@click.pass_context
+def watch(ctx, interval, **options):
+    """Parse new or changed statements as they land in data/statement."""
+    from parser.watch import (  # pylint: disable=import-outside-toplevel
+        StatementWatcher,
+        watch_statements,
+    )
+
+    logger = setup_logging(ctx.obj["verbose"], ctx.obj["log_file"])
+    parsers = {bank: parser_class() for bank, parser_class in PARSERS.items()}
+    runner = make_runner(ctx, logger, options)
+    logger.info("Watching data/statement every %.2fs", interval)
+    try:
+        watch_statements(runner, parsers, StatementWatcher(), interval)
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+    report_metrics(ctx, runner)
+
+
+def rupees(paise: int) -> str:
+    """Format an amount in paise as rupees."""
+    return f"{paise / 100:,.2f}"
+
+
+def echo_totals(rollups, dimensions, start, end):
+    """Print totals grouped by ``dimensions``."""
+    header = "".join(f"{dimension:<16}" for dimension in dimensions)
+    click.echo(f"{header}{'spent':>14} {'received':>14} {'count':>7}")
+    totals = rollups.totals(dimensions, start, end)
+    for key, (dr_amount, cr_amount, count) in totals.items():
+        line = "".join(f"{value[:15]:<16}" for value in key)
+        click.echo(f"{line}{rupees(dr_amount):>14} {rupees(cr_amount):>14} {count:>7,}")
+
+
+def echo_top_merchants(rollups, top, start, end):
+    """Print the merchants with the highest spending."""
+    from parser.merchant import printable  # pylint: disable=import-outside-toplevel
+
+    click.echo(f"{'merchant':<40} {'spent':>14} {'count':>7}")
+    for description, dr_amount, count in rollups.top_merchants(top, start, end):
+        description = printable(description)
+        click.echo(f"{description[:40]:<40} {rupees(dr_amount):>14} {count:>7,}")
+
+
+def echo_trend(rollups, category, start, end):
+    """Print monthly spending and its change against the previous month."""
+    click.echo(f"{'month':<8} {'spent':>14} {'received':>14} {'change':>8}")
+    previous = None
+    for month, dr_amount, cr_amount in rollups.trend(category, start, end):
+        change = f"{(dr_amount - previous) / previous:+.0%}" if previous else "-"
+        click.echo(
+            f"{month:<8} {rupees(dr_amount):>14} {rupees(cr_amount):>14} {change:>8}"
+        )
+        previous = dr_amount
+
+
+@cli.command()
+@click.option(
+    "--by",
+    "dimensions",
+    multiple=True,
+    type=click.Choice(("month", "category", "account")),
+    help="Group totals by these dimensions (default: month and category).",
+)
+@click.option("--from", "start", metavar="YYYY-MM", help="First month to include.")
+@click.option("--to", "end", metavar="YYYY-MM", help="Last month to include.")
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    help="Show the N merchants with the highest spending instead of totals.",
+)
+@click.option(
+    "--trend",
+    metavar="CATEGORY",
+    help="Show monthly spending of one category (or 'all') instead of totals.",
+)
+@click.pass_context
+def report(
+    ctx, dimensions, start, end, top, trend
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Report spending from the rollups of the parsed outputs."""
+    from parser.rollup import Rollups  # pylint: disable=import-outside-toplevel
+
+    logger = setup_logging(ctx.obj["verbose"], ctx.obj["log_file"])
+    rollups = Rollups()
+    changed = rollups.refresh()
+    if changed:
+        logger.info("Rolled up %d changed output(s)", changed)
+
+    if top:
+        echo_top_merchants(rollups, top, start, end)
+    elif trend:
+        echo_trend(rollups, None if trend == "all" else trend, start, end)
+    else:
+        echo_totals(rollups, dimensions or ("month", "category"), start, end)
+
+
+@cli.command()
+@click.option(
+    "--top",
+    default=20,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Review this many uncategorized merchants, most transactions first.",
+)
+@click.option(
+    "--candidates",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Categories suggested per merchant.",
+)
+@click.pass_context
+def suggest(ctx, top, candidates):
+    """Suggest categories and keywords for uncategorized merchants."""
+    from parser.merchant import printable  # pylint: disable=import-outside-toplevel
+    from parser.rollup import Rollups  # pylint: disable=import-outside-toplevel
+    from parser.suggest import suggestions  # pylint: disable=import-outside-toplevel
+
+    logger = setup_logging(ctx.obj["verbose"], ctx.obj["log_file"])
+    rollups = Rollups()
+    changed = rollups.refresh()
+    if changed:
+        logger.info("Rolled up %d changed output(s)", changed)
+
+    groups = suggestions(rollups.merchant_categories(), top, candidates)
+    if not groups:
+        click.echo("No uncategorized transactions")
+    for group in groups:
+        variants = f", {group.variants:,} variants" if group.variants > 1 else ""
+        click.echo(
+            f"{printable(group.merchant)}  ({group.count:,} transactions, "
+            f"{rupees(group.debit)} spent{variants})"
+        )
+        if not group.suggestions:
+            click.echo("    no similar categorized merchant")
+        for suggestion in group.suggestions:
+            click.echo(
+                f"    {suggestion.category[:20]:<20} {suggestion.score:>5.2f}  "
+                f"{suggestion.keyword:<20} like {printable(suggestion.merchant)}"
+            )
+
+
+@cli.command()
+@click.option(
+    "--output",
+    "-o",
+    default="./data/history.munim",
+    show_default=True,
+    type=click.Path(dir_okay=False),
+    help="Archive file to write.",
+)
+@click.pass_context
+def archive(ctx, output):
+    """Convert every parsed output into one memory-mappable archive."""
+    from parser.writer import archive_outputs  # pylint: disable=import-outside-toplevel
+
+    logger = setup_logging(ctx.obj["verbose"], ctx.obj["log_file"])
+    try:
+        outputs, transactions = archive_outputs("./data/json", output)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--output") from e
+    logger.info("Archived %d transactions from %d outputs", transactions, outputs)
+    click.echo(
+        f"Archived {transactions:,} transactions from {outputs:,} outputs to {output}"
+    )
+
+
 if __name__ == "__main__":
     cli()  # pylint: disable=no-value-for-parameter
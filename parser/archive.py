@@ -0,0 +1,296 @@
+"""Compact, memory-mapped columnar archive of parsed transactions.
+
+An archive holds every transaction of one output, or of a whole history,
+in one file of columns sorted by date:
+
+* ``date``: ``int32`` date ordinals (see ``parser.record``);
+* ``dr_amount`` and ``cr_amount``: ``int64`` amounts in paise;
+* ``account``, ``category`` and ``type``: ``uint16`` codes into
+  dictionaries kept in the header;
+* ``description``: ``uint32`` codes into a dictionary of UTF-8 strings
+  stored as two more columns, ``description.offsets`` and
+  ``description.data``.
+
+The file starts with ``MAGIC``, the format version and the length of a
+JSON header giving the row count, the small dictionaries and the type,
+offset and length of each column. Columns follow, each aligned to 8
+bytes. ``Archive`` maps the file read-only and hands out ``memoryview``
+slices of it, so reading a column or a range of dates copies nothing and
+only the pages touched are read from disk.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from parser.record import as_dict, iso_of, ordinal_of
+from pathlib import Path
+
+MAGIC = b"MUNIMARC"
+ARCHIVE_FORMAT = 1
+ARCHIVE_SUFFIX = ".munim"
+
+# Row columns and their array type codes, in file order.
+COLUMNS = {
+    "date": "i",
+    "dr_amount": "q",
+    "cr_amount": "q",
+    "account": "H",
+    "category": "H",
+    "type": "H",
+    "description": "I",
+}
+
+# Columns stored as codes into a dictionary of distinct values.
+DICTIONARY_COLUMNS = ("account", "category", "type", "description")
+
+_PREFIX = struct.Struct("<8sII")
+_ALIGN = 8
+
+
+def _aligned(offset: int) -> int:
+    """Return ``offset`` rounded up to the column alignment."""
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _paise(amount) -> int:
+    """Return an amount in rupees as whole paise."""
+    return round((amount or 0) * 100)
+
+
+class ArchiveBuilder:
+    """Encodes transactions into columns and writes them as an archive."""
+
+    def __init__(self):
+        """Start with empty columns and dictionaries."""
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+        self._codes: dict = {name: {} for name in DICTIONARY_COLUMNS}
+
+    def __len__(self):
+        return len(self.columns["date"])
+
+    def add(self, transaction):
+        """Append one transaction (a dict or ``Transaction`` record)."""
+        transaction = as_dict(transaction)
+        columns = self.columns
+        columns["date"].append(ordinal_of(transaction["date"]))
+        columns["dr_amount"].append(_paise(transaction.get("dr_amount")))
+        columns["cr_amount"].append(_paise(transaction.get("cr_amount")))
+        for name, codes in self._codes.items():
+            value = transaction.get(name)
+            if name == "description":
+                value = value or ""
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+            columns[name].append(code)
+
+    def extend(self, transactions) -> int:
+        """Append every transaction from an iterable and return the row count."""
+        for transaction in transactions:
+            self.add(transaction)
+        return len(self)
+
+    def _sorted_columns(self) -> dict:
+        """Return the row columns in date order, keeping the order of equal dates."""
+        dates = self.columns["date"]
+        if all(a <= b for a, b in zip(dates, dates[1:])):
+            return self.columns
+        order = sorted(range(len(dates)), key=dates.__getitem__)
+        return {
+            name: array(column.typecode, map(column.__getitem__, order))
+            for name, column in self.columns.items()
+        }
+
+    def write(self, path) -> int:
+        """Write the archive to ``path`` atomically and return the row count.
+
+        The file is written next to ``path`` with a ``.tmp`` suffix and
+        moved into place, so readers never see a partial archive.
+        """
+        path = Path(path)
+        columns = self._sorted_columns()
+        encoded = [str(value).encode("utf-8") for value in self._codes["description"]]
+        columns["description.offsets"] = array(
+            "Q", accumulate(map(len, encoded), initial=0)
+        )
+        columns["description.data"] = array("B", b"".join(encoded))
+
+        layout = {}
+        offset = 0
+        for name, column in columns.items():
+            layout[name] = [column.typecode, offset, len(column)]
+            offset = _aligned(offset + len(column) * column.itemsize)
+        header = json.dumps(
+            {
+                "rows": len(self),
+                "byteorder": sys.byteorder,
+                "dictionaries": {
+                    name: list(self._codes[name]) for name in DICTIONARY_COLUMNS[:-1]
+                },
+                "columns": layout,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, ARCHIVE_FORMAT, len(header)))
+            f.write(header)
+            start = _aligned(f.tell())
+            for name, column in columns.items():
+                f.write(b"\0" * (start + layout[name][1] - f.tell()))
+                column.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return len(self)
+
+
+def write_archive(path, transactions) -> int:
+    """Write ``transactions`` to an archive at ``path`` and return the count."""
+    builder = ArchiveBuilder()
+    builder.extend(transactions)
+    return builder.write(path)
+
+
+class Archive:
+    """A read-only, memory-mapped view of an archive file.
+
+    ``column`` and ``read`` return ``memoryview`` slices of the mapping,
+    narrowed to the rows between two dates when ``start`` or ``end`` is
+    given; dates are ``YYYY-MM-DD`` and both ends are inclusive. Codes of
+    dictionary columns are turned into values with ``value``, and
+    ``transactions`` yields rows in the JSON output schema. Views must
+    be released before ``close`` can unmap the file; otherwise it is
+    unmapped once the last view is gone.
+    """
+
+    def __init__(self, path):
+        """Map ``path`` and read its header; a malformed file raises ``ValueError``."""
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: dict = {}
+        try:
+            self._read_header()
+            self._descriptions = [None] * (self._layout["description.offsets"][2] - 1)
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            self._map.close()
+            raise ValueError(f"{self.path.name} is not a readable archive: {e}") from e
+
+    def _read_header(self):
+        """Load the row count, dictionaries and column layout."""
+        magic, version, size = _PREFIX.unpack_from(self._map)
+        if magic != MAGIC or version != ARCHIVE_FORMAT:
+            raise ValueError(f"unsupported format {magic!r} v{version}")
+        begin, end = _PREFIX.size, _PREFIX.size + size
+        header = json.loads(self._map[begin:end])
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"written on a {header['byteorder']}-endian machine")
+        self.rows = header["rows"]
+        self.dictionaries = {
+            name: tuple(values) for name, values in header["dictionaries"].items()
+        }
+        start = _aligned(end)
+        self._layout = {
+            name: (code, start + offset, count)
+            for name, (code, offset, count) in header["columns"].items()
+        }
+        for code, offset, count in self._layout.values():
+            if offset + count * array(code).itemsize > len(self._map):
+                raise ValueError("truncated")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    def _view(self, name: str) -> memoryview:
+        """Return the whole of a column, mapped in place."""
+        view = self._views.get(name)
+        if view is None:
+            code, offset, count = self._layout[name]
+            end = offset + count * array(code).itemsize
+            view = memoryview(self._map)[offset:end].cast(code)
+            self._views[name] = view
+        return view
+
+    def span(self, start: str = None, end: str = None) -> range:
+        """Return the indexes of the rows dated from ``start`` through ``end``."""
+        dates = self._view("date")
+        first = bisect_left(dates, ordinal_of(start)) if start else 0
+        last = bisect_right(dates, ordinal_of(end)) if end else self.rows
+        return range(first, max(first, last))
+
+    def column(self, name: str, start: str = None, end: str = None) -> memoryview:
+        """Return one column, limited to rows from ``start`` through ``end``."""
+        return self.read((name,), start, end)[name]
+
+    def read(self, columns=None, start: str = None, end: str = None) -> dict:
+        """Return ``{name: column}`` of ``columns`` (all by default) for a date range."""
+        for name in columns or ():
+            if name not in COLUMNS:
+                raise KeyError(name)
+        rows = self.span(start, end)
+        first, last = rows.start, rows.stop
+        return {name: self._view(name)[first:last] for name in (columns or COLUMNS)}
+
+    def value(self, name: str, code: int):
+        """Return the value a dictionary column's ``code`` stands for."""
+        if name != "description":
+            return self.dictionaries[name][code]
+        text = self._descriptions[code]
+        if text is None:
+            offsets = self._view("description.offsets")
+            data = self._view("description.data")
+            first, last = offsets[code], offsets[code + 1]
+            text = str(data[first:last], "utf-8")
+            self._descriptions[code] = text
+        return text
+
+    def transactions(self, start: str = None, end: str = None):
+        """Yield the transactions dated from ``start`` through ``end`` as dicts."""
+        columns = self.read(start=start, end=end)
+        accounts = self.dictionaries["account"]
+        categories = self.dictionaries["category"]
+        types = self.dictionaries["type"]
+        descriptions = self._descriptions
+        for date, description, dr_amount, cr_amount, account, category, kind in zip(
+            columns["date"],
+            columns["description"],
+            columns["dr_amount"],
+            columns["cr_amount"],
+            columns["account"],
+            columns["category"],
+            columns["type"],
+        ):
+            yield {
+                "date": iso_of(date),
+                "description": descriptions[description]
+                or self.value("description", description),
+                "dr_amount": dr_amount / 100,
+                "cr_amount": cr_amount / 100,
+                "account": accounts[account],
+                "category": categories[category],
+                "type": types[kind],
+            }
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        try:
+            self._map.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes with the last one.
+            pass
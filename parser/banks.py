@@ -0,0 +1,152 @@
+"""Statement layouts of the supported banks.
+
+Each layout is compiled into a parser class by ``parser.layout``, so
+supporting another bank only needs an entry here. This module is plain
+data and cheap to import; the registry lists banks from it without
+loading any parser. Keys:
+
+``account``
+    Value of the ``account`` field of every transaction.
+``prefix``
+    Statement files are ``data/statement/<prefix>*.csv``.
+``header``
+    Column names of the statement's header row, used to recognize a
+    statement whatever its file name; see ``parser.ingest``. Compared
+    without surrounding whitespace and ``~``, ignoring case.
+``width``
+    Transaction rows have exactly this many columns.
+``columns``
+    Column indexes of ``date``, ``description`` and either ``dr_amount``
+    and ``cr_amount``, or a single ``amount`` with a ``credit`` rule.
+``credit``
+    ``(column, marker)``: the amount is a credit when the column holds the
+    marker (case-insensitive), and a debit otherwise.
+``delimiter``
+    CSV delimiter, "," by default.
+``tilde``
+    Fields are wrapped in ``~``, which is stripped.
+``card``
+    The account is a credit card: its debits are purchases, and only its
+    credits can be the far side of a transfer; see ``parser.reconcile``.
+``skip``
+    Rows whose first column holds one of these values (header repeats,
+    summary lines) are not transactions.
+``required``
+    Columns that must not be blank in a transaction row.
+``date_format``
+    The ``strptime`` format tried first; the others of ``parser.dates``
+    remain as fallbacks.
+``merchant_rules``
+    Bank-specific noise patterns for merchant extraction; see
+    ``parser.merchant``.
+``version``
+    Bump when a change to the layout alters the output.
+"""
+
+# Particulars end in a per-transaction serial number, e.g. ".../SWIGGY/17".
+SERIAL_SUFFIX = r"(?<=/)\d{1,5}$"
+
+LAYOUTS = {
+    "hdfc": {
+        "header": (
+            "Date",
+            "Narration",
+            "Value Date",
+            "Debit Amount",
+            "Credit Amount",
+            "Chq/Ref Number",
+            "Closing Balance",
+        ),
+        "account": "Hdfc",
+        "prefix": "hdfc_",
+        "width": 7,
+        "columns": {"date": 0, "description": 1, "dr_amount": 3, "cr_amount": 4},
+        "skip": ("Date",),
+        "date_format": "%d/%m/%y",
+    },
+    "icici": {
+        "header": ("DATE", "MODE", "PARTICULARS", "DEPOSITS", "WITHDRAWALS", "BALANCE"),
+        "account": "Icici",
+        "prefix": "icici_",
+        "width": 6,
+        "columns": {"date": 0, "description": 2, "dr_amount": 4, "cr_amount": 3},
+        "skip": ("DATE", "ACCOUNT TYPE", "Savings"),
+        "date_format": "%d-%m-%Y",
+        "merchant_rules": (SERIAL_SUFFIX,),
+    },
+    "sbi": {
+        "header": (
+            "Txn Date",
+            "Value Date",
+            "Description",
+            "Ref No./Cheque No.",
+            "Debit",
+            "Credit",
+            "Balance",
+        ),
+        "account": "Sbi",
+        "prefix": "sbi_",
+        "width": 7,
+        "columns": {"date": 0, "description": 2, "dr_amount": 4, "cr_amount": 5},
+        "skip": ("Txn Date",),
+        "required": (6,),
+        "date_format": "%d-%b-%y",
+    },
+    "axis": {
+        "header": ("Tran Date", "CHQNO", "PARTICULARS", "DR", "CR", "BAL", "SOL"),
+        "account": "Axis",
+        "prefix": "axis_",
+        "width": 7,
+        "columns": {"date": 0, "description": 2, "dr_amount": 3, "cr_amount": 4},
+        "skip": ("Tran Date",),
+        "date_format": "%d-%m-%Y",
+        "merchant_rules": (SERIAL_SUFFIX,),
+    },
+    "cc_hdfc": {
+        "header": (
+            "Transaction type",
+            "Primary / Addon Customer Name",
+            "DATE",
+            "Description",
+            "AMT",
+            "Debit /Credit",
+            "Base NeuCoins*",
+        ),
+        "account": "Hdfc-CC",
+        "card": True,
+        "prefix": "cc_hdfc_",
+        "width": 7,
+        "delimiter": "|",
+        "tilde": True,
+        "columns": {"date": 2, "description": 3, "amount": 4},
+        "credit": (5, "Cr"),
+        "skip": ("Transaction type", "Opening NeuCoins with Bank", "399"),
+        "date_format": "%d/%m/%Y %H:%M:%S",
+        "version": "2",
+    },
+    "cc_icici": {
+        "header": (
+            "Date",
+            "Sr.No.",
+            "Transaction Details",
+            "Reward Point Header",
+            "Intl.Amount",
+            "Amount(in Rs)",
+            "BillingAmountSign",
+        ),
+        "account": "Icici-CC",
+        "card": True,
+        "prefix": "cc_icici_",
+        "width": 7,
+        "columns": {"date": 0, "description": 2, "amount": 5},
+        "credit": (6, "CR"),
+        "skip": ("Date",),
+        "date_format": "%d/%m/%Y",
+        "version": "2",
+    },
+}
+
+
+def parser_name(bank: str) -> str:
+    """Return the class name of a bank's parser, e.g. ``CcHdfcParser``."""
+    return "".join(part.title() for part in bank.split("_")) + "Parser"
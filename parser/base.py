@@ -1,109 +1,219 @@
 """Base parser module for bank statement parsing."""
 
 import csv
-import json
 import logging
-from datetime import datetime
+from itertools import islice
+from parser.banks import LAYOUTS
+from parser.batch import BATCH_ROWS, parse_block
+from parser.dates import DateNormalizer
+from parser.fingerprint import OccurrenceCounter
+from parser.ingest import MappedStatement, route
+from parser.mapper import expense_mapper
+from parser.merchant import merchant_normalizer
+from parser.record import Transaction, ordinal_of
+from parser.writer import WRITERS, read_transactions
 from pathlib import Path
 
-import yaml
-
 logger = logging.getLogger("munim")
 
+STATEMENT_DIR = Path("./data/statement")
+OUTPUT_DIR = Path("./data/json")
+
 
-class SingletonMeta(type):
-    """A metaclass for singleton pattern implementation."""
+class BaseParser:
+    """Base class for bank statement parsers.
 
-    _instances = {}
+    A parser reads statements from ``input_dir``, writes outputs to
+    ``output_dir`` and categorizes with ``mapper`` (the process-wide
+    mapper for ``expense_mapper.yaml`` by default). Instances share no
+    mutable state, so each household can have its own parsers, used from
+    its own thread; one parser reads one statement at a time.
+    """
 
-    def __call__(cls, *args, **kwargs):
-        """Ensure only one instance of the class is created."""
-        # print(f"Creating instance of {cls}")
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+    # Bump when a change to parsing alters the JSON output, so incremental
+    # runs re-parse statements recorded in the manifest.
+    version: str = "1"
 
+    # Bank-specific noise patterns for merchant extraction; see parser.merchant.
+    merchant_rules: tuple = ()
 
-class BaseParser(metaclass=SingletonMeta):
-    """Base class for bank statement parsers."""
+    # CSV delimiter of the bank's statements.
+    delimiter: str = ","
 
-    def __init__(
+    # The declarative layout a generated parser was compiled from, and the
+    # bank's name in parser.banks; see parser.layout.
+    layout = None
+    name: str = None
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         bank: str = None,
         file_starts_with: str = None,
         tx_row_col_count: int = None,
         attrs_mapping: dict = None,
+        *,
+        input_dir=STATEMENT_DIR,
+        output_dir=OUTPUT_DIR,
+        mapper=None,
     ):
         """Initialize the base parser with common attributes."""
         self.bank: str = bank
         self.file_starts_with: str = file_starts_with
         self.tx_row_col_count: int = tx_row_col_count
         self.attrs_mapping: dict = attrs_mapping
-        self.encoding = "utf-8-sig"
-        self.transactions = []
-        self.files = self.find_files()
-        self.expense_mapper = self.load_expenses_mappers()
+        # None sniffs each statement's encoding; see parser.ingest.
+        self.encoding: str = None
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.date_normalizer = DateNormalizer()
+        self.occurrences = OccurrenceCounter()
+        self._files = None
+        self.mapper = mapper or expense_mapper()
+        self.merchant_normalizer = merchant_normalizer(self.merchant_rules)
+
+    @property
+    def files(self) -> list:
+        """Statement files for the bank, found on first use."""
+        if self._files is None:
+            self._files = self.find_files()
+        return self._files
+
+    @property
+    def expense_mapper(self) -> dict:
+        """The ``{category: rules}`` mapping currently in use."""
+        return self.mapper.mapping
+
+    @property
+    def matcher(self):
+        """The compiled keyword matcher for the current expense mapper."""
+        return self.mapper.matcher
 
     def load_expenses_mappers(self):
-        """Load expense mapping from YAML file."""
-        mapping_file = Path(".") / "expense_mapper.yaml"
-        if mapping_file.exists():
-            with open(mapping_file, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
-        return {}
+        """Reload the expense mapper if its file changed and return it."""
+        return self.mapper.refresh().mapping
 
     def normalize_date(self, date_str: str):
         """Normalize different date formats to YYYY-MM-DD."""
-        for fmt in (
-            "%d-%m-%Y",
-            "%d/%m/%Y",
-            "%d-%b-%y",
-            "%d/%m/%y",
-            "%d/%m/%Y %H:%M:%S",
-        ):
-            try:
-                return datetime.strptime(date_str.strip(), fmt).strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-        raise ValueError(f"Unsupported date format: {date_str}")
-
-    def read_csv(self, file_path: str, delimiter: str = ","):
-        """Read a CSV file and return its rows."""
-        with open(file_path, mode="r", encoding=self.encoding) as csvfile:
-            csv_reader = csv.reader(csvfile, delimiter=delimiter)
+        return self.date_normalizer.normalize(date_str)
+
+    def open_statement(self, file_path: str):
+        """Open a statement file for reading its lines; see ``MappedStatement``."""
+        return MappedStatement(file_path, self.encoding)
+
+    def read_csv(self, file_path: str, delimiter: str = None):
+        """Read a CSV file and return its rows.
+
+        The delimiter defaults to the one the statement's header was found
+        with, and else to the bank's.
+        """
+        self.date_normalizer.reset()
+        self.occurrences.reset()
+        with self.open_statement(file_path) as statement:
+            csv_reader = csv.reader(
+                statement, delimiter=delimiter or statement.delimiter or self.delimiter
+            )
             next(csv_reader, None)  # Skip header
             yield from csv_reader
 
     def find_files(self):
-        """Find statement files for the bank."""
-        directory = "./data/statement"
-        files = list(Path(directory).glob(f"{self.file_starts_with}*.csv"))
+        """Find statement files for the bank, by their header or file name prefix."""
+        key = self.name or self.file_starts_with
+        prefixes = {bank: spec["prefix"] for bank, spec in LAYOUTS.items()}
+        prefixes[key] = self.file_starts_with
+        files = [
+            path
+            for path in sorted(self.input_dir.glob("*.csv"))
+            if route(path, prefixes) == key
+        ]
         if not files:
             logger.warning("No files found for %s", self.bank)
         return files
 
-    def write_json(self, filename: str):
-        """Write transactions to JSON file."""
-        directory = Path("./data/json")
-        json_filename = directory / (filename.stem + ".json")
-        logger.debug(
-            "Writing %d transactions to %s", len(self.transactions), json_filename
-        )
-        with open(json_filename, "w", encoding="utf-8") as jsonfile:
-            json.dump(self.transactions, jsonfile, indent=2, ensure_ascii=False)
+    def json_path(self, filename: Path, fmt: str = "json") -> Path:
+        """Return the JSON output path for a statement file."""
+        return self.output_dir / (filename.stem + WRITERS[fmt].suffix)
+
+    def iter_transactions(self, file_path: Path, engine: str = "row"):
+        """Yield parsed transactions from a statement file.
+
+        The ``row`` engine parses one row at a time; the ``batch`` engine
+        parses blocks of ``BATCH_ROWS`` rows column by column.
+        """
+        if engine == "batch":
+            for _, transactions in self.iter_chunks(file_path, BATCH_ROWS, 0, engine):
+                yield from transactions
+            return
+        for row in self.read_csv(str(file_path)):
+            if self.is_transaction(row):
+                yield self.parse(row)
+
+    def iter_chunks(
+        self, file_path: Path, chunk_size: int, start_row: int = 0, engine: str = "row"
+    ):
+        """Yield ``(rows_read, transactions)`` lists of ``chunk_size`` transactions.
+
+        The first ``start_row`` CSV rows are skipped without parsing, and
+        ``rows_read`` counts the CSV rows consumed so far, so a run can later
+        resume right after the last chunk it committed.
+        """
+        parse_rows = self.parse_batch if engine == "batch" else self.parse_rows
+        rows = self.read_csv(str(file_path))
+        next(islice(rows, start_row, start_row), None)
+        rows_read = start_row
+        chunk = []
+        for row in rows:
+            rows_read += 1
+            if self.is_transaction(row):
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    yield rows_read, parse_rows(chunk)
+                    chunk = []
+        if chunk:
+            yield rows_read, parse_rows(chunk)
+
+    def is_transaction(self, row: list) -> bool:
+        """Return whether a CSV row is a transaction rather than a header or note."""
+        return len(row) == self.tx_row_col_count
+
+    def parse_rows(self, rows: list) -> list:
+        """Parse transaction rows one at a time."""
+        return [self.parse(row) for row in rows]
+
+    def parse_batch(self, rows: list) -> list:
+        """Parse transaction rows column by column; same records as ``parse_rows``."""
+        return parse_block(self, rows)
+
+    def write_json(self, filename: Path, transactions, fmt: str = "json") -> int:
+        """Stream transactions to the JSON output file and return the count.
+
+        ``transactions`` may be any iterable, such as ``iter_transactions``,
+        so a statement is never held in memory. ``fmt`` selects pretty
+        ``json``, compact ``jsonl`` or a columnar ``archive`` (see
+        ``parser.archive``).
+        """
+        json_filename = self.json_path(filename, fmt)
+        logger.debug("Writing transactions to %s", json_filename)
+        with WRITERS[fmt](json_filename) as writer:
+            return writer.write_many(transactions)
+
+    def recategorized(self, filename: Path, fmt: str = "json"):
+        """Yield an existing output's transactions with fresh categories."""
+        for transaction in read_transactions(self.json_path(filename, fmt)):
+            transaction["category"] = self.categorize_transactions(
+                transaction["description"]
+            )
+            yield transaction
+
+    def recategorize_json(self, filename: Path, fmt: str = "json") -> int:
+        """Re-categorize an existing JSON output without re-reading the CSV."""
+        return self.write_json(filename, self.recategorized(filename, fmt), fmt)
 
     def categorize_transactions(self, description: str) -> str:
         """Categorize transaction based on description."""
-        ret_category = "uncategorized"
-        desc_lower = description.lower()
-        for category, keywords in self.expense_mapper.items():
-            for keyword in keywords:
-                if keyword.lower() in desc_lower:
-                    ret_category = category
-        return ret_category
+        return self.mapper.categorize(description, self.merchant_normalizer)
 
     def parse(self, row):
-        """Parse a transaction row and return a normalized transaction dict."""
+        """Parse a transaction row and return a normalized Transaction record."""
         description = row[self.attrs_mapping["description"]].strip().strip("~")
         dr_amount = float(
             row[self.attrs_mapping["dr_amount"]].strip().strip("~").replace(",", "")
@@ -114,14 +224,16 @@ class BaseParser(metaclass=SingletonMeta):
             or 0
         )
         expense_type = "expense" if dr_amount > 0 else "deposit"
-        return {
-            "date": self.normalize_date(
-                row[self.attrs_mapping["date"]].strip().strip("~")
-            ),
-            "description": description,
-            "dr_amount": dr_amount,
-            "cr_amount": cr_amount,
-            "account": self.bank,
-            "category": self.categorize_transactions(description),
-            "type": expense_type,
-        }
+        date_ordinal = ordinal_of(
+            self.normalize_date(row[self.attrs_mapping["date"]].strip().strip("~"))
+        )
+        return Transaction(
+            date_ordinal,
+            description,
+            dr_amount,
+            cr_amount,
+            self.bank,
+            self.categorize_transactions(description),
+            expense_type,
+            self.occurrences.next(date_ordinal, (description, dr_amount, cr_amount)),
+        )
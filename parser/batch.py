@@ -0,0 +1,135 @@
+"""Batch columnar parsing of statement rows.
+
+A block of rows is split into columns. The amount columns are cleaned and
+converted in one pass each, with NumPy's vectorized string operations when
+NumPy is installed and the stdlib ``array`` module otherwise. Dates and
+categories are computed once per distinct string. The records are the same
+as calling ``BaseParser.parse`` on every row.
+"""
+
+from array import array
+from parser.record import Transaction, ordinal_of
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+# Engines accepted by BaseParser.iter_transactions and iter_chunks.
+ENGINES = ("row", "batch")
+
+# Rows per block when the batch engine streams a statement.
+BATCH_ROWS = 4096
+
+
+def _strip(values: list) -> list:
+    """Apply the per-row field cleanup: strip whitespace, then ``~`` delimiters."""
+    return [value.strip().strip("~") for value in values]
+
+
+def _strip_spaces(values: list) -> list:
+    """Strip whitespace only, as parsers of layouts without ``~`` do."""
+    return [value.strip() for value in values]
+
+
+def amount_column(values: list, tilde: bool = True):
+    """Clean and convert one amount column, as ``parse`` does per field.
+
+    Whitespace and, if ``tilde``, ``~`` delimiters are stripped, thousands
+    separators removed and empty cells become 0.0. Raises ValueError for a
+    cell that is not a number, like ``float`` would.
+    """
+    if np is not None:
+        column = np.char.strip(np.array(values, dtype=str))
+        if tilde:
+            column = np.char.strip(column, "~")
+        column = np.char.replace(column, ",", "")
+        column[column == ""] = "0"
+        return column.astype(np.float64).tolist()
+    clean = _strip if tilde else _strip_spaces
+    return array("d", [float(value.replace(",", "") or 0) for value in clean(values)])
+
+
+def _distinct(func, values: list) -> dict:
+    """Map each distinct value to ``func(value)``, calling it in first-seen order.
+
+    The order matters for dates: the format is pinned exactly as it would be
+    row by row.
+    """
+    return {value: func(value) for value in dict.fromkeys(values)}
+
+
+def split_credits(amounts, markers: list, marker: str) -> tuple:
+    """Split one amount column into ``(dr_amounts, cr_amounts)``.
+
+    An amount is a credit where its marker equals ``marker``, ignoring case.
+    """
+    marker = marker.lower()
+    dr_amounts = []
+    cr_amounts = []
+    for amount, value in zip(amounts, markers):
+        if value.lower() == marker:
+            dr_amounts.append(0.0)
+            cr_amounts.append(amount)
+        else:
+            dr_amounts.append(amount)
+            cr_amounts.append(0.0)
+    return dr_amounts, cr_amounts
+
+
+def _amounts(parser, columns: list) -> tuple:
+    """Return the ``(dr_amounts, cr_amounts)`` columns of a block."""
+    mapping = parser.attrs_mapping
+    layout = parser.layout
+    tilde = layout is None or layout.tilde
+    clean = _strip if tilde else _strip_spaces
+    if layout is not None and layout.credit:
+        column, marker = layout.credit
+        return split_credits(
+            amount_column(columns[mapping["amount"]], tilde),
+            clean(columns[column]),
+            marker,
+        )
+    return (
+        amount_column(columns[mapping["dr_amount"]], tilde),
+        amount_column(columns[mapping["cr_amount"]], tilde),
+    )
+
+
+def parse_block(parser, rows: list) -> list:
+    """Parse a block of transaction rows into ``Transaction`` records."""
+    if not rows:
+        return []
+    columns = list(zip(*rows))
+    if parser.layout is None or parser.layout.tilde:
+        date_strings = _strip(columns[parser.attrs_mapping["date"]])
+        descriptions = _strip(columns[parser.attrs_mapping["description"]])
+    else:
+        date_strings = _strip_spaces(columns[parser.attrs_mapping["date"]])
+        descriptions = _strip_spaces(columns[parser.attrs_mapping["description"]])
+    dr_amounts, cr_amounts = _amounts(parser, columns)
+    ordinals = _distinct(
+        lambda text: ordinal_of(parser.normalize_date(text)), date_strings
+    )
+    categories = _distinct(parser.categorize_transactions, descriptions)
+
+    transactions = []
+    for date_string, description, dr_amount, cr_amount in zip(
+        date_strings, descriptions, dr_amounts, cr_amounts
+    ):
+        date_ordinal = ordinals[date_string]
+        transactions.append(
+            Transaction(
+                date_ordinal,
+                description,
+                dr_amount,
+                cr_amount,
+                parser.bank,
+                categories[description],
+                "expense" if dr_amount > 0 else "deposit",
+                parser.occurrences.next(
+                    date_ordinal, (description, dr_amount, cr_amount)
+                ),
+            )
+        )
+    return transactions
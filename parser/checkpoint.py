@@ -0,0 +1,51 @@
+"""Checkpoints for resuming interrupted chunked parses."""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger("munim")
+
+CHECKPOINT_SUFFIX = ".ckpt"
+
+
+class Checkpoint:
+    """Progress of one chunked parse, kept next to its temporary output.
+
+    Each committed chunk records how many CSV rows were consumed, how many
+    transactions were written and the output offset after them, together
+    with the statement's size, mtime and parser version. A checkpoint only
+    applies to the exact statement and parser that wrote it.
+    """
+
+    def __init__(self, output_path: Path, source: dict):
+        """Initialize the checkpoint for ``output_path`` and a statement's ``source``."""
+        output_path = Path(output_path)
+        self.path = output_path.with_name(output_path.name + CHECKPOINT_SUFFIX)
+        self.partial_path = output_path.with_name(output_path.name + ".tmp")
+        self.source = source
+
+    def load(self):
+        """Return the saved progress dict, or None if there is nothing to resume."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("source") != self.source or not self.partial_path.exists():
+            logger.info("Ignoring stale checkpoint %s", self.path)
+            return None
+        return state
+
+    def save(self, rows: int, count: int, offset: int):
+        """Atomically record a committed chunk."""
+        state = {"source": self.source, "rows": rows, "count": count, "offset": offset}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint once the output is complete."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,125 @@
+"""Memoized, format-inferring date normalization."""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+DATE_FORMATS = (
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%d-%b-%y",
+    "%d/%m/%y",
+    "%d/%m/%Y %H:%M:%S",
+)
+
+# Returned by a fast path when the text does not have its fixed-width shape,
+# so strptime must decide (it also accepts e.g. single-digit days).
+_SLOW = object()
+
+
+def _iso(year: int, month: int, day: int):
+    """Return YYYY-MM-DD for a valid date, or None if the date does not exist."""
+    try:
+        date(year, month, day)
+    except ValueError:
+        return None
+    return f"{year}-{month:02d}-{day:02d}"
+
+
+def _fast_dmy(sep: str, year_digits: int):
+    """Build a strptime-free parser for DD<sep>MM<sep>YYYY or DD<sep>MM<sep>YY."""
+    width = 6 + year_digits
+
+    def parse(text: str):
+        if (
+            len(text) != width
+            or text[2] != sep
+            or text[5] != sep
+            or not (text[:2] + text[3:5] + text[6:]).isdecimal()
+        ):
+            return _SLOW
+        year = int(text[6:])
+        if year_digits == 2:
+            # strptime's %y pivot: 69-99 -> 1900s, 00-68 -> 2000s.
+            year += 1900 if year >= 69 else 2000
+        elif year < 1000:
+            # strftime("%Y") does not zero-pad such years on every platform.
+            return _SLOW
+        return _iso(year, int(text[3:5]), int(text[:2]))
+
+    return parse
+
+
+def _fast_dmy_hms(text: str):
+    """Parse DD/MM/YYYY HH:MM:SS without strptime."""
+    if len(text) != 19 or text[10] != " " or text[13] != ":" or text[16] != ":":
+        return _SLOW
+    clock = text[11:13] + text[14:16] + text[17:]
+    if not clock.isdecimal():
+        return _SLOW
+    if int(text[11:13]) > 23 or int(text[14:16]) > 59 or int(text[17:]) > 59:
+        return None
+    return _FAST_PATHS["%d/%m/%Y"](text[:10])
+
+
+_FAST_PATHS = {
+    "%d-%m-%Y": _fast_dmy("-", 4),
+    "%d/%m/%Y": _fast_dmy("/", 4),
+    "%d/%m/%y": _fast_dmy("/", 2),
+    "%d/%m/%Y %H:%M:%S": _fast_dmy_hms,
+}
+
+
+def _try_format(text: str, fmt: str):
+    """Return the normalized date for one format, or None if it does not match."""
+    fast = _FAST_PATHS.get(fmt)
+    if fast is not None:
+        result = fast(text)
+        if result is not _SLOW:
+            return result
+    try:
+        return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+class DateNormalizer:  # pylint: disable=too-few-public-methods
+    """Normalizes statement dates to YYYY-MM-DD.
+
+    Banks use one date format consistently, so the first format that
+    matches is pinned and tried first for the following rows; ``reset``
+    unpins it at the start of each file, back to the ``preferred`` format
+    when the caller knows it. Results are kept in a bounded LRU
+    cache since statements repeat the same few hundred dates, and the
+    fixed-width numeric formats are parsed without ``strptime``. The
+    supported formats never match the same text, so pinning cannot change a
+    result.
+    """
+
+    def __init__(
+        self, formats: tuple = DATE_FORMATS, cache_size: int = 4096, preferred=None
+    ):
+        """Initialize the normalizer with its formats, cache size and first guess."""
+        self.formats = formats
+        self.preferred = preferred
+        self.pinned = preferred
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def reset(self):
+        """Forget the pinned format, e.g. before reading a new file."""
+        self.pinned = self.preferred
+
+    def _normalize(self, date_str: str) -> str:
+        """Normalize one date string, raising ValueError if no format matches."""
+        text = date_str.strip()
+        if self.pinned is not None:
+            result = _try_format(text, self.pinned)
+            if result is not None:
+                return result
+        for fmt in self.formats:
+            if fmt == self.pinned:
+                continue
+            result = _try_format(text, fmt)
+            if result is not None:
+                self.pinned = fmt
+                return result
+        raise ValueError(f"Unsupported date format: {date_str}")
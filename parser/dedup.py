@@ -0,0 +1,68 @@
+"""Persistent fingerprint index for dropping duplicate transactions."""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger("munim")
+
+DEDUP_NAME = ".dedup"
+
+
+class DedupIndex:
+    """Maps each transaction fingerprint to the statement that first had it.
+
+    While a statement is parsed, every transaction whose fingerprint is
+    already owned by another statement is dropped, at the cost of one dict
+    lookup. The index is stored per statement next to the JSON outputs, so
+    duplicates are caught across files and across runs; re-parsing a
+    statement first releases the fingerprints it owned.
+    """
+
+    def __init__(self, directory: str = "./data/json"):
+        """Load the index from the output directory, if present."""
+        self.path = Path(directory) / DEDUP_NAME
+        self.sources: dict = {}
+        self.owners: dict = {}
+        self.dropped: dict = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.sources = json.load(f)
+            except ValueError:
+                logger.warning("Ignoring corrupt dedup index %s", self.path)
+        for source, fingerprints in self.sources.items():
+            for fp in fingerprints:
+                self.owners.setdefault(fp, source)
+
+    def forget(self, source: str):
+        """Release every fingerprint owned by ``source``."""
+        for fp in self.sources.pop(source, ()):
+            if self.owners.get(fp) == source:
+                del self.owners[fp]
+        self.dropped.pop(source, None)
+
+    def filter(self, transactions, source: str):
+        """Yield the transactions of ``source`` not already seen in another statement."""
+        owned = self.sources.setdefault(source, [])
+        owners = self.owners
+        for transaction in transactions:
+            fp = transaction.fingerprint
+            owner = owners.get(fp)
+            if owner is None:
+                owners[fp] = source
+                owned.append(fp)
+            elif owner != source:
+                self.dropped[source] = self.dropped.get(source, 0) + 1
+                continue
+            yield transaction
+
+    def save(self):
+        """Atomically write the index next to the JSON outputs."""
+        if not self.path.parent.exists():
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.sources, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
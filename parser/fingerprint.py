@@ -0,0 +1,62 @@
+"""Stable transaction fingerprints for cross-statement deduplication."""
+
+import hashlib
+from collections import Counter
+
+
+def normalize_description(description: str) -> str:
+    """Casefold a description and collapse its whitespace."""
+    return " ".join(description.casefold().split())
+
+
+def fingerprint(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    account: str,
+    date_ordinal: int,
+    dr_amount: float,
+    cr_amount: float,
+    description: str,
+    occurrence: int = 0,
+) -> str:
+    """Return the fingerprint of a transaction as 32 hex digits.
+
+    It covers the account, date, amounts and normalized description, plus
+    the ``occurrence`` of identical transactions within one statement, so
+    legitimate repeats (two identical coffees on one day) stay distinct
+    while the same transaction in an overlapping export matches.
+    """
+    text = "|".join(
+        (
+            account,
+            str(date_ordinal),
+            repr(dr_amount),
+            repr(cr_amount),
+            normalize_description(description),
+            str(occurrence),
+        )
+    )
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class OccurrenceCounter:
+    """Numbers identical transactions within one statement.
+
+    Repeats are counted per date and identity over the whole statement, so
+    two exports that order or interleave the rows of a date differently
+    still number the same transactions alike. Memory is bounded by the
+    distinct transactions of the statement.
+    """
+
+    def __init__(self):
+        """Initialize an empty counter."""
+        self._seen = Counter()
+
+    def reset(self):
+        """Start counting a new statement."""
+        self._seen.clear()
+
+    def next(self, date_ordinal: int, identity: tuple) -> int:
+        """Return how often ``identity`` was already seen on ``date_ordinal``."""
+        key = (date_ordinal, identity)
+        occurrence = self._seen[key]
+        self._seen[key] = occurrence + 1
+        return occurrence
@@ -0,0 +1,224 @@
+"""Memory-mapped reading of statement files, with bank detection.
+
+Statements arrive with generic names and in mixed encodings. The first
+``SNIFF_BYTES`` of each file are sniffed for the encoding (byte order
+mark, UTF-16 without one, then UTF-8, cp1252 and latin-1) and for the
+header row of a known layout, which also gives the delimiter. ``route``
+sends a file to the bank whose header it holds, and falls back to the
+longest matching file name prefix.
+
+``MappedStatement`` memory-maps the file and decodes it in blocks of
+``BLOCK_BYTES``, each split into lines at once, so the CSV reader never
+waits on per-line reads and decoding.
+"""
+
+import codecs
+import csv
+import io
+import mmap
+import os
+from functools import lru_cache
+from itertools import chain
+from parser.banks import LAYOUTS
+from typing import NamedTuple
+
+# Bytes sniffed at the start of a file, and the lines searched for a header.
+SNIFF_BYTES = 8192
+SNIFF_LINES = 20
+
+# Bytes decoded at a time.
+BLOCK_BYTES = 1 << 20
+
+DELIMITERS = (",", "|", ";", "\t")
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Tried in order on the sample; latin-1 decodes anything.
+ENCODINGS = ("utf-8", "cp1252")
+
+
+def header_key(fields) -> tuple:
+    """Return the normalized form of a header row, for comparing layouts."""
+    return tuple(field.strip().strip("~").strip().casefold() for field in fields)
+
+
+HEADERS = {
+    header_key(spec["header"]): bank
+    for bank, spec in LAYOUTS.items()
+    if spec.get("header")
+}
+
+
+class Sniff(NamedTuple):
+    """What the start of a statement file tells about it.
+
+    ``delimiter`` and ``bank`` are None unless a known header was found.
+    """
+
+    encoding: str
+    delimiter: str
+    bank: str
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """Return the encoding of a file starting with ``sample``."""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if b"\x00" in sample:
+        # ASCII text in UTF-16 has a zero byte in every code unit.
+        return (
+            "utf-16-le" if sample[1::2].count(0) > sample[::2].count(0) else "utf-16-be"
+        )
+    for encoding in ENCODINGS:
+        try:
+            # Incremental, so a character cut off at the end is not an error.
+            codecs.getincrementaldecoder(encoding)().decode(sample)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return "latin-1"
+
+
+def sniff(sample: bytes) -> Sniff:
+    """Sniff the encoding, delimiter and bank from the start of a file."""
+    encoding = sniff_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample)
+    for line in text.splitlines()[:SNIFF_LINES]:
+        for delimiter in DELIMITERS:
+            if delimiter not in line:
+                continue
+            bank = HEADERS.get(
+                header_key(next(csv.reader([line], delimiter=delimiter)))
+            )
+            if bank is not None:
+                return Sniff(encoding, delimiter, bank)
+    return Sniff(encoding, None, None)
+
+
+@lru_cache(maxsize=1024)
+def _sniff_file(path: str, size: int, mtime_ns: int) -> Sniff:
+    """Sniff one version of a file; the size and mtime key the cache."""
+    del size, mtime_ns
+    with open(path, "rb") as f:
+        return sniff(f.read(SNIFF_BYTES))
+
+
+def sniff_file(path) -> Sniff:
+    """Sniff a file, or return an empty ``Sniff`` if it cannot be read."""
+    try:
+        stat = os.stat(path)
+        return _sniff_file(str(path), stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return Sniff(None, None, None)
+
+
+def route(path, prefixes: dict):
+    """Return the key of ``prefixes`` (``{key: file prefix}``) a statement belongs to.
+
+    A file holding the header of a known bank belongs to that bank, or to
+    none of ``prefixes`` if the bank is not among them. Other files go to
+    the longest prefix of their name, or None.
+    """
+    bank = sniff_file(path).bank
+    if bank is not None:
+        return bank if bank in prefixes else None
+    matches = [key for key, prefix in prefixes.items() if path.name.startswith(prefix)]
+    return max(matches, key=lambda key: len(prefixes[key]), default=None)
+
+
+def _byte_newlines(encoding: str) -> bool:
+    """Return whether every ``\\n`` byte is a newline in ``encoding``."""
+    one, two = "\n".encode(encoding), "\n\n".encode(encoding)
+    return one.endswith(b"\n") and len(two) == len(one) + 1
+
+
+# Line boundaries of str.splitlines that a text-mode file does not split on.
+_OTHER_BREAKS = ("\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+
+def split_lines(text: str) -> list:
+    """Split text into lines as a file opened in text mode would.
+
+    ``\\r\\n`` and ``\\r`` end lines and become ``\\n``. ``str.splitlines``
+    is used unless the text holds another character it would split on.
+    """
+    if "\r" in text or any(char in text for char in _OTHER_BREAKS):
+        return io.StringIO(text, newline=None).readlines()
+    return text.splitlines(True)
+
+
+class MappedStatement:
+    """A statement file, memory-mapped and decoded in blocks of lines.
+
+    Stands in for the open text file in ``BaseParser.read_csv``: iterating
+    yields lines with universal newlines, like a file opened in text mode.
+    ``encoding`` overrides the sniffed one.
+    """
+
+    def __init__(self, path, encoding: str = None):
+        """Map the file and sniff its start."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._map = b""  # An empty file cannot be mapped.
+        sniffed = sniff(self._map[:SNIFF_BYTES])
+        self.encoding: str = encoding or sniffed.encoding
+        self.delimiter: str = sniffed.delimiter
+        self.bank: str = sniffed.bank
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def close(self):
+        """Unmap the file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def blocks(self, size: int = None):
+        """Yield the file's lines in lists, decoding about ``size`` bytes at a time.
+
+        A block ends at a newline, so no line, ``\\r\\n`` or character is
+        split. In encodings where every ``\\n`` byte is a newline (UTF-8,
+        cp1252, latin-1) blocks are cut in the mapped bytes and decoded in
+        one call each; others go through an incremental decoder. ``size``
+        defaults to ``BLOCK_BYTES``.
+        """
+        size = size or BLOCK_BYTES
+        if not _byte_newlines(self.encoding):
+            yield from self._decoded_blocks(size)
+            return
+        start = 0
+        while start < len(self._map):
+            stop = self._map.rfind(b"\n", start, start + size) + 1
+            if not stop:
+                stop = self._map.find(b"\n", start + size) + 1 or len(self._map)
+            data = self._map[start:stop]
+            yield split_lines(str(data, self.encoding))
+            start = stop
+
+    def _decoded_blocks(self, size: int):
+        """Yield lists of lines, carrying partial lines over between blocks."""
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        carry = ""
+        for start in range(0, len(self._map), size):
+            stop = start + size
+            text = carry + decoder.decode(self._map[start:stop])
+            cut = text.rfind("\n") + 1
+            carry = text[cut:]
+            if cut:
+                yield split_lines(text[:cut])
+        text = carry + decoder.decode(b"", final=True)
+        if text:
+            yield split_lines(text)
+
+    def __iter__(self):
+        return chain.from_iterable(self.blocks())
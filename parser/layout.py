@@ -0,0 +1,193 @@
+"""Parser classes compiled from the declarative layouts in ``parser.banks``.
+
+``Layout`` validates one layout and generates its two per-row functions
+as Python source, compiled once per bank: ``is_transaction`` filters rows
+and ``parse`` turns a row into a ``Transaction``. Column indexes, the
+``~`` handling, skip markers and the debit/credit rule are baked into the
+code, so the hot path does no mapping lookups and no generic cleanup.
+Every bank in ``LAYOUTS`` gets a ``LayoutParser`` subclass in this module,
+named by ``parser_name`` (``HdfcParser``, ``CcIciciParser``, ...).
+"""
+
+from functools import partial
+from parser.banks import LAYOUTS, parser_name
+from parser.base import OUTPUT_DIR, STATEMENT_DIR, BaseParser
+from parser.dates import DateNormalizer
+from parser.record import Transaction, ordinal_of
+
+KEYS = (
+    "account",
+    "prefix",
+    "header",
+    "width",
+    "columns",
+    "credit",
+    "delimiter",
+    "tilde",
+    "card",
+    "skip",
+    "required",
+    "date_format",
+    "merchant_rules",
+    "version",
+)
+
+
+class Layout:  # pylint: disable=too-many-instance-attributes
+    """One bank's statement layout; see ``parser.banks`` for the keys."""
+
+    def __init__(self, spec: dict):
+        """Validate a layout spec."""
+        unknown = set(spec) - set(KEYS)
+        if unknown:
+            raise ValueError(f"Unknown layout keys: {', '.join(sorted(unknown))}")
+        self.account: str = spec["account"]
+        self.prefix: str = spec["prefix"]
+        self.header: tuple = tuple(spec.get("header", ()))
+        self.width: int = spec["width"]
+        self.columns: dict = dict(spec["columns"])
+        self.credit: tuple = spec.get("credit")
+        self.delimiter: str = spec.get("delimiter", ",")
+        self.tilde: bool = spec.get("tilde", False)
+        self.card: bool = spec.get("card", False)
+        self.skip: frozenset = frozenset(spec.get("skip", ()))
+        self.required: tuple = tuple(spec.get("required", ()))
+        self.date_format: str = spec.get("date_format")
+        self.merchant_rules: tuple = tuple(spec.get("merchant_rules", ()))
+        self.version: str = spec.get("version", "1")
+
+        amounts = ("amount",) if self.credit else ("dr_amount", "cr_amount")
+        missing = {"date", "description", *amounts} - set(self.columns)
+        if missing:
+            raise ValueError(f"Missing layout columns: {', '.join(sorted(missing))}")
+        used = [*self.columns.values(), *self.required]
+        if self.credit:
+            used.append(self.credit[0])
+        if any(not 0 <= column < self.width for column in used):
+            raise ValueError(f"Layout columns must be below the width {self.width}")
+        if self.header and len(self.header) != self.width:
+            raise ValueError(f"Layout header must have {self.width} columns")
+
+    def _field(self, column: int) -> str:
+        """Return the expression for one cleaned field of ``row``."""
+        if self.tilde:
+            return f'row[{column}].strip().strip("~")'
+        return f"row[{column}].strip()"
+
+    def _amount(self, column: int) -> str:
+        """Return the expression for one amount field of ``row``."""
+        return f'float({self._field(column)}.replace(",", "") or 0)'
+
+    def filter_source(self) -> str:
+        """Return the source of ``is_transaction(row)``."""
+        conditions = [f"len(row) == {self.width}"]
+        if self.skip:
+            conditions.append(f"{self._field(0)} not in SKIP")
+        conditions += [f"{self._field(column)} != ''" for column in self.required]
+        return "def is_transaction(row):\n    return " + " and ".join(conditions) + "\n"
+
+    def parse_source(self) -> str:
+        """Return the source of ``parse(self, row)``."""
+        columns = self.columns
+        lines = [
+            "def parse(self, row):",
+            f"    description = {self._field(columns['description'])}",
+        ]
+        if self.credit:
+            column, marker = self.credit
+            lines += [
+                f"    amount = {self._amount(columns['amount'])}",
+                f"    if {self._field(column)}.lower() == {marker.lower()!r}:",
+                "        dr_amount, cr_amount = 0.0, amount",
+                "    else:",
+                "        dr_amount, cr_amount = amount, 0.0",
+            ]
+        else:
+            lines += [
+                f"    dr_amount = {self._amount(columns['dr_amount'])}",
+                f"    cr_amount = {self._amount(columns['cr_amount'])}",
+            ]
+        lines += [
+            "    date_ordinal = ordinal_of("
+            f"self.normalize_date({self._field(columns['date'])}))",
+            "    return Transaction(",
+            "        date_ordinal,",
+            "        description,",
+            "        dr_amount,",
+            "        cr_amount,",
+            "        ACCOUNT,",
+            "        self.categorize_transactions(description),",
+            '        "expense" if dr_amount > 0 else "deposit",',
+            "        self.occurrences.next("
+            "date_ordinal, (description, dr_amount, cr_amount)),",
+            "    )",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def compile(self) -> tuple:
+        """Return the compiled ``(is_transaction, parse)`` functions."""
+        namespace = {
+            "SKIP": self.skip,
+            "ACCOUNT": self.account,
+            "Transaction": Transaction,
+            "ordinal_of": ordinal_of,
+        }
+        source = self.filter_source() + self.parse_source()
+        code = compile(source, f"<layout {self.prefix}>", "exec")
+        exec(code, namespace)  # pylint: disable=exec-used
+        return namespace["is_transaction"], namespace["parse"]
+
+
+class LayoutParser(BaseParser):
+    """Base class of the parsers generated from a ``Layout``.
+
+    A parser pickles as its directories and mapper only, so it reaches a
+    worker process as a fresh instance with empty per-statement state.
+    """
+
+    layout: Layout = None
+
+    def __init__(self, input_dir=STATEMENT_DIR, output_dir=OUTPUT_DIR, mapper=None):
+        """Initialize the parser from its layout; see ``BaseParser``."""
+        layout = self.layout
+        super().__init__(
+            bank=layout.account,
+            file_starts_with=layout.prefix,
+            tx_row_col_count=layout.width,
+            attrs_mapping=dict(layout.columns),
+            input_dir=input_dir,
+            output_dir=output_dir,
+            mapper=mapper,
+        )
+        self.delimiter = layout.delimiter
+        self.date_normalizer = DateNormalizer(preferred=layout.date_format)
+
+    def __reduce__(self):
+        return (
+            partial(type(self), self.input_dir, self.output_dir, self.mapper),
+            (),
+        )
+
+
+def layout_parser(bank: str, spec: dict) -> type:
+    """Return a parser class for one bank's layout."""
+    layout = Layout(spec)
+    is_transaction, parse = layout.compile()
+    return type(
+        parser_name(bank),
+        (LayoutParser,),
+        {
+            "__module__": __name__,
+            "__doc__": f"Parser for {layout.account} statements, compiled from its layout.",
+            "layout": layout,
+            "name": bank,
+            "version": layout.version,
+            "merchant_rules": layout.merchant_rules,
+            "is_transaction": staticmethod(is_transaction),
+            "parse": parse,
+        },
+    )
+
+
+for _bank, _spec in LAYOUTS.items():
+    globals()[parser_name(_bank)] = layout_parser(_bank, _spec)
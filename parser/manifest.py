@@ -0,0 +1,93 @@
+"""Content-hash manifest for incremental statement parsing."""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger("munim")
+
+MANIFEST_NAME = ".manifest"
+
+PARSE = "parse"
+RECATEGORIZE = "recategorize"
+SKIP = "skip"
+
+
+def file_digest(path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Records, per output, its source file's size, mtime, hash and versions.
+
+    ``plan`` decides whether a statement must be parsed, only re-categorized
+    (when just the expense mapper changed) or skipped entirely. The hash is
+    only computed when the size or mtime no longer match the recorded ones.
+    Entries are keyed by output path, so each output format of a statement
+    is judged stale or fresh on its own.
+    """
+
+    def __init__(self, directory: str = "./data/json"):
+        """Load the manifest from the output directory, if present."""
+        self.path = Path(directory) / MANIFEST_NAME
+        self.entries: dict = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except ValueError:
+                logger.warning("Ignoring corrupt manifest %s", self.path)
+
+    def plan(self, file_path, output_path, parser_version: str, mapper: str):
+        """Return ``(action, source)`` for a statement file.
+
+        ``source`` holds the file's current size, mtime and hash and is passed
+        back to ``record`` once the file has been processed.
+        """
+        stat = os.stat(file_path)
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        entry = self.entries.get(str(output_path))
+
+        if entry and (entry["size"], entry["mtime_ns"]) == (
+            source["size"],
+            source["mtime_ns"],
+        ):
+            source["sha256"] = entry["sha256"]
+        else:
+            source["sha256"] = file_digest(file_path)
+
+        if (
+            not entry
+            or entry["sha256"] != source["sha256"]
+            or entry["parser"] != parser_version
+            or not Path(output_path).exists()
+        ):
+            return PARSE, source
+        if entry["mapper"] != mapper:
+            return RECATEGORIZE, source
+        if entry["mtime_ns"] != source["mtime_ns"]:
+            # Touched but identical content: remember the new mtime.
+            entry["mtime_ns"] = source["mtime_ns"]
+        return SKIP, source
+
+    def record(self, output_path, source: dict, parser_version: str, mapper: str):
+        """Record the output of a successfully processed statement file."""
+        self.entries[str(output_path)] = dict(
+            source, parser=parser_version, mapper=mapper
+        )
+
+    def save(self):
+        """Atomically write the manifest next to the JSON outputs."""
+        if not self.path.parent.exists():
+            return
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
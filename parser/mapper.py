@@ -0,0 +1,221 @@
+"""Process-wide registry of compiled expense mappers."""
+
+import logging
+import os
+import pickle
+import re
+import threading
+from parser.manifest import file_digest
+from parser.matcher import KeywordMatcher
+from parser.merchant import MerchantCache, pinned_keywords
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger("munim")
+
+MAPPER_FILE = Path(".") / "expense_mapper.yaml"
+CACHE_DIR = Path("./data/cache")
+
+# Bump when KeywordMatcher's internals change, so stale pickles are rebuilt.
+CACHE_FORMAT = 2
+
+# Compiled mapper versions kept for sharing between mappers with equal content.
+SHARED_VERSIONS = 64
+
+
+class MapperState(NamedTuple):
+    """One loaded version of a mapper, swapped in whole by ``refresh``."""
+
+    version: str
+    mapping: dict
+    matcher: KeywordMatcher
+    pinned: Optional[re.Pattern]
+    merchants: MerchantCache
+
+
+class ExpenseMapper:
+    """One expense mapper file, loaded once and compiled into a matcher.
+
+    ``refresh`` stats the file and only re-reads it when its size or mtime
+    changed and its SHA-256 no longer matches the loaded version. The
+    compiled matcher is pickled to ``CACHE_DIR`` keyed by that hash, so a
+    fresh process can skip YAML parsing and automaton building entirely.
+    ``categorize`` memoizes keyword scans per normalized merchant in a cache
+    that is saved next to it by ``save_merchants``.
+
+    The compiled matcher is immutable and shared by every mapper of the
+    process with the same content, so tenants with identical mapper files
+    compile it once. ``refresh`` is serialized by a lock and replaces the
+    ``state`` in one assignment, so a thread categorizing meanwhile never
+    mixes two versions. A mapper pickles as a reference to the registry
+    entry for its paths.
+    """
+
+    def __init__(self, path=MAPPER_FILE, cache_dir=CACHE_DIR):
+        """Initialize an empty mapper for ``path``; call ``refresh`` to load."""
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir)
+        self.state = MapperState(
+            None, {}, KeywordMatcher({}), None, MerchantCache(None)
+        )
+        self._stat = None
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return expense_mapper, (self.path, self.cache_dir)
+
+    @property
+    def version(self) -> str:
+        """The SHA-256 of the loaded mapper file, ``none`` if missing, or None."""
+        return self.state.version
+
+    @property
+    def mapping(self) -> dict:
+        """The loaded ``{category: rules}`` mapping."""
+        return self.state.mapping
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        """The compiled matcher of the loaded mapping."""
+        return self.state.matcher
+
+    @property
+    def merchants(self) -> MerchantCache:
+        """The merchant cache of the loaded version."""
+        return self.state.merchants
+
+    @property
+    def cache_path(self) -> Path:
+        """The pickle holding this mapper's compiled form."""
+        return self.cache_dir / (self.path.stem + ".pickle")
+
+    @property
+    def merchants_path(self) -> Path:
+        """The JSON file holding this mapper's merchant cache."""
+        return self.cache_dir / (self.path.stem + ".merchants.json")
+
+    def refresh(self):
+        """Reload the mapper if the file changed since it was last loaded."""
+        try:
+            stat = os.stat(self.path)
+            stat = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            stat = None
+        if self.version is not None and stat == self._stat:
+            return self
+        with self._lock:
+            if self.version is None or stat != self._stat:
+                version = file_digest(self.path) if stat else "none"
+                if version != self.version:
+                    self._load(version)
+                self._stat = stat
+        return self
+
+    def _load(self, version: str):
+        """Load ``version`` of the mapper, compiling it only if no mapper has."""
+        compiled = _compiled.get(version)
+        if compiled is None:
+            compiled = self._compile(version)
+            if len(_compiled) >= SHARED_VERSIONS:
+                _compiled.pop(next(iter(_compiled)), None)
+            _compiled[version] = compiled
+        elif not self.cache_path.exists():
+            self._write_cache(version, *compiled[:2])
+        merchants = MerchantCache(version)
+        merchants.load(self.merchants_path)
+        self.state = MapperState(version, *compiled, merchants)
+        logger.debug("Loaded expense mapper %s (%s)", self.path, version[:12])
+
+    def _compile(self, version: str) -> tuple:
+        """Return ``(mapping, matcher, pinned)`` from the cache or the YAML file."""
+        cached = self._read_cache(version)
+        if cached:
+            mapping, matcher = cached
+        else:
+            mapping = self._read_yaml() if version != "none" else {}
+            matcher = KeywordMatcher(mapping)
+            self._write_cache(version, mapping, matcher)
+        return mapping, matcher, pinned_keywords(matcher.literals)
+
+    def categorize(self, description: str, normalizer) -> str:
+        """Return the category of a description, cached per merchant.
+
+        ``normalizer`` extracts the merchant; descriptions containing a
+        pinned keyword are matched in full. Regex rules are resolved against
+        the description itself.
+        """
+        state = self.state
+        if state.pinned is not None and state.pinned.search(description.lower()):
+            return state.matcher.match(description)
+        merchant = normalizer.normalize(description)
+        scan = state.merchants.get(merchant)
+        if scan is None:
+            scan = state.merchants.put(merchant, state.matcher.scan(merchant))
+        return state.matcher.resolve(description, *scan)
+
+    def save_merchants(self):
+        """Save the merchant cache, if the cache directory can be created."""
+        state = self.state
+        if state.version == "none" or not self.cache_dir.parent.exists():
+            return
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+        except OSError as e:
+            logger.warning("Could not save merchant cache: %s", e)
+            return
+        state.merchants.save(self.merchants_path)
+
+    def _read_yaml(self) -> dict:
+        """Parse the YAML mapper file."""
+        import yaml  # pylint: disable=import-outside-toplevel
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+
+    def _read_cache(self, version: str):
+        """Return ``(mapping, matcher)`` from the cache if it is for ``version``."""
+        try:
+            with open(self.cache_path, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, ValueError, EOFError, AttributeError, pickle.PickleError):
+            return None
+        if cached.get("format") != CACHE_FORMAT or cached.get("version") != version:
+            return None
+        return cached["mapping"], cached["matcher"]
+
+    def _write_cache(self, version: str, mapping: dict, matcher: KeywordMatcher):
+        """Atomically pickle the compiled mapper, if the data directory exists."""
+        if version == "none" or not self.cache_dir.parent.exists():
+            return
+        cached = {
+            "format": CACHE_FORMAT,
+            "version": version,
+            "mapping": mapping,
+            "matcher": matcher,
+        }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not cache expense mapper: %s", e)
+
+
+# {(mapper path, cache dir): ExpenseMapper} and {version: compiled mapper}.
+_registry: dict = {}
+_compiled: dict = {}
+_registry_lock = threading.Lock()
+
+
+def expense_mapper(path=MAPPER_FILE, cache_dir=CACHE_DIR) -> ExpenseMapper:
+    """Return the shared, up-to-date mapper for ``path`` in this process."""
+    key = (Path(path).resolve(), Path(cache_dir).resolve())
+    mapper = _registry.get(key)
+    if mapper is None:
+        with _registry_lock:
+            mapper = _registry.get(key)
+            if mapper is None:
+                mapper = _registry[key] = ExpenseMapper(*key)
+    return mapper.refresh()
@@ -0,0 +1,184 @@
+"""Compiled keyword matcher for expense categorization.
+
+A category in ``expense_mapper.yaml`` is either a plain list of keywords or
+a mapping of rules::
+
+    food:
+    - swiggy
+    - zepto
+    rent:
+      priority: 10
+      keywords: [nobroker]
+      prefixes: [NEFT-LANDLORD]
+      regex: ['^UPI-\\d+-RENT']
+      exclude: [refund]
+
+Keywords match anywhere in a description, prefixes only at its start and
+regexes anywhere unless anchored; all of them ignore case. A category whose
+exclusion words appear in a description does not match it. The category
+with the highest ``priority`` (default 0) among the matching ones wins, and
+among equal priorities the one defined last, like the original nested loop.
+"""
+
+import re
+from collections import deque
+
+UNCATEGORIZED = "uncategorized"
+
+RULES = ("keywords", "prefixes", "regex", "exclude", "priority")
+
+# Marks the start of a description, so prefixes match only there.
+_ANCHOR = "\x00"
+
+
+def _strings(category: str, rule: str, value) -> list:
+    """Return a rule's strings, accepting a single string for a list."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{category}: {rule} must be a list of strings")
+    return value
+
+
+def compile_rules(expense_mapper: dict) -> list:
+    """Return the categories' rules as dicts, lowest precedence first.
+
+    Each category's regexes are combined into one case-insensitive
+    alternation. Raises ValueError for malformed rules.
+    """
+    rules = []
+    for index, (category, spec) in enumerate(expense_mapper.items()):
+        if not isinstance(spec, dict):
+            spec = {"keywords": spec}
+        unknown = set(spec) - set(RULES)
+        if unknown:
+            raise ValueError(f"{category}: unknown rules {', '.join(sorted(unknown))}")
+        priority = spec.get("priority") or 0
+        if not isinstance(priority, int):
+            raise ValueError(f"{category}: priority must be an integer")
+        rule = {name: _strings(category, name, spec.get(name)) for name in RULES[:4]}
+        regexes = rule["regex"]
+        try:
+            rule["regex"] = regexes and re.compile(
+                "|".join(f"(?:{regex})" for regex in regexes), re.IGNORECASE
+            )
+        except re.error as e:
+            raise ValueError(f"{category}: invalid regex: {e}") from e
+        rule.update(category=str(category), order=(priority, index))
+        rules.append(rule)
+    return sorted(rules, key=lambda rule: rule["order"])
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over every literal rule of the expense mapper.
+
+    Categories are ranked by precedence (see the module docstring), and
+    keywords, prefixes and exclusion words all go into one automaton: a
+    prefix is inserted behind a start-of-text marker, and an exclusion word
+    of the category ranked ``r`` reports bit ``n + r`` instead of ``r``. A
+    single pass over a description therefore yields the best matching
+    category that is not excluded. Regexes are only tried afterwards, from
+    the highest rank down, for categories that would still beat it.
+    """
+
+    def __init__(self, expense_mapper: dict):
+        """Build the automaton from the expense mapping."""
+        rules = compile_rules(expense_mapper)
+        self.categories: list = [rule["category"] for rule in rules]
+        self.literals: list = []
+        self._goto: list = [{}]
+        self._fail: list = [0]
+        self._out: list = [0]
+        count = len(rules)
+        for rank, rule in enumerate(rules):
+            for keyword in rule["keywords"]:
+                self._add(keyword.lower(), 1 << rank)
+            for prefix in rule["prefixes"]:
+                self._add(_ANCHOR + prefix.lower(), 1 << rank)
+            for word in rule["exclude"]:
+                self._add(word.lower(), 1 << (count + rank))
+            self.literals += rule["keywords"] + rule["prefixes"] + rule["exclude"]
+        self._build()
+        self._count = count
+        self._anchor = _ANCHOR if any(rule["prefixes"] for rule in rules) else ""
+        self._regexes = [
+            (rank, rule["regex"])
+            for rank, rule in reversed(list(enumerate(rules)))
+            if rule["regex"]
+        ]
+        # Once the top category matches, nothing can beat it unless it can be excluded.
+        self._final = 1 << (count - 1) if rules and not rules[-1]["exclude"] else 0
+
+    def _add(self, keyword: str, bit: int):
+        """Insert a keyword into the trie, reporting ``bit`` where it ends."""
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+                self._goto[state][char] = nxt
+            state = nxt
+        self._out[state] |= bit
+
+    def _build(self):
+        """Compute failure links and fold suffix outputs into each state."""
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def scan(self, description: str) -> tuple:
+        """Return ``(rank, excluded)`` of the literal rules for a description.
+
+        ``rank`` is that of the best matching category that is not excluded,
+        or -1, and ``excluded`` has bit ``r`` set for each excluded rank.
+        """
+        goto, fail, out, final = self._goto, self._fail, self._out, self._final
+        found = out[0]
+        state = 0
+        text = description.lower()
+        if self._anchor:
+            text = self._anchor + text
+        for char in text:
+            nxt = goto[state].get(char)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(char)
+            state = nxt or 0
+            hit = out[state]
+            if hit:
+                found |= hit
+                if found & final:
+                    break
+        excluded = found >> self._count
+        matched = found & ((1 << self._count) - 1) & ~excluded
+        return matched.bit_length() - 1, excluded
+
+    def resolve(self, description: str, rank: int, excluded: int) -> str:
+        """Return the category for a description given its ``scan`` result."""
+        for regex_rank, regex in self._regexes:
+            if regex_rank <= rank:
+                break
+            if not excluded >> regex_rank & 1 and regex.search(description):
+                rank = regex_rank
+                break
+        return self.categories[rank] if rank >= 0 else UNCATEGORIZED
+
+    def match(self, description: str) -> str:
+        """Return the category for a description or ``uncategorized``."""
+        rank, excluded = self.scan(description)
+        if self._regexes:
+            return self.resolve(description, rank, excluded)
+        return self.categories[rank] if rank >= 0 else UNCATEGORIZED
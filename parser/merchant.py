@@ -0,0 +1,171 @@
+"""Merchant extraction and the per-merchant category cache.
+
+UPI and card descriptions carry per-transaction noise (reference numbers,
+masked card numbers, dates) around a stable counterparty, so nearly every
+description is distinct. ``MerchantNormalizer`` replaces that noise with a
+placeholder, and ``MerchantCache`` remembers the keyword automaton's scan
+of each normalized merchant, so a repeated merchant is categorized with one
+dict lookup instead of a scan.
+
+Every noise span starts with a digit or ``X`` and ends with a digit, so
+only keywords that contain digits, end in a separator followed by ``X``
+characters, or consist of ``X`` and punctuation alone can match across
+one. The same holds for prefixes and exclusion words. Those literals are
+"pinned": a description that contains one is categorized in full, which
+keeps the categories identical to matching the raw description. The
+placeholder is a NUL character, which no keyword written in the YAML
+file is expected to contain; if one does, every description is matched
+in full. Regex rules are always tried on the raw description.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("munim")
+
+PLACEHOLDER = "\x00"
+
+# Noise found in every bank's descriptions, matched as whole words. Each span
+# must start with a digit or X and end with a digit; see the module docstring.
+NOISE_PATTERNS = (
+    r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}",  # dates
+    r"\d{1,2}:\d{2}(?::\d{2})?",  # times
+    r"[0-9X]*X{2,}[0-9X]*\d",  # masked numbers
+    r"\d{6,}",  # references, phones, accounts
+)
+
+_SENSITIVE = re.compile(r"\d|[^a-z0-9]x+$|^[x\W_]+$")
+
+# Normalized merchants remembered per expense mapper version.
+CACHE_SIZE = 1 << 16
+MERCHANT_CACHE_FORMAT = 3
+
+
+class MerchantNormalizer:  # pylint: disable=too-few-public-methods
+    """Strips per-transaction noise from descriptions with one compiled regex.
+
+    ``extra`` adds bank-specific noise patterns to ``NOISE_PATTERNS``; they
+    must follow the same rule about the first and last character of a span.
+    Spans are only matched as whole words, and the alternation is only tried
+    where a word starts with a digit or ``X``.
+    """
+
+    def __init__(self, extra: tuple = ()):
+        """Compile the noise patterns into a single alternation."""
+        self.pattern = re.compile(
+            r"(?<![0-9A-Za-z])(?=[0-9X])(?:"
+            + "|".join((*NOISE_PATTERNS, *extra))
+            + r")(?![0-9A-Za-z])"
+        )
+
+    def normalize(self, description: str) -> str:
+        """Return the merchant part of a description."""
+        return self.pattern.sub(PLACEHOLDER, description)
+
+
+def printable(merchant: str) -> str:
+    """Return a normalized merchant with the placeholder shown as ``#``."""
+    return merchant.replace(PLACEHOLDER, "#")
+
+
+_normalizers: dict = {}
+
+
+def merchant_normalizer(extra: tuple = ()) -> MerchantNormalizer:
+    """Return the shared normalizer for a set of bank-specific patterns."""
+    normalizer = _normalizers.get(extra)
+    if normalizer is None:
+        normalizer = _normalizers[extra] = MerchantNormalizer(extra)
+    return normalizer
+
+
+def pinned_keywords(keywords):
+    """Return a regex finding the keywords noise could affect, or None.
+
+    The regex is searched in lowercased descriptions. A keyword containing
+    the placeholder pins every description.
+    """
+    if any(PLACEHOLDER in keyword for keyword in keywords):
+        return re.compile("")
+    pinned = sorted(
+        {keyword.lower() for keyword in keywords if _SENSITIVE.search(keyword.lower())}
+    )
+    if not pinned:
+        return None
+    return re.compile("|".join(map(re.escape, pinned)))
+
+
+class MerchantCache:
+    """A bounded ``{merchant: scan}`` cache for one expense mapper version.
+
+    Once ``maxsize`` merchants are cached the oldest entry is evicted. The
+    cache can be saved next to the compiled mapper and is only loaded back
+    for the same mapper ``version``. Parsers of several households can
+    share one cache from different threads: writes are serialized by a lock.
+    """
+
+    def __init__(self, version: str, maxsize: int = CACHE_SIZE):
+        """Initialize an empty cache."""
+        self.version = version
+        self.maxsize = maxsize
+        self.entries: dict = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def get(self, merchant: str):
+        """Return the cached scan of ``merchant``, or None."""
+        return self.entries.get(merchant)
+
+    def put(self, merchant: str, scan):
+        """Cache and return the scan of ``merchant``."""
+        with self._lock:
+            entries = self.entries
+            if len(entries) >= self.maxsize:
+                del entries[next(iter(entries))]
+            entries[merchant] = scan
+            self.dirty = True
+        return scan
+
+    def load(self, path: Path):
+        """Load the entries saved for this version from ``path``, if any."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            saved.get("format") == MERCHANT_CACHE_FORMAT
+            and saved.get("version") == self.version
+        ):
+            entries = list(saved["entries"].items())
+            first = max(len(entries) - self.maxsize, 0)
+            self.entries = dict(entries[first:])
+
+    def save(self, path: Path):
+        """Atomically write the cache to ``path`` if it changed."""
+        if not self.dirty or not path.parent.exists():
+            return
+        with self._lock:
+            entries = dict(self.entries)
+            self.dirty = False
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "format": MERCHANT_CACHE_FORMAT,
+                        "version": self.version,
+                        "entries": entries,
+                    },
+                    f,
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not save merchant cache: %s", e)
+            self.dirty = True
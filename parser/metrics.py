@@ -0,0 +1,208 @@
+"""Per-stage metrics and profiling for statement parsing."""
+
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+STAGES = ("read", "fields", "date", "categorize", "write")
+
+
+def peak_rss_mb():
+    """Return this process's peak resident set size in MB, if known."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class FileMetrics:
+    """Wall time per stage, row counts and peak memory for one statement file.
+
+    ``track`` temporarily wraps the parser's ``read_csv``, ``parse``,
+    ``parse_batch``, ``normalize_date`` and ``categorize_transactions`` on
+    the instance, so parsing pays for timing only while metrics are being
+    recorded.
+    """
+
+    def __init__(self, bank: str, file_name: str):
+        """Initialize empty metrics for one file."""
+        self.bank = bank
+        self.file = file_name
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.total = 0.0
+        self.rows_read = 0
+        self.rows = 0
+        self.peak_rss_mb = None
+
+    @property
+    def skipped(self) -> int:
+        """Rows read from the CSV that were not transactions."""
+        return self.rows_read - self.rows
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Transactions per second of wall time."""
+        return self.rows / self.total if self.total else 0.0
+
+    def _timed(self, stage: str, func):
+        """Wrap ``func`` so its wall time is added to ``stage``."""
+        seconds = self.seconds
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[stage] += time.perf_counter() - start
+
+        return wrapper
+
+    def _timed_read(self, read_csv):
+        """Wrap the ``read_csv`` generator, timing and counting each row."""
+
+        def wrapper(*args, **kwargs):
+            rows = read_csv(*args, **kwargs)
+            while True:
+                start = time.perf_counter()
+                row = next(rows, None)
+                self.seconds["read"] += time.perf_counter() - start
+                if row is None:
+                    return
+                self.rows_read += 1
+                yield row
+
+        return wrapper
+
+    @contextmanager
+    def track(self, parser):
+        """Record metrics for everything ``parser`` does inside the block."""
+        wrapped = {
+            "read_csv": self._timed_read(parser.read_csv),
+            "parse": self._timed("fields", parser.parse),
+            "normalize_date": self._timed("date", parser.normalize_date),
+            "categorize_transactions": self._timed(
+                "categorize", parser.categorize_transactions
+            ),
+        }
+        parse = wrapped["parse"]
+        parse_batch = self._timed("fields", parser.parse_batch)
+
+        def counted_parse(row):
+            self.rows += 1
+            return parse(row)
+
+        def counted_parse_batch(rows):
+            self.rows += len(rows)
+            return parse_batch(rows)
+
+        wrapped["parse"] = counted_parse
+        wrapped["parse_batch"] = counted_parse_batch
+        vars(parser).update(wrapped)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total = time.perf_counter() - start
+            for name in wrapped:
+                delattr(parser, name)
+            self._settle()
+
+    def _settle(self):
+        """Turn nested timings into exclusive per-stage times."""
+        seconds = self.seconds
+        seconds["fields"] = max(
+            seconds["fields"] - seconds["date"] - seconds["categorize"], 0.0
+        )
+        inner = seconds["read"] + seconds["fields"] + seconds["date"]
+        seconds["write"] = max(self.total - inner - seconds["categorize"], 0.0)
+        self.peak_rss_mb = peak_rss_mb()
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable view of the metrics."""
+        return {
+            "bank": self.bank,
+            "file": self.file,
+            "seconds": self.total,
+            "stages": dict(self.seconds),
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "rows_per_sec": self.rows_per_sec,
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+@contextmanager
+def profiled(profile_dir, file_path):
+    """Dump a cProfile of the block to ``<profile_dir>/<statement>.prof``."""
+    if profile_dir is None:
+        yield
+        return
+    import cProfile  # pylint: disable=import-outside-toplevel
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        Path(profile_dir).mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(Path(profile_dir) / (Path(file_path).stem + ".prof"))
+
+
+def _summary_rows(records: list):
+    """Yield one row per file followed by one total row per bank."""
+    banks = {}
+    for record in records:
+        yield record
+        total = banks.setdefault(
+            record["bank"],
+            {
+                "bank": record["bank"],
+                "file": "(total)",
+                "seconds": 0.0,
+                "stages": dict.fromkeys(STAGES, 0.0),
+                "rows": 0,
+                "skipped": 0,
+                "peak_rss_mb": None,
+            },
+        )
+        total["seconds"] += record["seconds"]
+        total["rows"] += record["rows"]
+        total["skipped"] += record["skipped"]
+        for stage in STAGES:
+            total["stages"][stage] += record["stages"][stage]
+        if record["peak_rss_mb"] is not None:
+            total["peak_rss_mb"] = max(total["peak_rss_mb"] or 0, record["peak_rss_mb"])
+    for total in banks.values():
+        total["rows_per_sec"] = (
+            total["rows"] / total["seconds"] if total["seconds"] else 0
+        )
+        yield total
+
+
+def format_table(records: list) -> str:
+    """Render metrics records as a fixed-width summary table."""
+    header = f"{'bank':<9} {'file':<28} {'rows':>8} {'skipped':>7} {'rows/s':>9}"
+    header += "".join(f" {stage:>10}" for stage in STAGES) + f" {'peak RSS':>9}"
+    lines = [header]
+    for record in _summary_rows(records):
+        peak = record["peak_rss_mb"]
+        line = (
+            f"{record['bank']:<9} {record['file'][:28]:<28} {record['rows']:>8,} "
+            f"{record['skipped']:>7,} {record['rows_per_sec']:>9,.0f}"
+        )
+        line += "".join(f" {record['stages'][stage]:>9.3f}s" for stage in STAGES)
+        line += f" {peak:>7.1f}MB" if peak is not None else f" {'-':>9}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def write_metrics(records: list, path):
+    """Write metrics records to a JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"files": records}, f, indent=2)
@@ -0,0 +1,207 @@
+"""Overlap reading, parsing and writing of statement files on threads."""
+
+import queue
+import threading
+from concurrent.futures import Future
+from functools import partial
+from itertools import islice
+from parser.manifest import PARSE
+from parser.writer import WRITERS
+
+# Bytes of lines the reader hands to the parser at a time.
+READ_BYTES = 1 << 20
+
+# Transactions the parser hands to the writer at a time.
+WRITE_ROWS = 1024
+
+# Blocks buffered between two stages for one file before the producer waits.
+DEPTH = 8
+
+_END = object()
+
+
+class _Prefetched:
+    """The lines of one statement, as the reader thread reads them ahead.
+
+    Stands in for the ``MappedStatement`` in ``BaseParser.read_csv``. The
+    reader puts blocks of lines on ``blocks`` and finishes with ``_END``, or
+    with the exception that stopped it. ``delimiter`` is the one sniffed
+    from the statement's header, if any.
+    """
+
+    def __init__(self, blocks: queue.Queue, delimiter: str = None):
+        """Wrap the queue of line blocks of one statement."""
+        self.blocks = blocks
+        self.delimiter = delimiter
+        self.done = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Nothing to close; ``drain`` releases the reader."""
+
+    def _next_block(self):
+        """Return the next block of lines, or None after the last one."""
+        block = self.blocks.get()
+        if block is _END or isinstance(block, BaseException):
+            self.done = True
+        if isinstance(block, BaseException):
+            raise block
+        return None if block is _END else block
+
+    def __iter__(self):
+        while not self.done:
+            block = self._next_block()
+            if block is not None:
+                yield from block
+
+    def drain(self):
+        """Discard what is left, so the reader can move on to the next file."""
+        while not self.done:
+            try:
+                self._next_block()
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+
+
+class Pipeline:  # pylint: disable=too-few-public-methods
+    """Parses statement files with reading, parsing and writing overlapped.
+
+    Three threads form the pipeline. The reader reads statements ahead of
+    the parser, the parser runs ``task`` (the runner's ``run_task``, with
+    categorizing, metrics and the optional store), and the writer encodes
+    and writes the outputs. While one file is being parsed, the next one is
+    read and the previous one's output is written. Stages exchange blocks
+    over queues of at most ``depth`` entries per file, and at most one file
+    ahead, so a stage that falls behind makes the others wait instead of
+    buffering whole files.
+
+    Files are handled one at a time and in order in every stage, so each
+    output is exactly what a serial run writes. ``futures`` maps every file
+    to a future of ``run_task``'s result, resolved once its output is in
+    place; ``shutdown`` waits for the threads like an executor's would.
+    """
+
+    def __init__(self, tasks: list, task, depth: int = DEPTH):
+        """Start the threads for ``tasks``, a list of ``(parser, file, action)``.
+
+        ``task(parser, file_path, action, write=...)`` parses one file
+        and hands its transactions to ``write`` instead of writing them.
+        """
+        self.tasks = tasks
+        self.task = task
+        self.depth = depth
+        self.futures = {file_path: Future() for _, file_path, _ in tasks}
+        self._reads = queue.Queue(maxsize=1)
+        self._writes = queue.Queue(maxsize=1)
+        self._threads = [
+            threading.Thread(target=stage, name=f"munim-{stage.__name__}", daemon=True)
+            for stage in (self._read, self._parse, self._write)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def shutdown(self):
+        """Wait for every file to be written."""
+        for thread in self._threads:
+            thread.join()
+
+    def _read(self):
+        """Read each statement to be parsed in blocks of lines."""
+        for parser, file_path, action in self.tasks:
+            if action != PARSE:
+                self._reads.put(None)
+                continue
+            blocks = queue.Queue(maxsize=self.depth)
+            try:
+                # The class's method: the parser thread overrides the instance's.
+                statement = type(parser).open_statement(parser, file_path)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                blocks.put(e)
+                self._reads.put(_Prefetched(blocks))
+                continue
+            self._reads.put(_Prefetched(blocks, statement.delimiter))
+            try:
+                with statement:
+                    for lines in statement.blocks(READ_BYTES):
+                        blocks.put(lines)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                blocks.put(e)
+                continue
+            blocks.put(_END)
+
+    def _parse(self):
+        """Parse each statement from the lines read ahead."""
+        for parser, file_path, action in self.tasks:
+            prefetched = self._reads.get()
+            output = queue.Queue(maxsize=self.depth)
+            self._writes.put(output)
+            if prefetched:
+                parser.open_statement = lambda _, lines=prefetched: lines
+            try:
+                result = self.task(
+                    parser,
+                    file_path,
+                    action,
+                    write=partial(self._emit, output, parser),
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                output.put(("error", e))
+            else:
+                output.put(("done", result))
+            finally:
+                if prefetched:
+                    del parser.open_statement
+                    prefetched.drain()
+
+    @staticmethod
+    def _emit(output: queue.Queue, parser, file_path, transactions, fmt: str) -> int:
+        """Hand the transactions of ``file_path`` to the writer; return their count."""
+        output.put(("open", (parser.json_path(file_path, fmt), fmt)))
+        count = 0
+        while block := list(islice(transactions, WRITE_ROWS)):
+            output.put(("rows", block))
+            count += len(block)
+        return count
+
+    def _write(self):
+        """Write each output and resolve its file's future."""
+        for _, file_path, _ in self.tasks:
+            future = self.futures[file_path]
+            try:
+                result = self._write_output(self._writes.get())
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _write_output(output: queue.Queue):
+        """Write one file's blocks and return the parser's result.
+
+        A failure in either thread discards the partial output. After a
+        write error the parser's remaining blocks are still consumed, so it
+        is never left waiting on a full queue.
+        """
+        writer, error = None, None
+        kind, value = output.get()
+        while kind not in ("done", "error"):
+            if error is None:
+                try:
+                    if kind == "open":
+                        writer = WRITERS[value[1]](value[0])
+                    else:
+                        writer.write_many(value)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    error = e
+            kind, value = output.get()
+        if kind == "error":
+            error = value
+        if error is not None:
+            if writer is not None:
+                writer.abort()
+            raise error
+        if writer is not None:
+            writer.close()
+        return value
@@ -0,0 +1,193 @@
+"""Pairing of card payments and transfers across accounts.
+
+A credit card bill paid from a savings account shows up twice: as a debit
+of the savings account and as a credit on the card. So does a transfer
+between two accounts. ``pair_transfers`` matches such debits and credits by
+amount within a date window, and ``reconcile_outputs`` tags both sides as
+``transfer`` in the outputs, so reports do not count the money twice.
+
+A card's debits are purchases and never pair: only debits of bank
+accounts are matched, with credits of a card or of another bank account.
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from parser.banks import LAYOUTS
+from parser.record import TRANSFER, ordinal_of
+from parser.rollup import cents
+from parser.writer import latest_outputs, read_transactions, writer_for
+
+logger = logging.getLogger("munim")
+
+# Days a payment may take to show up on the other account.
+WINDOW_DAYS = 3
+
+RECONCILE_NAME = ".transfers"
+
+# Accounts of credit cards, whose debits are purchases rather than transfers.
+CARD_ACCOUNTS = frozenset(
+    spec["account"] for spec in LAYOUTS.values() if spec.get("card")
+)
+
+
+def _by_date(transactions: list, indexes: list) -> list:
+    """Return ``[(date ordinal, index)]`` of some transactions, sorted by date."""
+    return sorted((ordinal_of(transactions[i]["date"]), i) for i in indexes)
+
+
+def _pair_run(transactions: list, debits: list, deposits: list, window: int) -> list:
+    """Pair debits and credits of one amount, both sorted by date.
+
+    Each debit takes the unpaired credit on another account nearest to it,
+    at most ``window`` days away; of equally near credits, the earliest.
+    """
+    pairs = []
+    paired = set()
+    first = 0
+    for day, debit in debits:
+        while first < len(deposits) and deposits[first][0] < day - window:
+            first += 1
+        best, nearest = None, window + 1
+        for k in range(first, len(deposits)):
+            credit_day, credit = deposits[k]
+            if credit_day > day + window:
+                break
+            if (
+                k not in paired
+                and abs(credit_day - day) < nearest
+                and transactions[credit]["account"] != transactions[debit]["account"]
+            ):
+                best, nearest = k, abs(credit_day - day)
+        if best is not None:
+            paired.add(best)
+            pairs.append((debit, deposits[best][1]))
+    return pairs
+
+
+def pair_transfers(
+    transactions: list, window: int = WINDOW_DAYS, cards=CARD_ACCOUNTS
+) -> list:
+    """Return ``[(debit, credit)]`` index pairs of transfers between accounts.
+
+    Debits of the ``cards`` accounts are purchases and are left out. The
+    other debits and all credits are bucketed by amount in paise. Only
+    amounts found on both sides are sorted by date and paired, so the cost
+    is one pass over the transactions rather than comparing every debit
+    with every credit, and most dates are never even parsed.
+    """
+    debits = defaultdict(list)
+    deposits = defaultdict(list)
+    for i, transaction in enumerate(transactions):
+        if transaction["dr_amount"] > 0:
+            if transaction["account"] not in cards:
+                debits[cents(transaction["dr_amount"])].append(i)
+        elif transaction["cr_amount"] > 0:
+            deposits[cents(transaction["cr_amount"])].append(i)
+
+    pairs = []
+    for amount, debit_run in debits.items():
+        credit_run = deposits.get(amount)
+        if credit_run:
+            pairs += _pair_run(
+                transactions,
+                _by_date(transactions, debit_run),
+                _by_date(transactions, credit_run),
+                window,
+            )
+    return pairs
+
+
+def _untagged(transaction: dict) -> str:
+    """Return a transaction's type as parsed, before any transfer tag."""
+    if transaction["type"] != TRANSFER:
+        return transaction["type"]
+    return "expense" if transaction["dr_amount"] > 0 else "deposit"
+
+
+def _signature(outputs: dict, window: int) -> dict:
+    """Return what a reconciliation of ``outputs`` depends on, as JSON data."""
+    return {
+        "window": window,
+        "outputs": {
+            stem: [path.name, size, mtime_ns]
+            for stem, (path, size, mtime_ns) in outputs.items()
+        },
+    }
+
+
+def _load_state(path) -> dict:
+    """Return the state saved by the last reconciliation, or an empty dict."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(path, signature: dict, pairs: int):
+    """Atomically save the signature and pair count of a reconciliation."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"signature": signature, "pairs": pairs}, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _read_outputs(outputs: dict) -> tuple:
+    """Return ``(transactions, spans)`` of every readable output.
+
+    ``spans`` holds ``(path, start, end)`` of each output's transactions.
+    """
+    transactions: list = []
+    spans = []
+    for _, (path, _, _) in sorted(outputs.items()):
+        try:
+            rows = list(read_transactions(path))
+        except (OSError, ValueError) as e:
+            logger.warning("Not reconciling %s: %s", path.name, e)
+            continue
+        spans.append((path, len(transactions), len(transactions) + len(rows)))
+        transactions += rows
+    return transactions, spans
+
+
+def _rewrite(transactions: list, spans: list, types: list):
+    """Rewrite the outputs in which any transaction's type changed."""
+    for path, start, end in spans:
+        if all(types[i] == transactions[i]["type"] for i in range(start, end)):
+            continue
+        with writer_for(path)(path) as writer:
+            for i in range(start, end):
+                transactions[i]["type"] = types[i]
+                writer.write(transactions[i])
+        logger.debug("Updated transfer tags in %s", path.name)
+
+
+def reconcile_outputs(directory="./data/json", window: int = WINDOW_DAYS) -> int:
+    """Tag paired transfers in every output and return the number of pairs.
+
+    Pairs are found afresh over all outputs, so tags of transactions that
+    are no longer paired are removed. Only outputs whose tags changed are
+    rewritten. The outputs' sizes and mtimes are saved next to them, and
+    nothing is read again until one of them changes.
+    """
+    state_path = os.path.join(directory, RECONCILE_NAME)
+    outputs = latest_outputs(directory)
+    state = _load_state(state_path)
+    if state.get("signature") == _signature(outputs, window):
+        return state["pairs"]
+
+    transactions, spans = _read_outputs(outputs)
+    types = [_untagged(transaction) for transaction in transactions]
+    pairs = pair_transfers(transactions, window)
+    for debit, credit in pairs:
+        types[debit] = types[credit] = TRANSFER
+
+    _rewrite(transactions, spans, types)
+
+    if os.path.isdir(directory):
+        _save_state(
+            state_path, _signature(latest_outputs(directory), window), len(pairs)
+        )
+    return len(pairs)
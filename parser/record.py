@@ -0,0 +1,154 @@
+"""Compact transaction records."""
+
+import sys
+from datetime import date
+from functools import lru_cache
+from parser.fingerprint import fingerprint
+
+FIELDS = (
+    "date",
+    "description",
+    "dr_amount",
+    "cr_amount",
+    "account",
+    "category",
+    "type",
+)
+
+# Type of a debit or credit paired with its counterpart in another account.
+TRANSFER = "transfer"
+
+
+@lru_cache(maxsize=8192)
+def ordinal_of(iso_date: str) -> int:
+    """Return the proleptic Gregorian ordinal of a YYYY-MM-DD date."""
+    return date.fromisoformat(iso_date).toordinal()
+
+
+@lru_cache(maxsize=8192)
+def iso_of(ordinal: int) -> str:
+    """Return the YYYY-MM-DD string of a date ordinal."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+class Transaction:
+    """A normalized transaction stored in ``__slots__`` instead of a dict.
+
+    Dates are kept as ordinal ints and the account, category and type
+    strings are interned, so millions of records share them. Records still
+    behave like the old dicts for reading and updating fields
+    (``tx["category"]``) and ``to_dict`` gives exactly the JSON schema.
+    ``occurrence`` numbers identical transactions within a statement and,
+    with the other fields, makes up the ``fingerprint``.
+    """
+
+    __slots__ = (
+        "date_ordinal",
+        "description",
+        "dr_amount",
+        "cr_amount",
+        "account",
+        "category",
+        "type",
+        "occurrence",
+    )
+
+    def __init__(
+        self,
+        date_ordinal: int,
+        description: str,
+        dr_amount: float,
+        cr_amount: float,
+        account: str,
+        category: str,
+        type: str,  # pylint: disable=redefined-builtin
+        occurrence: int = 0,
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """Initialize a record from already normalized values."""
+        self.date_ordinal = date_ordinal
+        self.description = description
+        self.dr_amount = dr_amount
+        self.cr_amount = cr_amount
+        self.account = sys.intern(account)
+        self.category = sys.intern(category)
+        self.type = sys.intern(type)
+        self.occurrence = occurrence
+
+    @classmethod
+    def from_dict(cls, transaction: dict):
+        """Build a record from a transaction dict in the JSON schema."""
+        return cls(
+            ordinal_of(transaction["date"]),
+            transaction["description"],
+            transaction["dr_amount"],
+            transaction["cr_amount"],
+            transaction["account"],
+            transaction["category"],
+            transaction["type"],
+        )
+
+    @property
+    def date(self) -> str:
+        """The transaction date as YYYY-MM-DD."""
+        return iso_of(self.date_ordinal)
+
+    @date.setter
+    def date(self, value: str):
+        self.date_ordinal = ordinal_of(value)
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable identity of this transaction across overlapping statements."""
+        return fingerprint(
+            self.account,
+            self.date_ordinal,
+            self.dr_amount,
+            self.cr_amount,
+            self.description,
+            self.occurrence,
+        )
+
+    def __getitem__(self, key: str):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        if key in ("account", "category", "type"):
+            value = sys.intern(value)
+        setattr(self, key, value)
+
+    def __eq__(self, other):
+        if isinstance(other, Transaction):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Transaction({self.to_dict()!r})"
+
+    def keys(self):
+        """Return the JSON field names, in schema order."""
+        return FIELDS
+
+    def to_dict(self) -> dict:
+        """Return the transaction in the JSON output schema."""
+        return {
+            "date": iso_of(self.date_ordinal),
+            "description": self.description,
+            "dr_amount": self.dr_amount,
+            "cr_amount": self.cr_amount,
+            "account": self.account,
+            "category": self.category,
+            "type": self.type,
+        }
+
+
+def as_dict(transaction) -> dict:
+    """Return ``transaction`` as a dict, converting records if needed."""
+    if isinstance(transaction, Transaction):
+        return transaction.to_dict()
+    return transaction
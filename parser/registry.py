@@ -0,0 +1,46 @@
+"""Lazy registry of bank statement parsers."""
+
+from collections.abc import Mapping
+from importlib import import_module
+from parser.banks import LAYOUTS, parser_name
+
+
+class ParserRegistry(Mapping):
+    """Maps bank names to parser classes, importing each module on first use.
+
+    Parsers are registered as ``"module:Class"`` strings, so listing the
+    supported banks (for ``--help`` or argument validation) imports nothing.
+    """
+
+    def __init__(self, paths: dict):
+        """Initialize the registry from ``{bank: "module:Class"}``."""
+        self._paths = dict(paths)
+        self._classes: dict = {}
+
+    def register(self, bank: str, path: str):
+        """Register the parser class at ``path`` (``"module:Class"``) for ``bank``."""
+        self._paths[bank] = path
+        self._classes.pop(bank, None)
+
+    def __getitem__(self, bank: str):
+        parser_class = self._classes.get(bank)
+        if parser_class is None:
+            module, _, name = self._paths[bank].partition(":")
+            parser_class = getattr(import_module(module), name)
+            self._classes[bank] = parser_class
+        return parser_class
+
+    def __contains__(self, bank):
+        return bank in self._paths
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+
+# Parser classes are compiled from the layouts in parser.banks on first use.
+PARSERS = ParserRegistry(
+    {bank: f"parser.layout:{parser_name(bank)}" for bank in LAYOUTS}
+)
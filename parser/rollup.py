@@ -0,0 +1,225 @@
+"""Incremental rollups of parsed transactions for reporting."""
+
+import heapq
+import json
+import logging
+import os
+from parser.merchant import merchant_normalizer
+from parser.record import TRANSFER
+from parser.writer import latest_outputs, read_transactions
+from pathlib import Path
+
+logger = logging.getLogger("munim")
+
+ROLLUP_NAME = ".rollups"
+ROLLUP_FORMAT = 5
+
+# Dimensions a cell is keyed on, in key order.
+DIMENSIONS = ("month", "category", "account")
+
+_SEP = "\t"
+
+
+def cents(amount: float) -> int:
+    """Return an amount in rupees as whole paise, so sums stay exact."""
+    return round(amount * 100)
+
+
+def rollup_transactions(transactions) -> dict:
+    """Sum transactions into cells, per-merchant debits and merchant categories.
+
+    Returns ``{"cells": {...}, "merchants": {...}, "categories": {...}}``.
+    Cells are keyed by month, category and account and hold ``[debit,
+    credit, count]``; merchants are keyed by month and normalized
+    description (see ``parser.merchant``) and hold ``[debit, count]``;
+    categories are keyed by normalized description and category and hold
+    ``[debit, count]``. Amounts are in paise. Transfers between accounts
+    (see ``parser.reconcile``) are left out.
+    """
+    normalize = merchant_normalizer().normalize
+    cells: dict = {}
+    merchants: dict = {}
+    categories: dict = {}
+    for transaction in transactions:
+        if transaction["type"] == TRANSFER:
+            continue
+        month = transaction["date"][:7]
+        dr_amount = cents(transaction["dr_amount"])
+        cr_amount = cents(transaction["cr_amount"])
+        key = _SEP.join((month, transaction["category"], transaction["account"]))
+        cell = cells.get(key)
+        if cell is None:
+            cells[key] = [dr_amount, cr_amount, 1]
+        else:
+            cell[0] += dr_amount
+            cell[1] += cr_amount
+            cell[2] += 1
+        description = normalize(transaction["description"])
+        key = description + _SEP + transaction["category"]
+        category = categories.get(key)
+        if category is None:
+            categories[key] = [dr_amount, 1]
+        else:
+            category[0] += dr_amount
+            category[1] += 1
+        if dr_amount:
+            key = month + _SEP + description
+            merchant = merchants.get(key)
+            if merchant is None:
+                merchants[key] = [dr_amount, 1]
+            else:
+                merchant[0] += dr_amount
+                merchant[1] += 1
+    return {"cells": cells, "merchants": merchants, "categories": categories}
+
+
+def _merge(totals: dict, part: dict, sign: int):
+    """Add (``sign`` 1) or subtract (``sign`` -1) ``part`` into ``totals``."""
+    for key, values in part.items():
+        total = totals.setdefault(key, [0] * len(values))
+        for i, value in enumerate(values):
+            total[i] += sign * value
+        if not total[-1]:
+            del totals[key]
+
+
+def _in_range(month: str, start: str = None, end: str = None) -> bool:
+    """Return whether ``month`` (YYYY-MM) is within ``[start, end]``."""
+    return (start is None or month >= start) and (end is None or month <= end)
+
+
+class Rollups:
+    """Precomputed totals of every output by month × category × account.
+
+    Each output in the output directory is rolled up once, keyed by its
+    statement, along with its size and mtime. ``refresh`` only reads the
+    outputs that were added or rewritten since, and subtracts the totals of
+    removed ones, so reports never rescan the history. The combined cells
+    are kept in memory; queries walk cells, not transactions, so their cost
+    depends on the months, categories and accounts covered instead of the
+    number of transactions.
+    """
+
+    def __init__(self, directory: str = "./data/json"):
+        """Load the rollups from the output directory, if present."""
+        self.directory = Path(directory)
+        self.path = self.directory / ROLLUP_NAME
+        self.sources: dict = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("format") == ROLLUP_FORMAT:
+                    self.sources = data["sources"]
+            except ValueError:
+                logger.warning("Ignoring corrupt rollups %s", self.path)
+        self.cells: dict = {}
+        self.merchants: dict = {}
+        self.categories: dict = {}
+        for entry in self.sources.values():
+            self._apply(entry, 1)
+
+    def _apply(self, entry: dict, sign: int):
+        """Add or subtract one source's totals."""
+        _merge(self.cells, entry["cells"], sign)
+        _merge(self.merchants, entry["merchants"], sign)
+        _merge(self.categories, entry["categories"], sign)
+
+    def refresh(self) -> int:
+        """Roll up new and rewritten outputs and drop removed ones.
+
+        Returns the number of sources that changed; the rollups are saved
+        when there are any.
+        """
+        outputs = latest_outputs(self.directory)
+        changed = 0
+        for stem in set(self.sources) - set(outputs):
+            self._apply(self.sources.pop(stem), -1)
+            changed += 1
+        for stem, (path, size, mtime_ns) in sorted(outputs.items()):
+            entry = self.sources.get(stem)
+            if entry and (entry["file"], entry["size"], entry["mtime_ns"]) == (
+                path.name,
+                size,
+                mtime_ns,
+            ):
+                continue
+            try:
+                totals = rollup_transactions(read_transactions(path))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Not rolling up %s: %s", path.name, e)
+                continue
+            if entry:
+                self._apply(entry, -1)
+            entry = dict(totals, file=path.name, size=size, mtime_ns=mtime_ns)
+            self.sources[stem] = entry
+            self._apply(entry, 1)
+            changed += 1
+        if changed:
+            self.save()
+        return changed
+
+    def totals(self, by=("month", "category"), start=None, end=None) -> dict:
+        """Return ``{key: [debit, credit, count]}`` grouped by the ``by`` dimensions.
+
+        Keys are tuples of the dimension values; ``start`` and ``end``
+        limit the months (YYYY-MM, inclusive).
+        """
+        indexes = [DIMENSIONS.index(dimension) for dimension in by]
+        grouped: dict = {}
+        for key, values in self.cells.items():
+            fields = key.split(_SEP)
+            if not _in_range(fields[0], start, end):
+                continue
+            group = tuple(fields[i] for i in indexes)
+            total = grouped.setdefault(group, [0, 0, 0])
+            for i, value in enumerate(values):
+                total[i] += value
+        return dict(sorted(grouped.items()))
+
+    def top_merchants(self, count: int = 10, start=None, end=None) -> list:
+        """Return ``[(merchant, debit, transactions)]`` of the biggest merchants."""
+        merchants: dict = {}
+        for key, (dr_amount, transactions) in self.merchants.items():
+            month, description = key.split(_SEP, 1)
+            if _in_range(month, start, end):
+                total = merchants.setdefault(description, [0, 0])
+                total[0] += dr_amount
+                total[1] += transactions
+        return heapq.nlargest(
+            count,
+            ((description, *total) for description, total in merchants.items()),
+            key=lambda merchant: merchant[1],
+        )
+
+    def merchant_categories(self) -> dict:
+        """Return ``{merchant: {category: [debit, count]}}`` over all outputs."""
+        merchants: dict = {}
+        for key, values in self.categories.items():
+            merchant, category = key.rsplit(_SEP, 1)
+            merchants.setdefault(merchant, {})[category] = values
+        return merchants
+
+    def trend(self, category: str = None, start=None, end=None) -> list:
+        """Return ``[(month, debit, credit)]`` for one category, or all of them."""
+        monthly = self.totals(("month", "category"), start, end)
+        months: dict = {}
+        for (month, name), (dr_amount, cr_amount, _) in monthly.items():
+            if category is None or name == category:
+                total = months.setdefault(month, [0, 0])
+                total[0] += dr_amount
+                total[1] += cr_amount
+        return [(month, *total) for month, total in months.items()]
+
+    def save(self):
+        """Atomically write the rollups next to the outputs."""
+        if not self.directory.exists():
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"format": ROLLUP_FORMAT, "sources": self.sources},
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.path)
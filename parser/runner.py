@@ -0,0 +1,427 @@
+"""Run parse tasks for statement files, serially or on a process pool."""
+
+import csv
+import logging
+import os
+import sqlite3
+from concurrent.futures import BrokenExecutor
+from contextlib import nullcontext
+from functools import partial
+from parser.base import OUTPUT_DIR
+from parser.checkpoint import Checkpoint
+from parser.dedup import DedupIndex
+from parser.fingerprint import OccurrenceCounter
+from parser.manifest import PARSE, RECATEGORIZE, SKIP, Manifest
+from parser.mapper import expense_mapper
+from parser.metrics import FileMetrics, profiled
+from parser.store import open_store
+from parser.writer import WRITERS
+
+FILE_ERRORS = (
+    OSError,
+    csv.Error,
+    KeyError,
+    ValueError,
+    IndexError,
+    sqlite3.Error,
+    BrokenExecutor,
+)
+
+
+# Per-task options accepted by Runner, with their defaults.
+TASK_OPTIONS = {
+    "fmt": "json",
+    "store": None,
+    "metrics": False,
+    "profile_dir": None,
+    "chunk_size": None,
+    "engine": "row",
+}
+
+
+def parse_file(
+    parser,
+    file_path,
+    action=PARSE,
+    *,
+    fmt="json",
+    store=None,
+    chunk_size=None,
+    engine="row",
+    dedup=None,
+    write=None,
+    mapper_version=None,
+):  # pylint: disable=too-many-arguments
+    """Parse one statement file, write its JSON output and return the row count.
+
+    Rows stream from the CSV reader through ``parse`` into the writer, so
+    memory stays constant regardless of statement size. With ``action`` set
+    to ``recategorize`` the existing output is only re-categorized against
+    the current expense mapper. ``store`` is an optional store spec such as
+    ``sqlite:munim.db`` that receives the same transactions. A ``chunk_size``
+    parses in checkpointed chunks; see ``parse_chunked``. ``engine`` picks the
+    ``row`` or ``batch`` columnar parser, which produce identical output.
+    With a ``dedup`` index, transactions already seen in another statement
+    are dropped. ``write`` replaces ``parser.write_json`` as the final step
+    of a non-chunked run. ``mapper_version`` identifies the expense mapper
+    in a chunked run's checkpoint.
+    """
+    if dedup is not None and action == PARSE:
+        dedup.forget(str(file_path))
+    if chunk_size and action == PARSE:
+        return parse_chunked(
+            parser,
+            file_path,
+            chunk_size,
+            fmt=fmt,
+            store=store,
+            engine=engine,
+            dedup=dedup,
+            mapper_version=mapper_version,
+        )
+    if action == RECATEGORIZE:
+        transactions = parser.recategorized(file_path, fmt)
+    else:
+        transactions = parser.iter_transactions(file_path, engine)
+        if dedup is not None:
+            transactions = dedup.filter(transactions, str(file_path))
+    write = write or parser.write_json
+    if store is None:
+        return write(file_path, transactions, fmt)
+    with open_store(store) as db:
+        return write(file_path, db.tee(transactions, file_path.name), fmt)
+
+
+def _checkpoint_source(parser, file_path, mapper_version=None) -> dict:
+    """Identify a statement, parser and mapper version for a checkpoint."""
+    stat = os.stat(file_path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "parser": f"{type(parser).__name__}/{parser.version}",
+        "mapper": mapper_version,
+    }
+
+
+def parse_chunked(
+    parser,
+    file_path,
+    chunk_size,
+    *,
+    fmt="json",
+    store=None,
+    engine="row",
+    dedup=None,
+    mapper_version=None,
+):  # pylint: disable=too-many-arguments,too-many-locals
+    """Parse a statement ``chunk_size`` transactions at a time and return the count.
+
+    After each chunk is written (and upserted into ``store``) the output is
+    synced and a checkpoint records the progress. If the run is interrupted
+    the partial output and checkpoint are kept, and the next run of the same
+    unchanged statement resumes after the last committed chunk. Runs with a
+    store or a ``dedup`` index always start over, since repeats are only
+    numbered correctly from the start of the statement; upserts and the
+    index releasing the statement's fingerprints make that safe. A
+    changed statement, parser or ``mapper_version`` also starts over.
+    """
+    output_path = parser.json_path(file_path, fmt)
+    checkpoint = Checkpoint(
+        output_path, _checkpoint_source(parser, file_path, mapper_version)
+    )
+    state = checkpoint.load() if store is None and dedup is None else None
+    if state:
+        logging.getLogger("munim").info(
+            "Resuming %s after %d transactions", file_path.name, state["count"]
+        )
+        writer = WRITERS[fmt](output_path, state["offset"], state["count"])
+    else:
+        checkpoint.clear()
+        state = {"rows": 0}
+        writer = WRITERS[fmt](output_path)
+
+    occurrences = OccurrenceCounter()
+    try:
+        with open_store(store) if store else nullcontext() as db:
+            for rows, chunk in parser.iter_chunks(
+                file_path, chunk_size, state["rows"], engine
+            ):
+                if dedup is not None:
+                    chunk = list(dedup.filter(chunk, str(file_path)))
+                writer.write_many(chunk)
+                if db:
+                    db.upsert(chunk, file_path.name, occurrences)
+                checkpoint.save(rows, writer.count, writer.checkpoint())
+    except BaseException:
+        writer.suspend()
+        raise
+    writer.close()
+    checkpoint.clear()
+    return writer.count
+
+
+def run_task(
+    parser,
+    file_path,
+    action,
+    options: dict,
+    dedup=None,
+    write=None,
+    mapper_version=None,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Run ``parse_file`` for the runner, optionally with metrics and cProfile.
+
+    Returns ``(count, metrics)`` where ``metrics`` is a dict, or None when
+    metrics are off.
+    """
+    kwargs = {key: options[key] for key in ("fmt", "store", "chunk_size", "engine")}
+    kwargs["dedup"] = dedup
+    kwargs["write"] = write
+    kwargs["mapper_version"] = mapper_version
+    with profiled(options["profile_dir"], file_path):
+        if not options["metrics"]:
+            return parse_file(parser, file_path, action, **kwargs), None
+        metrics = FileMetrics(parser.bank, file_path.name)
+        with metrics.track(parser):
+            count = parse_file(parser, file_path, action, **kwargs)
+    return count, metrics.to_dict()
+
+
+def init_worker(parsers):
+    """Load the parsers' expense mappers once per worker process.
+
+    ``parsers`` arrive pickled, which loads each of their mappers into the
+    worker's registry, so tasks only look them up.
+    """
+    logger = logging.getLogger("munim")
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    del parsers
+
+
+class Runner:  # pylint: disable=too-few-public-methods
+    """Parses the statement files of one CLI invocation.
+
+    Files recorded as unchanged in the manifest are skipped, and files whose
+    only change is the expense mapper are re-categorized; ``force`` parses
+    everything. With ``jobs`` greater than one each file is sent to a worker
+    process. Results are collected in plan order so the log reads exactly
+    like a serial run, and a failing file is logged and counted without
+    stopping the others. With ``dedup`` a persistent ``DedupIndex`` drops
+    transactions already parsed from another statement; files are then
+    parsed serially, in plan order, so the index decides every duplicate.
+    With ``pipeline`` a serial run overlaps reading the next file, parsing
+    the current one and writing the previous output; see ``Pipeline``.
+    With ``reconcile`` card payments and transfers between accounts are
+    paired and tagged in the outputs once all files are done; see
+    ``parser.reconcile``.
+
+    Outputs, the manifest and the dedup index live in ``output_dir``, and
+    ``mapper`` (the default expense mapper if None) versions the outputs;
+    both must be those of the parsers in the plan. A household with its own
+    directories and mapper gets its own runner; see ``parser.tenant``.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        logger,
+        jobs: int = 1,
+        force: bool = False,
+        dedup: bool = False,
+        pipeline: bool = False,
+        reconcile: bool = False,
+        output_dir=OUTPUT_DIR,
+        mapper=None,
+        **options,
+    ):
+        """Initialize the runner.
+
+        ``options`` are handed to every task; see ``TASK_OPTIONS`` for the
+        supported keys and their defaults.
+        """
+        unknown = set(options) - set(TASK_OPTIONS)
+        if unknown:
+            raise TypeError(f"Unknown runner options: {', '.join(sorted(unknown))}")
+        if options.get("chunk_size") and options.get("fmt") == "archive":
+            raise ValueError("Chunked runs need a streaming format, not archive")
+        self.logger = logger
+        self.jobs = 1 if dedup else jobs
+        self.force = force
+        self.output_dir = output_dir
+        self.dedup = DedupIndex(output_dir) if dedup else None
+        self.pipeline = pipeline
+        self.reconcile = reconcile
+        self.options = dict(TASK_OPTIONS, **options)
+        self.manifest = Manifest(output_dir)
+        self.mapper = mapper or expense_mapper()
+        self.mapper_version = None
+        self.actions: dict = {}
+        self.futures: dict = {}
+        self.failures = 0
+        self.metrics: list = []
+
+    def run(self, plan, announce: bool = False) -> int:
+        """Process ``plan``, a list of ``(bank, parser)`` pairs.
+
+        An entry may also be ``(bank, parser, files)`` to process only those
+        statement files instead of all of ``parser.files``. Returns the
+        number of files that failed in this run.
+        """
+        plan = [
+            (bank, parser, files[0] if files else parser.files)
+            for bank, parser, *files in plan
+        ]
+        self.mapper_version = self.mapper.refresh().version
+        self.actions, self.futures = {}, {}
+        failures = self.failures
+        self._plan_actions(plan)
+        executor = self._start_pool(plan) or self._start_pipeline(plan)
+        try:
+            for bank, parser, files in plan:
+                if announce:
+                    self.logger.info("Processing bank: %s", bank)
+                    if not files:
+                        self.logger.warning("No files found for %s", bank)
+                        continue
+                for file_path in files:
+                    self._process(parser, file_path)
+        finally:
+            if executor:
+                executor.shutdown()
+            self.manifest.save()
+            self.mapper.save_merchants()
+            if self.dedup:
+                self.dedup.save()
+        if self.reconcile:
+            self._reconcile()
+        return self.failures - failures
+
+    def _reconcile(self):
+        """Pair and tag transfers across every output."""
+        # pylint: disable-next=import-outside-toplevel
+        from parser.reconcile import reconcile_outputs
+
+        try:
+            pairs = reconcile_outputs(self.output_dir)
+        except (OSError, KeyError, ValueError) as e:
+            self.logger.error("❌ Error reconciling transfers: %s", e, exc_info=True)
+            return
+        self.logger.info("🔗 Paired %d transfer(s) across accounts", pairs)
+
+    def _plan_actions(self, plan):
+        """Consult the manifest for the action and source info of every file."""
+        for _, parser, files in plan:
+            parser_version = f"{type(parser).__name__}/{parser.version}"
+            for file_path in files:
+                action, source = self.manifest.plan(
+                    file_path,
+                    parser.json_path(file_path, self.options["fmt"]),
+                    parser_version,
+                    self.mapper_version,
+                )
+                if self.force:
+                    action = PARSE
+                self.actions[file_path] = (action, source, parser_version)
+
+    def _tasks(self, plan) -> list:
+        """Return ``(parser, file_path, action)`` for every non-skipped file."""
+        return [
+            (parser, file_path, self.actions[file_path][0])
+            for _, parser, files in plan
+            for file_path in files
+            if self.actions[file_path][0] != SKIP
+        ]
+
+    def _start_pool(self, plan):
+        """Submit every non-skipped file to a process pool when jobs > 1."""
+        tasks = self._tasks(plan)
+        if self.jobs < 2 or len(tasks) < 2:
+            return None
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.jobs, len(tasks)),
+            initializer=init_worker,
+            initargs=([parser for _, parser, files in plan if files],),
+        )
+        for parser, file_path, action in tasks:
+            self.futures[file_path] = executor.submit(
+                run_task,
+                parser,
+                file_path,
+                action,
+                self.options,
+                mapper_version=self.mapper_version,
+            )
+        return executor
+
+    def _start_pipeline(self, plan):
+        """Start a pipeline over the non-skipped files, if enabled.
+
+        Chunked and deduplicating runs parse strictly one file after the
+        other and are not pipelined.
+        """
+        if not self.pipeline or self.dedup or self.options["chunk_size"]:
+            return None
+        tasks = self._tasks(plan)
+        if not tasks:
+            return None
+        from parser.pipeline import Pipeline  # pylint: disable=import-outside-toplevel
+
+        executor = Pipeline(
+            tasks,
+            partial(run_task, options=self.options, mapper_version=self.mapper_version),
+        )
+        self.futures.update(executor.futures)
+        return executor
+
+    def _process(self, parser, file_path):
+        """Collect (or compute) the result for one file and log it."""
+        action, source, parser_version = self.actions[file_path]
+        if action == SKIP:
+            self.logger.info("⏭️ Skipped %s - unchanged", file_path.name)
+            return
+
+        self.logger.info("Processing file: %s", file_path)
+        try:
+            if file_path in self.futures:
+                count, metrics = self.futures[file_path].result()
+            else:
+                count, metrics = run_task(
+                    parser,
+                    file_path,
+                    action,
+                    self.options,
+                    self.dedup,
+                    mapper_version=self.mapper_version,
+                )
+        except FILE_ERRORS as e:
+            self.logger.error(
+                "❌ Error parsing %s: %s", file_path, str(e), exc_info=True
+            )
+            self.failures += 1
+            if self.dedup:
+                self.dedup.forget(str(file_path))
+            return
+
+        if metrics:
+            self.metrics.append(metrics)
+        if action == RECATEGORIZE:
+            self.logger.info(
+                "✅ Re-categorized %s - %d transactions", file_path.name, count
+            )
+        else:
+            self.logger.info("✅ Parsed %s - %d transactions", file_path.name, count)
+        if self.dedup and self.dedup.dropped.get(str(file_path)):
+            self.logger.info(
+                "🔁 Dropped %d duplicate transactions from %s",
+                self.dedup.dropped[str(file_path)],
+                file_path.name,
+            )
+        self.manifest.record(
+            parser.json_path(file_path, self.options["fmt"]),
+            source,
+            parser_version,
+            self.mapper_version,
+        )
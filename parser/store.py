@@ -0,0 +1,153 @@
+"""Indexed transaction stores used alongside the JSON output."""
+
+import hashlib
+import sqlite3
+from parser.fingerprint import OccurrenceCounter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    tx_key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT NOT NULL,
+    dr_amount REAL NOT NULL,
+    cr_amount REAL NOT NULL,
+    account TEXT NOT NULL,
+    category TEXT NOT NULL,
+    type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions (account, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category, date);
+"""
+
+UPSERT = """
+INSERT INTO transactions (
+    tx_key, source, date, description, dr_amount, cr_amount, account, category, type
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (tx_key) DO UPDATE SET
+    source = excluded.source,
+    category = excluded.category,
+    type = excluded.type
+"""
+
+
+def transaction_key(transaction, occurrence: int = 0) -> str:
+    """Return a stable key for a transaction.
+
+    The key covers account, date, amounts and description, plus the
+    ``occurrence`` of identical transactions within one statement so that
+    legitimate repeats (two identical coffees on one day) are kept apart.
+    """
+    text = "|".join(
+        (
+            transaction["account"],
+            transaction["date"],
+            repr(transaction["dr_amount"]),
+            repr(transaction["cr_amount"]),
+            transaction["description"],
+            str(occurrence),
+        )
+    )
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SqliteStore:
+    """SQLite transaction store with indexes on date, account and category.
+
+    Transactions are upserted by ``transaction_key``, so re-parsing a
+    statement updates its rows instead of duplicating them.
+    """
+
+    def __init__(self, path: str, batch_size: int = 5000):
+        """Open (and if needed create) the database at ``path``."""
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def tee(self, transactions, source: str, occurrences: OccurrenceCounter = None):
+        """Yield ``transactions`` unchanged while upserting them in batches.
+
+        Repeats are numbered like fingerprints (see ``OccurrenceCounter``).
+        Pass the same ``occurrences`` counter to successive calls that feed
+        one statement in pieces, so repeats are numbered across all of them.
+        """
+        if occurrences is None:
+            occurrences = OccurrenceCounter()
+        batch = []
+        for transaction in transactions:
+            occurrence = occurrences.next(
+                transaction["date"],
+                (
+                    transaction["account"],
+                    transaction["description"],
+                    transaction["dr_amount"],
+                    transaction["cr_amount"],
+                ),
+            )
+            batch.append(
+                (
+                    transaction_key(transaction, occurrence),
+                    source,
+                    transaction["date"],
+                    transaction["description"],
+                    transaction["dr_amount"],
+                    transaction["cr_amount"],
+                    transaction["account"],
+                    transaction["category"],
+                    transaction["type"],
+                )
+            )
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+            yield transaction
+        self._flush(batch)
+
+    def upsert(
+        self, transactions, source: str, occurrences: OccurrenceCounter = None
+    ) -> int:
+        """Upsert transactions and return how many were written."""
+        return sum(1 for _ in self.tee(transactions, source, occurrences))
+
+    def _flush(self, batch: list):
+        """Write one batch in a single database transaction."""
+        if batch:
+            with self.connection:
+                self.connection.executemany(UPSERT, batch)
+
+    def monthly_totals(self, start: str = None, end: str = None, account: str = None):
+        """Return ``(month, category, dr_total, cr_total, count)`` rows.
+
+        ``start`` and ``end`` are inclusive YYYY-MM-DD bounds.
+        """
+        query = (
+            "SELECT substr(date, 1, 7) AS month, category, SUM(dr_amount),"
+            " SUM(cr_amount), COUNT(*) FROM transactions WHERE date BETWEEN ? AND ?"
+        )
+        params = [start or "0000-00-00", end or "9999-99-99"]
+        if account:
+            query += " AND account = ?"
+            params.append(account)
+        query += " GROUP BY month, category ORDER BY month, category"
+        return self.connection.execute(query, params).fetchall()
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+def open_store(spec: str):
+    """Open a store from a ``scheme:location`` spec such as ``sqlite:munim.db``."""
+    scheme, _, location = spec.partition(":")
+    if scheme != "sqlite" or not location:
+        raise ValueError(f"Unsupported store: {spec} (expected sqlite:path.db)")
+    return SqliteStore(location)
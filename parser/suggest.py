@@ -0,0 +1,223 @@
+"""Suggest categories and keywords for uncategorized merchants.
+
+Curators grow ``expense_mapper.yaml`` from the descriptions it does not
+match yet. The categorized history in the rollups (see ``parser.rollup``)
+is grouped by normalized merchant, so a merchant seen ten thousand times
+is one entry, and every merchant's tokens are split into character
+trigrams in an inverted index weighted by inverse document frequency.
+
+An uncategorized merchant is looked up by its own trigrams: only the
+postings of the trigrams it contains are walked, and trigrams shared by
+more than ``COMMON_POSTINGS`` merchants (``upi``, ``pos``, ...) tell
+merchants apart too poorly to be worth walking, so the work per lookup
+does not grow with the history. The nearest merchants are ranked by
+cosine similarity, and each category among them is suggested with its
+closest merchant and the query token that links the two, ready to be
+added as a keyword.
+"""
+
+import heapq
+import math
+import re
+from functools import lru_cache
+from parser.matcher import UNCATEGORIZED
+from typing import NamedTuple
+
+GRAM = 3
+
+# Trigrams in more merchants than this are not walked or scored.
+COMMON_POSTINGS = 1000
+
+# Nearest merchants considered per lookup, and categories suggested.
+NEIGHBOURS = 20
+CANDIDATES = 3
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokens(merchant: str) -> list:
+    """Return the words of a merchant that can serve as keywords."""
+    return [
+        token
+        for token in _TOKEN.findall(merchant.lower())
+        if len(token) >= GRAM and not token.isdigit()
+    ]
+
+
+@lru_cache(maxsize=1 << 16)
+def grams(token: str) -> frozenset:
+    """Return the character trigrams of a token, marking its ends."""
+    padded = f" {token} "
+    return frozenset("".join(gram) for gram in zip(*(padded[i:] for i in range(GRAM))))
+
+
+def merchant_grams(merchant: str) -> set:
+    """Return the trigrams of every token of a merchant."""
+    return set().union(*map(grams, tokens(merchant)))
+
+
+class Suggestion(NamedTuple):
+    """A category for an uncategorized merchant, and why.
+
+    ``score`` is the cosine similarity to ``merchant``, the closest
+    categorized merchant, scaled by the share of its transactions in
+    ``category``. ``keyword`` is the token of the uncategorized merchant
+    most similar to it.
+    """
+
+    category: str
+    score: float
+    keyword: str
+    merchant: str
+
+
+class Group(NamedTuple):
+    """The transactions of one uncategorized merchant, reviewed together.
+
+    Merchants with the same tokens, such as ``SHOP/123`` and ``SHOP/456``,
+    form one group, shown as its most frequent ``merchant``; ``variants``
+    counts them.
+    """
+
+    merchant: str
+    count: int
+    debit: int
+    variants: int
+    suggestions: list
+
+
+class SuggestionIndex:
+    """A trigram inverted index over categorized merchants."""
+
+    def __init__(self, merchants: dict):
+        """Index ``{merchant: {category: count}}``; uncategorized ones are skipped."""
+        self.merchants: list = []
+        self.categories: list = []
+        postings: dict = {}
+        for merchant, categories in merchants.items():
+            categories = {
+                category: count
+                for category, count in categories.items()
+                if category != UNCATEGORIZED and count > 0
+            }
+            if not categories:
+                continue
+            doc_grams = merchant_grams(merchant)
+            if not doc_grams:
+                continue
+            doc = len(self.merchants)
+            self.merchants.append(merchant)
+            self.categories.append(categories)
+            for gram in doc_grams:
+                postings.setdefault(gram, []).append(doc)
+        total = len(self.merchants)
+        self.postings = {
+            gram: docs
+            for gram, docs in postings.items()
+            if len(docs) <= COMMON_POSTINGS
+        }
+        self.weights = {
+            gram: math.log((total + 1) / len(docs)) for gram, docs in postings.items()
+        }
+        # A trigram the history never saw weighs like one seen once.
+        self.unseen = math.log(total + 1)
+        norms = [0.0] * total
+        for gram, docs in self.postings.items():
+            weight = self.weights[gram] ** 2
+            for doc in docs:
+                norms[doc] += weight
+        self.norms = [math.sqrt(norm) for norm in norms]
+
+    def __len__(self):
+        return len(self.merchants)
+
+    def _weight(self, gram: str) -> float:
+        """Return the weight of a trigram, or 0 if it is too common to score."""
+        if gram in self.postings:
+            return self.weights[gram]
+        return 0.0 if gram in self.weights else self.unseen
+
+    def neighbours(self, merchant: str, count: int = NEIGHBOURS) -> list:
+        """Return ``[(score, doc)]`` of the categorized merchants nearest ``merchant``."""
+        query = merchant_grams(merchant)
+        norm = math.sqrt(sum(self._weight(gram) ** 2 for gram in query))
+        scores: dict = {}
+        for gram in query:
+            docs = self.postings.get(gram)
+            if docs is None:
+                continue
+            weight = self.weights[gram] ** 2
+            for doc in docs:
+                scores[doc] = scores.get(doc, 0.0) + weight
+        return heapq.nlargest(
+            count,
+            ((score / (norm * self.norms[doc]), doc) for doc, score in scores.items()),
+        )
+
+    def keyword(self, merchant: str, doc: int) -> str:
+        """Return the token of ``merchant`` sharing the most weight with ``doc``."""
+        doc_grams = merchant_grams(self.merchants[doc])
+        return max(
+            tokens(merchant),
+            key=lambda token: (
+                sum(self._weight(gram) for gram in grams(token) & doc_grams),
+                len(token),
+            ),
+        )
+
+    def suggest(self, merchant: str, count: int = CANDIDATES) -> list:
+        """Return up to ``count`` ``Suggestion`` for ``merchant``, best first."""
+        best: dict = {}
+        for score, doc in self.neighbours(merchant):
+            categories = self.categories[doc]
+            total = sum(categories.values())
+            for category, transactions in categories.items():
+                scaled = score * transactions / total
+                if scaled > best.get(category, (0.0,))[0]:
+                    best[category] = (scaled, doc)
+        ranked = heapq.nlargest(count, best.items(), key=lambda item: item[1][0])
+        return [
+            Suggestion(
+                category,
+                round(score, 3),
+                self.keyword(merchant, doc),
+                self.merchants[doc],
+            )
+            for category, (score, doc) in ranked
+        ]
+
+
+def suggestions(merchants: dict, top: int = None, count: int = CANDIDATES) -> list:
+    """Return a ``Group`` per uncategorized merchant, most transactions first.
+
+    ``merchants`` is ``{merchant: {category: [debit, count]}}`` as returned
+    by ``Rollups.merchant_categories``; ``top`` limits the groups looked up.
+    """
+    index = SuggestionIndex(
+        {
+            merchant: {category: values[1] for category, values in categories.items()}
+            for merchant, categories in merchants.items()
+        }
+    )
+    # {tokens: [transactions, debit, variants, merchant, its transactions]}
+    groups: dict = {}
+    for merchant, categories in merchants.items():
+        values = categories.get(UNCATEGORIZED)
+        if values is None:
+            continue
+        debit, transactions = values
+        key = " ".join(tokens(merchant)) or merchant
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [transactions, debit, 1, merchant, transactions]
+            continue
+        group[0] += transactions
+        group[1] += debit
+        group[2] += 1
+        if (transactions, group[3]) > (group[4], merchant):
+            group[3:] = merchant, transactions
+    ranked = sorted(groups.values(), key=lambda group: (-group[0], -group[1], group[3]))
+    return [
+        Group(merchant, transactions, debit, variants, index.suggest(merchant, count))
+        for transactions, debit, variants, merchant, _ in ranked[:top]
+    ]
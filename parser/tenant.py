@@ -0,0 +1,97 @@
+"""Parse the statements of many households from one process.
+
+A ``Tenant`` is one household's root directory, laid out like a checkout
+of Munim: statements in ``data/statement``, outputs in ``data/json``, the
+compiled mapper cache in ``data/cache`` and its own ``expense_mapper.yaml``.
+Each tenant gets its own parser instances and runner, so tenants share
+nothing mutable: only the generated parser classes and, per distinct
+mapper file content, the compiled keyword matcher.
+
+``parse_tenants`` parses tenants concurrently on a thread pool, or on a
+process pool when parsing is CPU-bound; a worker process keeps the
+mappers it loaded from one tenant to the next.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from parser.mapper import expense_mapper
+from parser.registry import PARSERS
+from pathlib import Path
+
+
+class Tenant:
+    """One household's directories and expense mapper."""
+
+    def __init__(self, root, name: str = None, mapper_file=None):
+        """Initialize a tenant rooted at ``root``, named after it by default.
+
+        ``mapper_file`` replaces the tenant's ``expense_mapper.yaml``, for
+        households sharing one mapper.
+        """
+        self.root = Path(root)
+        self.name = name or self.root.resolve().name
+        self.input_dir = self.root / "data" / "statement"
+        self.output_dir = self.root / "data" / "json"
+        self.cache_dir = self.root / "data" / "cache"
+        self.mapper_file = Path(mapper_file or self.root / "expense_mapper.yaml")
+
+    def __repr__(self):
+        return f"Tenant({str(self.root)!r}, name={self.name!r})"
+
+    @property
+    def mapper(self):
+        """The tenant's up-to-date expense mapper; see ``expense_mapper``."""
+        return expense_mapper(self.mapper_file, self.cache_dir)
+
+    @property
+    def logger(self) -> logging.Logger:
+        """A child of the ``munim`` logger named after the tenant."""
+        return logging.getLogger("munim").getChild(self.name.replace(".", "_"))
+
+    def parsers(self, banks=None) -> list:
+        """Return ``(bank, parser)`` pairs for ``banks``, every bank by default."""
+        mapper = self.mapper
+        return [
+            (bank, PARSERS[bank](self.input_dir, self.output_dir, mapper))
+            for bank in banks or PARSERS
+        ]
+
+    def runner(self, logger=None, **options):
+        """Return a ``Runner`` writing to the tenant's outputs with its mapper."""
+        from parser.runner import Runner  # pylint: disable=import-outside-toplevel
+
+        return Runner(
+            logger or self.logger,
+            output_dir=self.output_dir,
+            mapper=self.mapper,
+            **options,
+        )
+
+    def parse(self, banks=None, **options) -> int:
+        """Parse the tenant's statements and return the number of failed files.
+
+        ``options`` are those of ``Runner``.
+        """
+        return self.runner(**options).run(self.parsers(banks))
+
+
+def parse_tenant(tenant: Tenant, banks=None, **options) -> int:
+    """Parse one tenant's statements; a picklable task for ``parse_tenants``."""
+    return tenant.parse(banks, **options)
+
+
+def parse_tenants(
+    tenants, jobs: int = 4, processes: bool = False, banks=None, **options
+) -> dict:
+    """Parse several tenants concurrently and return ``{name: failed files}``.
+
+    Tenants run on ``jobs`` threads, or on ``jobs`` worker processes with
+    ``processes``. ``banks`` and ``options`` apply to every tenant; see
+    ``Tenant.parse``.
+    """
+    tenants = list(tenants)
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(max_workers=max(1, min(jobs, len(tenants)))) as pool:
+        failures = pool.map(partial(parse_tenant, banks=banks, **options), tenants)
+        return dict(zip((tenant.name for tenant in tenants), failures))
@@ -0,0 +1,104 @@
+"""Watch the statement directory and parse statements as they land."""
+
+import logging
+import os
+import time
+from parser.ingest import route as route_statement
+from pathlib import Path
+
+logger = logging.getLogger("munim")
+
+
+class StatementWatcher:
+    """Polls a directory for new or changed ``*.csv`` statements.
+
+    Each poll is one ``scandir`` of the directory, comparing every file's
+    size and mtime with the last processed ones. A file is only reported
+    once it looked the same on two consecutive polls, so a statement that
+    is still being downloaded is not parsed half-written.
+    """
+
+    def __init__(self, directory="./data/statement"):
+        """Initialize the watcher; nothing has been processed yet."""
+        self.directory = Path(directory)
+        self.seen: dict = {}
+        self.pending: dict = {}
+
+    def _scan(self) -> dict:
+        """Return ``{path: (size, mtime_ns)}`` for the CSV files in the directory."""
+        current = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".csv") and entry.is_file():
+                        stat = entry.stat()
+                        current[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return current
+
+    def poll(self) -> list:
+        """Return the new or changed files that have settled since the last poll."""
+        current = self._scan()
+        ready = sorted(
+            path
+            for path, stat in current.items()
+            if self.seen.get(path) != stat and self.pending.get(path) == stat
+        )
+        for path in ready:
+            self.seen[path] = current[path]
+        self.seen = {path: stat for path, stat in self.seen.items() if path in current}
+        self.pending = {
+            path: stat for path, stat in current.items() if self.seen.get(path) != stat
+        }
+        return ready
+
+    def rescan(self):
+        """Report every file again, e.g. after the expense mapper changed."""
+        self.pending.update(self.seen)
+        self.seen.clear()
+
+
+def route(parsers: dict, file_path: Path):
+    """Return ``(bank, parser)`` for a statement, or None.
+
+    The bank is the one whose header the file holds, or else the one with
+    the longest matching ``file_starts_with``; see ``parser.ingest.route``.
+    """
+    bank = route_statement(
+        file_path, {bank: parser.file_starts_with for bank, parser in parsers.items()}
+    )
+    return None if bank is None else (bank, parsers[bank])
+
+
+def watch_statements(
+    runner, parsers: dict, watcher: StatementWatcher, interval=0.2, stop=None
+):
+    """Parse statements with ``runner`` as ``watcher`` reports them.
+
+    ``parsers`` maps bank names to parser instances, which stay loaded for
+    the life of the process along with the runner's expense mapper. A
+    change of the mapper makes every statement go through the runner
+    again, so the manifest re-categorizes existing outputs. ``stop`` is
+    called after every poll and ends the loop when it returns true.
+    """
+    mapper = runner.mapper.refresh().version
+    unrouted = set()
+    while not (stop and stop()):
+        if runner.mapper.refresh().version != mapper:
+            mapper = runner.mapper.version
+            watcher.rescan()
+        plan = {}
+        for file_path in watcher.poll():
+            match = route(parsers, file_path)
+            if match is None:
+                if file_path not in unrouted:
+                    logger.warning("No parser for %s", file_path.name)
+                    unrouted.add(file_path)
+                continue
+            plan.setdefault(match, []).append(file_path)
+        if plan:
+            runner.run(
+                [(bank, parser, files) for (bank, parser), files in plan.items()]
+            )
+        time.sleep(interval)
@@ -0,0 +1,247 @@
+"""Streaming writers for parsed transactions."""
+
+import json
+import os
+from parser.archive import ARCHIVE_SUFFIX, Archive, ArchiveBuilder
+from parser.record import as_dict
+from pathlib import Path
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+_encode_compact = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _pretty_item(transaction: dict) -> str:
+    """Render one array item exactly as ``json.dump(..., indent=2)`` would.
+
+    Flat transactions are assembled from C-encoded keys and values, which is
+    much faster than running the pure-Python indenting encoder per row.
+    """
+    if transaction and all(isinstance(v, _SCALARS) for v in transaction.values()):
+        fields = ",\n    ".join(
+            f"{_encode(str(key))}: {_encode(value)}"
+            for key, value in transaction.items()
+        )
+        return "{\n    " + fields + "\n  }"
+    text = json.dumps(transaction, indent=2, ensure_ascii=False)
+    return text.replace("\n", "\n  ")
+
+
+class JsonWriter:
+    """Streams transactions into a pretty-printed JSON array.
+
+    The output is byte-for-byte what ``json.dump(transactions, f, indent=2)``
+    produces, but only one transaction is held in memory at a time. Data is
+    written to a temporary file that replaces the target on ``close``, so a
+    failed run never leaves a truncated output behind.
+
+    ``checkpoint`` makes everything written so far durable and returns the
+    file offset; passing that ``offset`` and ``count`` back reopens the
+    temporary file there and continues the same output.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, path: Path, offset: int = None, count: int = 0):
+        """Open a temporary file next to ``path`` for writing."""
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.count = count
+        if offset is None:
+            # pylint: disable-next=consider-using-with
+            self._file = open(self.tmp_path, "w", encoding="utf-8")
+        else:
+            # pylint: disable-next=consider-using-with
+            self._file = open(self.tmp_path, "r+", encoding="utf-8")
+            self._file.seek(offset)
+            self._file.truncate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, transaction):
+        """Append one transaction to the array."""
+        self._file.write(",\n  " if self.count else "[\n  ")
+        self._file.write(_pretty_item(as_dict(transaction)))
+        self.count += 1
+
+    def write_many(self, transactions) -> int:
+        """Append every transaction from an iterable and return the total count."""
+        for transaction in transactions:
+            self.write(transaction)
+        return self.count
+
+    def checkpoint(self) -> int:
+        """Flush everything written so far to disk and return the file offset."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def _finish(self):
+        """Write the closing bracket of the array."""
+        self._file.write("\n]" if self.count else "[]")
+
+    def close(self):
+        """Finish the output and move it into place."""
+        self._finish()
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Discard the partial output."""
+        self._file.close()
+        self.tmp_path.unlink()
+
+    def suspend(self):
+        """Close the partial output but keep it, so it can be resumed."""
+        self._file.close()
+
+
+class JsonLinesWriter(JsonWriter):
+    """Streams transactions as compact JSON Lines, one object per line."""
+
+    suffix = ".jsonl"
+
+    def write(self, transaction):
+        """Append one transaction as a line."""
+        self._file.write(_encode_compact(as_dict(transaction)))
+        self._file.write("\n")
+        self.count += 1
+
+    def _finish(self):
+        """JSON Lines needs no trailer."""
+
+
+class ArchiveWriter:
+    """Collects transactions into a columnar archive (see ``parser.archive``).
+
+    Unlike the JSON writers it does not stream: rows are sorted by date and
+    the columns written in one piece on ``close``, so a statement's columns
+    (about 30 bytes per transaction, plus its distinct descriptions) stay in
+    memory until then. There are no checkpoints to resume from, and chunked
+    runs reject this format.
+    """
+
+    suffix = ARCHIVE_SUFFIX
+
+    def __init__(self, path: Path, offset: int = None, count: int = 0):
+        """Start an empty archive for ``path``; ``offset`` is not supported."""
+        if offset is not None or count:
+            raise ValueError("Archive outputs cannot resume from a checkpoint")
+        self.path = Path(path)
+        self._builder = ArchiveBuilder()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def count(self) -> int:
+        """The number of transactions written so far."""
+        return len(self._builder)
+
+    def write(self, transaction):
+        """Add one transaction to the columns."""
+        self._builder.add(transaction)
+
+    def write_many(self, transactions) -> int:
+        """Add every transaction from an iterable and return the total count."""
+        return self._builder.extend(transactions)
+
+    def checkpoint(self) -> int:
+        """Archives are written in one piece and cannot be checkpointed."""
+        raise ValueError("Archive outputs cannot be checkpointed")
+
+    def close(self):
+        """Write the archive and move it into place."""
+        self._builder.write(self.path)
+
+    def abort(self):
+        """Discard the collected rows."""
+        self._builder = ArchiveBuilder()
+
+    suspend = abort
+
+
+WRITERS = {"json": JsonWriter, "jsonl": JsonLinesWriter, "archive": ArchiveWriter}
+
+
+def writer_for(path: Path) -> type:
+    """Return the writer class of an output file, by its suffix."""
+    suffix = Path(path).suffix
+    for writer in WRITERS.values():
+        if writer.suffix == suffix:
+            return writer
+    raise ValueError(f"Unknown output format: {path}")
+
+
+def latest_outputs(directory) -> dict:
+    """Return ``{statement: (path, size, mtime_ns)}`` of the outputs in ``directory``.
+
+    If a statement has outputs in several formats, the newest one counts.
+    """
+    suffixes = {writer.suffix for writer in WRITERS.values()}
+    outputs: dict = {}
+    if not os.path.isdir(directory):
+        return outputs
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            path = Path(entry.path)
+            if path.suffix not in suffixes or path.name.startswith("."):
+                continue
+            stat = entry.stat()
+            current = outputs.get(path.stem)
+            if current is None or stat.st_mtime_ns > current[2]:
+                outputs[path.stem] = (path, stat.st_size, stat.st_mtime_ns)
+    return outputs
+
+
+def _read_lines(path: Path):
+    """Yield the objects of a JSON Lines file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_transactions(path: Path):
+    """Yield transactions from a JSON, JSON Lines or archive output file."""
+    path = Path(path)
+    if path.suffix == JsonLinesWriter.suffix:
+        yield from _read_lines(path)
+    elif path.suffix == ArchiveWriter.suffix:
+        with Archive(path) as archive:
+            yield from archive.transactions()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+def archive_outputs(directory, path) -> tuple:
+    """Write every output in ``directory`` into one archive at ``path``.
+
+    Returns ``(outputs, transactions)`` converted. Each statement's newest
+    output is read, as in ``latest_outputs``. ``path`` must lie outside
+    ``directory``, where it would be taken for one more statement's output
+    and counted twice by reports and reconciling.
+    """
+    if Path(path).resolve().parent == Path(directory).resolve():
+        raise ValueError(f"{path} must be outside the output directory {directory}")
+    builder = ArchiveBuilder()
+    outputs = [
+        output for _, (output, _, _) in sorted(latest_outputs(directory).items())
+    ]
+    for output in outputs:
+        builder.extend(read_transactions(output))
+    return len(outputs), builder.write(path)
@@ -0,0 +1,159 @@
+"""Tests for the memory-mapped columnar archive."""
+import json
+import os
+from parser.archive import Archive, write_archive
+from parser.record import Transaction
+from parser.writer import ArchiveWriter, JsonWriter, archive_outputs, read_transactions
+
+import pytest
+
+TRANSACTIONS = [
+    {
+        "date": "2024-03-02",
+        "description": "UPI-SWIGGY ₹",
+        "dr_amount": 250.0,
+        "cr_amount": 0.0,
+        "account": "hdfc",
+        "category": "food",
+        "type": "debit",
+    },
+    {
+        "date": "2024-03-01",
+        "description": "SALARY MARCH",
+        "dr_amount": 0.0,
+        "cr_amount": 50000.0,
+        "account": "hdfc",
+        "category": "salary",
+        "type": "credit",
+    },
+    {
+        "date": "2024-03-03",
+        "description": "POS DMART",
+        "dr_amount": 1200.5,
+        "cr_amount": 0.0,
+        "account": "icici",
+        "category": "grocery",
+        "type": "debit",
+    },
+    {
+        "date": "2024-03-03",
+        "description": "UPI-SWIGGY ₹",
+        "dr_amount": 99.99,
+        "cr_amount": 0.0,
+        "account": "hdfc",
+        "category": "food",
+        "type": "debit",
+    },
+]
+
+# TRANSACTIONS in date order; equal dates keep their order.
+BY_DATE = [TRANSACTIONS[1], TRANSACTIONS[0], TRANSACTIONS[2], TRANSACTIONS[3]]
+
+
+@pytest.fixture(name="archive")
+def fixture_archive(tmp_path):
+    """Write TRANSACTIONS to an archive and map it."""
+    path = tmp_path / "history.munim"
+    assert write_archive(path, TRANSACTIONS) == 4
+    with Archive(path) as archive:
+        yield archive
+
+
+class TestArchive:
+    """Test cases for writing and reading archives."""
+
+    def test_round_trip_in_date_order(self, archive):
+        """Test that transactions read back unchanged, sorted by date."""
+        assert len(archive) == 4
+        assert list(archive.transactions()) == BY_DATE
+
+    def test_columns_are_mapped_in_place(self, archive):
+        """Test that columns are read-only views of the file, not copies."""
+        amounts = archive.column("dr_amount")
+        assert isinstance(amounts, memoryview)
+        assert amounts.readonly
+        assert amounts.tolist() == [0, 25000, 120050, 9999]
+        assert archive.column("description").tolist() == [1, 0, 2, 0]
+        assert archive.value("description", 1) == "SALARY MARCH"
+        assert archive.dictionaries["account"] == ("hdfc", "icici")
+
+    def test_date_range(self, archive):
+        """Test that only the rows between two dates are returned."""
+        assert archive.span("2024-03-02", "2024-03-03") == range(1, 4)
+        assert archive.span(end="2024-02-29") == range(0, 0)
+        columns = archive.read(["date", "category"], start="2024-03-03")
+        assert set(columns) == {"date", "category"}
+        categories = archive.dictionaries["category"]
+        assert [categories[code] for code in columns["category"]] == ["grocery", "food"]
+        assert list(archive.transactions("2024-03-02", "2024-03-02")) == BY_DATE[1:2]
+
+    def test_unknown_column(self, archive):
+        """Test that only row columns can be read."""
+        with pytest.raises(KeyError):
+            archive.column("description.data")
+
+    def test_empty(self, tmp_path):
+        """Test that an archive without transactions can be read."""
+        path = tmp_path / "empty.munim"
+        write_archive(path, [])
+        with Archive(path) as archive:
+            assert len(archive) == 0
+            assert not list(archive.transactions())
+            assert len(archive.column("date", "2024-01-01")) == 0
+
+    def test_records(self, tmp_path):
+        """Test that Transaction records are archived like their dicts."""
+        path = tmp_path / "records.munim"
+        write_archive(path, [Transaction.from_dict(t) for t in BY_DATE])
+        assert list(read_transactions(path)) == BY_DATE
+
+    @pytest.mark.parametrize("content", [b"", b"MUNIMARC", b"[]" * 20])
+    def test_malformed_file(self, tmp_path, content):
+        """Test that a file that is not an archive raises ValueError."""
+        path = tmp_path / "bad.munim"
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            Archive(path)
+
+
+class TestArchiveWriter:
+    """Test cases for archive outputs and the converter."""
+
+    def test_no_checkpoints(self, tmp_path):
+        """Test that an archive output is written whole and never resumed."""
+        path = tmp_path / "out.munim"
+        with ArchiveWriter(path) as writer:
+            assert writer.write_many(TRANSACTIONS) == 4
+            with pytest.raises(ValueError):
+                writer.checkpoint()
+        assert list(read_transactions(path)) == BY_DATE
+        assert [p.name for p in tmp_path.iterdir()] == ["out.munim"]
+        with pytest.raises(ValueError):
+            ArchiveWriter(path, 0, 2)
+
+    def test_failure_keeps_previous_output(self, tmp_path):
+        """Test that an error while collecting rows leaves the old archive."""
+        path = tmp_path / "out.munim"
+        write_archive(path, TRANSACTIONS[:1])
+        with pytest.raises(ValueError):
+            with ArchiveWriter(path) as writer:
+                writer.write_many(TRANSACTIONS)
+                raise ValueError("bad row")
+        assert list(read_transactions(path)) == TRANSACTIONS[:1]
+
+    def test_converts_outputs(self, tmp_path):
+        """Test that the newest output of every statement is archived once."""
+        with JsonWriter(tmp_path / "hdfc_mar.json") as writer:
+            writer.write_many(TRANSACTIONS[:2])
+        stale = tmp_path / "icici_mar.json"
+        stale.write_text(json.dumps(TRANSACTIONS), encoding="utf-8")
+        os.utime(stale, ns=(0, 0))
+        with ArchiveWriter(tmp_path / "icici_mar.munim") as writer:
+            writer.write_many(TRANSACTIONS[2:])
+
+        path = tmp_path.parent / f"{tmp_path.name}.munim"
+        assert archive_outputs(tmp_path, path) == (2, 4)
+        assert list(read_transactions(path)) == BY_DATE
+        with pytest.raises(ValueError):
+            archive_outputs(tmp_path, tmp_path / "history.munim")
+        assert not (tmp_path / "history.munim").exists()
@@ -35,3 +35,19 @@ class TestBaseParser:
         parser = BaseParser(bank="Test", file_starts_with="test_")
         result = parser.load_expenses_mappers()
         assert isinstance(result, dict)
+
+    def test_parse_returns_record(self):
+        """Test that parse returns a record in the JSON schema."""
+        parser = BaseParser(bank="Test", file_starts_with="test_")
+        parser.bank = "Test"
+        parser.attrs_mapping = {"date": 0, "description": 1, "dr_amount": 2, "cr_amount": 3}
+        result = parser.parse(["15/03/2024", " ~Unknown~ ", "1,250.50", ""])
+        assert result.to_dict() == {
+            "date": "2024-03-15",
+            "description": "Unknown",
+            "dr_amount": 1250.5,
+            "cr_amount": 0.0,
+            "account": "Test",
+            "category": "uncategorized",
+            "type": "expense",
+        }
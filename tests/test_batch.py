@@ -0,0 +1,72 @@
+"""Tests for the batch columnar parsing engine."""
+import random
+from datetime import date, timedelta
+from parser import batch
+
+import pytest
+from cli import PARSERS
+
+from benchmarks.generate import LAYOUTS
+
+
+def generated_rows(bank, count=500):
+    """Return generated transaction rows in a bank's layout."""
+    rng = random.Random(3)
+    build_row = LAYOUTS[bank][3]
+    start = date(2023, 1, 1)
+    return [build_row(rng, start + timedelta(days=i // 7), i) for i in range(count)]
+
+
+@pytest.fixture(name="parsers")
+def fixture_parsers(tmp_path, monkeypatch):
+    """Construct parsers in an empty working directory."""
+    monkeypatch.chdir(tmp_path)
+    return PARSERS
+
+
+class TestParseBatch:
+    """Test cases for parse_batch."""
+
+    @pytest.mark.parametrize("bank", sorted(LAYOUTS))
+    def test_matches_row_parser(self, bank, parsers):
+        """Test that batch records equal per-row records for every layout."""
+        parser = parsers[bank]()
+        rows = generated_rows(bank)
+        expected = [tx.to_dict() for tx in parser.parse_rows(rows)]
+        assert [tx.to_dict() for tx in parser.parse_batch(rows)] == expected
+
+    @pytest.mark.parametrize("bank", sorted(LAYOUTS))
+    def test_tilde_amount_matches_row_parser(self, bank, parsers):
+        """Test that ``~`` in an amount is only stripped where the layout says so."""
+        parser = parsers[bank]()
+        mapping = parser.attrs_mapping
+        column = mapping["amount"] if "amount" in mapping else mapping["dr_amount"]
+        rows = [list(row) for row in generated_rows(bank, 20)]
+        rows[3][column] = f"~{rows[3][column]}~"
+        try:
+            expected = [tx.to_dict() for tx in parser.parse_rows(rows)]
+        except ValueError:
+            with pytest.raises(ValueError):
+                parser.parse_batch(rows)
+            return
+        assert [tx.to_dict() for tx in parser.parse_batch(rows)] == expected
+
+    def test_stdlib_fallback(self, parsers, monkeypatch):
+        """Test that the array fallback matches when NumPy is unavailable."""
+        monkeypatch.setattr(batch, "np", None)
+        parser = parsers["hdfc"]()
+        rows = generated_rows("hdfc")
+        assert parser.parse_batch(rows) == [tx.to_dict() for tx in parser.parse_rows(rows)]
+
+    def test_amounts(self):
+        """Test amount cleanup and conversion."""
+        values = [" 1,250.50 ", "~ 99~", "", "~~"]
+        assert list(batch.amount_column(values)) == [1250.5, 99.0, 0.0, 0.0]
+        with pytest.raises(ValueError):
+            batch.amount_column(["12", "Cr"])
+        with pytest.raises(ValueError):
+            batch.amount_column(["~ 99~"], tilde=False)
+
+    def test_empty_block(self, parsers):
+        """Test that an empty block parses to no records."""
+        assert not parsers["sbi"]().parse_batch([])
@@ -1,6 +1,14 @@
 """Tests for CLI module."""
+import json
+import logging
+from parser.archive import Archive
+from parser.runner import Runner
+from parser.store import SqliteStore
+from parser.writer import read_transactions
+
+import pytest
 from click.testing import CliRunner
-from cli import cli
+from cli import PARSERS, cli
 
 
 class TestCLI:
@@ -38,3 +46,472 @@ class TestCLI:
         runner = CliRunner()
         result = runner.invoke(cli, ["--help"])
         assert "--log-file" in result.output
+
+
+HDFC_STATEMENT = (
+    "Date,Narration,Value Date,Debit Amount,Credit Amount,Chq/Ref Number,Closing Balance\n"
+    "01/03/24,UPI-SWIGGY-412345,01/03/24,250.00,,REF1,9750.00\n"
+    "02/03/24,SALARY MARCH,02/03/24,,\"50,000.00\",REF2,59750.00\n"
+    "03/03/24,POS DMART HOODI,03/03/24,1200.50,,REF3,58549.50\n"
+)
+
+
+@pytest.fixture(name="statements")
+def fixture_statements(tmp_path, monkeypatch):
+    """Create a data directory with a few HDFC statements."""
+    monkeypatch.chdir(tmp_path)
+    statement_dir = tmp_path / "data" / "statement"
+    statement_dir.mkdir(parents=True)
+    (tmp_path / "data" / "json").mkdir()
+    for month in ("jan", "feb", "mar"):
+        (statement_dir / f"hdfc_{month}.csv").write_text(HDFC_STATEMENT, encoding="utf-8")
+    return tmp_path
+
+
+class TestParseJobs:
+    """Test cases for parallel parsing with --jobs."""
+
+    def test_jobs_output_matches_serial(self, statements):
+        """Test that parallel output is identical to a serial run."""
+        runner = CliRunner()
+        json_dir = statements / "data" / "json"
+
+        result = runner.invoke(cli, ["parse", "hdfc"])
+        assert result.exit_code == 0
+        serial = {p.name: p.read_text(encoding="utf-8") for p in json_dir.glob("*.json")}
+
+        for path in json_dir.glob("*.json"):
+            path.unlink()
+        result = runner.invoke(cli, ["parse", "hdfc", "--jobs", "2"])
+        assert result.exit_code == 0
+        parallel = {p.name: p.read_text(encoding="utf-8") for p in json_dir.glob("*.json")}
+
+        assert len(serial) == 3
+        assert parallel == serial
+
+    def test_bad_file_fails_alone(self, statements):
+        """Test that one bad file does not stop the other files."""
+        bad = statements / "data" / "statement" / "hdfc_bad.csv"
+        bad.write_text(HDFC_STATEMENT + "31/02/24,BROKEN,,1,,,\n", encoding="utf-8")
+
+        result = CliRunner().invoke(cli, ["parse-all", "--jobs", "2"])
+        assert result.exit_code == 1
+        outputs = sorted(p.name for p in (statements / "data" / "json").glob("*.json"))
+        assert outputs == ["hdfc_feb.json", "hdfc_jan.json", "hdfc_mar.json"]
+
+    @pytest.mark.parametrize(
+        "args", [[], ["--jobs", "2"], ["--pipeline"]], ids=["serial", "jobs", "pipeline"]
+    )
+    def test_malformed_csv_fails_alone(self, statements, caplog, args):
+        """Test that a csv.Error in one statement does not stop the others."""
+        bad = statements / "data" / "statement" / "hdfc_bad.csv"
+        bad.write_text(
+            HDFC_STATEMENT + '01/03/24,"' + "X" * 200_000 + '",01/03/24,1,,R,1\n',
+            encoding="utf-8",
+        )
+
+        result = CliRunner().invoke(cli, ["parse", "hdfc", *args])
+        assert result.exit_code == 1
+        assert "1 file(s) failed for hdfc" in caplog.text
+        outputs = sorted(p.name for p in (statements / "data" / "json").glob("*.json"))
+        assert outputs == ["hdfc_feb.json", "hdfc_jan.json", "hdfc_mar.json"]
+
+
+class TestIncrementalParse:
+    """Test cases for manifest-driven incremental parsing."""
+
+    def test_unchanged_files_are_skipped(self, statements):
+        """Test that a second run skips files and --force re-parses them."""
+        runner = CliRunner()
+        output = statements / "data" / "json" / "hdfc_jan.json"
+
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        output.write_text("[]", encoding="utf-8")
+
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        assert output.read_text(encoding="utf-8") == "[]"
+
+        assert runner.invoke(cli, ["parse", "hdfc", "--force"]).exit_code == 0
+        assert "SWIGGY" in output.read_text(encoding="utf-8")
+
+    def test_mapper_change_recategorizes(self, statements):
+        """Test that a mapper change re-categorizes existing outputs."""
+        runner = CliRunner()
+        output = statements / "data" / "json" / "hdfc_jan.json"
+
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        assert '"category": "food"' not in output.read_text(encoding="utf-8")
+
+        (statements / "expense_mapper.yaml").write_text("food:\n- swiggy\n", encoding="utf-8")
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        assert '"category": "food"' in output.read_text(encoding="utf-8")
+
+    def test_formats_are_judged_apart(self, statements):
+        """Test that parsing another format does not mark the first one fresh."""
+        runner = CliRunner()
+        output = statements / "data" / "json" / "hdfc_jan.json"
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+
+        (statements / "expense_mapper.yaml").write_text("food:\n- swiggy\n", encoding="utf-8")
+        assert runner.invoke(cli, ["parse", "hdfc", "--format", "jsonl"]).exit_code == 0
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        assert '"category": "food"' in output.read_text(encoding="utf-8")
+
+
+class TestOutputFormat:
+    """Test cases for the --format option."""
+
+    def test_jsonl_format(self, statements):
+        """Test that --format jsonl writes one compact object per line."""
+        result = CliRunner().invoke(cli, ["parse", "hdfc", "--format", "jsonl"])
+        assert result.exit_code == 0
+        lines = (statements / "data" / "json" / "hdfc_jan.jsonl").read_text(
+            encoding="utf-8"
+        ).splitlines()
+        assert len(lines) == 3
+        assert lines[0].startswith('{"date":"2024-03-01","description":"UPI-SWIGGY-412345"')
+
+
+class TestStoreOption:
+    """Test cases for the --store option."""
+
+    def test_store_has_no_duplicates_after_reparse(self, statements):
+        """Test that --store upserts transactions across forced re-parses."""
+        runner = CliRunner()
+        args = ["parse", "hdfc", "--store", "sqlite:munim.db"]
+        assert runner.invoke(cli, args).exit_code == 0
+        assert runner.invoke(cli, args + ["--force"]).exit_code == 0
+
+        with SqliteStore(str(statements / "munim.db")) as store:
+            totals = store.monthly_totals()
+        # The three fixture statements are identical, so they share keys too.
+        assert sum(count for *_, count in totals) == 3
+
+    def test_invalid_store(self, statements):  # pylint: disable=unused-argument
+        """Test that an unsupported store spec is rejected."""
+        result = CliRunner().invoke(cli, ["parse", "hdfc", "--store", "munim.db"])
+        assert result.exit_code == 2
+
+
+class TestMetricsOption:
+    """Test cases for the --metrics, --metrics-file and --profile options."""
+
+    def test_metrics_file_and_table(self, statements):
+        """Test that metrics are printed and written per file."""
+        result = CliRunner().invoke(
+            cli, ["--metrics-file", "metrics.json", "--profile", "prof", "parse", "hdfc"]
+        )
+        assert result.exit_code == 0
+        assert "(total)" in result.output
+
+        with open(statements / "metrics.json", encoding="utf-8") as f:
+            records = json.load(f)["files"]
+        assert sorted(r["file"] for r in records) == [
+            "hdfc_feb.csv",
+            "hdfc_jan.csv",
+            "hdfc_mar.csv",
+        ]
+        assert all(r["rows"] == 3 and r["skipped"] == 0 for r in records)
+        assert set(records[0]["stages"]) == {"read", "fields", "date", "categorize", "write"}
+        assert len(list((statements / "prof").glob("*.prof"))) == 3
+
+    def test_metrics_off_leaves_parser_untouched(self, statements):
+        """Test that parsers carry no timing wrappers after a metrics run."""
+        parser = PARSERS["hdfc"]()
+        runner = Runner(logging.getLogger("munim"), metrics=True)
+        assert runner.run([("hdfc", parser)]) == 0
+        assert len(runner.metrics) == 3
+        assert "parse" not in vars(parser)
+        assert (statements / "data" / "json" / "hdfc_jan.json").exists()
+
+
+class TestChunkSize:
+    """Test cases for chunked parsing with --chunk-size."""
+
+    def test_chunked_output_matches(self, statements):
+        """Test that chunked output is identical to a streamed run."""
+        runner = CliRunner()
+        output = statements / "data" / "json" / "hdfc_jan.json"
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        streamed = output.read_text(encoding="utf-8")
+
+        assert runner.invoke(cli, ["parse", "hdfc", "--force", "--chunk-size", "2"]).exit_code == 0
+        assert output.read_text(encoding="utf-8") == streamed
+        assert not list(output.parent.glob("*.ckpt"))
+
+    def test_interrupted_run_resumes(self, statements, monkeypatch):
+        """Test that a failed chunked run resumes after its last committed chunk."""
+        runner = CliRunner()
+        json_dir = statements / "data" / "json"
+        for month in ("feb", "mar"):
+            (statements / "data" / "statement" / f"hdfc_{month}.csv").unlink()
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        output = json_dir / "hdfc_jan.json"
+        expected = output.read_text(encoding="utf-8")
+        output.unlink()
+
+        parser_class = PARSERS["hdfc"]
+        parse = parser_class.parse
+        calls = []
+
+        def counted_parse(self, row):
+            calls.append(row)
+            return parse(self, row)
+
+        def failing_parse(self, row):
+            if len(calls) == 2:
+                raise ValueError("interrupted")
+            return counted_parse(self, row)
+
+        monkeypatch.setattr(parser_class, "parse", failing_parse)
+        args = ["parse", "hdfc", "--chunk-size", "2"]
+        assert runner.invoke(cli, args).exit_code == 1
+        assert len(list(json_dir.glob("*.ckpt"))) == 1
+
+        calls.clear()
+        monkeypatch.setattr(parser_class, "parse", counted_parse)
+        assert runner.invoke(cli, args).exit_code == 0
+        # The resumed run only parses the uncommitted third row.
+        assert len(calls) == 1
+        assert output.read_text(encoding="utf-8") == expected
+        assert not list(json_dir.glob("*.ckpt"))
+
+    def test_mapper_change_starts_over(self, statements, monkeypatch):
+        """Test that a checkpoint of an older expense mapper is not resumed."""
+        runner = CliRunner()
+        json_dir = statements / "data" / "json"
+        for month in ("feb", "mar"):
+            (statements / "data" / "statement" / f"hdfc_{month}.csv").unlink()
+
+        parser_class = PARSERS["hdfc"]
+        parse = parser_class.parse
+        calls = []
+
+        def counted_parse(self, row):
+            calls.append(row)
+            return parse(self, row)
+
+        def failing_parse(self, row):
+            if len(calls) == 2:
+                raise ValueError("interrupted")
+            return counted_parse(self, row)
+
+        monkeypatch.setattr(parser_class, "parse", failing_parse)
+        args = ["parse", "hdfc", "--chunk-size", "2"]
+        assert runner.invoke(cli, args).exit_code == 1
+        assert len(list(json_dir.glob("*.ckpt"))) == 1
+
+        (statements / "expense_mapper.yaml").write_text("food:\n- swiggy\n", encoding="utf-8")
+        calls.clear()
+        monkeypatch.setattr(parser_class, "parse", counted_parse)
+        assert runner.invoke(cli, args).exit_code == 0
+        # The chunk written under the old mapper is parsed again.
+        assert len(calls) == 3
+        assert '"category": "food"' in (json_dir / "hdfc_jan.json").read_text(encoding="utf-8")
+
+
+class TestEngineOption:
+    """Test cases for the --engine option."""
+
+    def test_batch_output_matches(self, statements):
+        """Test that the batch engine writes the same output as the row engine."""
+        runner = CliRunner()
+        output = statements / "data" / "json" / "hdfc_jan.json"
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        expected = output.read_text(encoding="utf-8")
+
+        result = runner.invoke(cli, ["--metrics", "parse", "hdfc", "--force", "--engine", "batch"])
+        assert result.exit_code == 0
+        assert output.read_text(encoding="utf-8") == expected
+        assert "hdfc_jan.csv" in result.output
+
+
+class TestDedupOption:
+    """Test cases for the --dedup option."""
+
+    def _outputs(self, statements):
+        """Return the transactions of every JSON output."""
+        return {
+            path.name: json.loads(path.read_text(encoding="utf-8"))
+            for path in (statements / "data" / "json").glob("*.json")
+        }
+
+    def test_overlapping_statements(self, statements):
+        """Test that overlapping statements keep each transaction once."""
+        extra = "04/03/24,NEW ROW,04/03/24,10.00,,REF4,58539.50\n"
+        (statements / "data" / "statement" / "hdfc_q1.csv").write_text(
+            HDFC_STATEMENT + extra, encoding="utf-8"
+        )
+        runner = CliRunner()
+        assert runner.invoke(cli, ["parse", "hdfc", "--dedup", "--jobs", "2"]).exit_code == 0
+        outputs = self._outputs(statements)
+        assert len(outputs) == 4
+        descriptions = [tx["description"] for txs in outputs.values() for tx in txs]
+        assert sorted(descriptions) == [
+            "NEW ROW",
+            "POS DMART HOODI",
+            "SALARY MARCH",
+            "UPI-SWIGGY-412345",
+        ]
+
+        # Re-parsing keeps every statement's own transactions.
+        assert runner.invoke(cli, ["parse", "hdfc", "--dedup", "--force"]).exit_code == 0
+        assert self._outputs(statements) == outputs
+
+    def test_interleaved_exports(self, statements):
+        """Test that repeats match although two exports order the rows differently."""
+        statement_dir = statements / "data" / "statement"
+        for path in statement_dir.iterdir():
+            path.unlink()
+        header = HDFC_STATEMENT.splitlines(keepends=True)[0]
+        coffee = "0{}/03/24,COFFEE,0{}/03/24,90.00,,REF,1.00\n"
+        by_date = [coffee.format(1, 1), coffee.format(1, 1), coffee.format(2, 2)]
+        interleaved = [by_date[0], by_date[2], by_date[1]]
+        (statement_dir / "hdfc_a.csv").write_text(header + "".join(interleaved), "utf-8")
+        (statement_dir / "hdfc_b.csv").write_text(header + "".join(by_date), "utf-8")
+
+        assert CliRunner().invoke(cli, ["parse", "hdfc", "--dedup"]).exit_code == 0
+        outputs = self._outputs(statements)
+        assert len(outputs["hdfc_a.json"]) == 3
+        assert not outputs["hdfc_b.json"]
+
+
+class TestPipelineOption:
+    """Test cases for the --pipeline option."""
+
+    def test_pipeline_output_matches(self, statements):
+        """Test that a pipelined run writes the same outputs as a serial run."""
+        runner = CliRunner()
+        json_dir = statements / "data" / "json"
+        assert runner.invoke(cli, ["parse-all"]).exit_code == 0
+        serial = {p.name: p.read_text(encoding="utf-8") for p in json_dir.glob("*.json")}
+
+        result = runner.invoke(cli, ["--metrics", "parse-all", "--force", "--pipeline"])
+        assert result.exit_code == 0
+        assert {p.name: p.read_text(encoding="utf-8") for p in json_dir.glob("*.json")} == serial
+        assert "hdfc_jan.csv" in result.output
+
+    @pytest.mark.parametrize(
+        "args", [["--jobs", "2"], ["--chunk-size", "2"], ["--dedup"]], ids=["jobs", "chunks", "dedup"]
+    )
+    def test_pipeline_rejects_other_modes(self, statements, args):
+        """Test that --pipeline is refused rather than ignored outside serial runs."""
+        result = CliRunner().invoke(cli, ["parse", "hdfc", "--pipeline", *args])
+        assert result.exit_code == 2
+        assert "--pipeline only applies to serial runs" in result.output
+        assert not list((statements / "data" / "json").glob("*.json"))
+
+
+class TestReportCommand:
+    """Test cases for the report command."""
+
+    def test_report(self, statements):  # pylint: disable=unused-argument
+        """Test totals, top merchants and trends from parsed statements."""
+        runner = CliRunner()
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+
+        result = runner.invoke(cli, ["report", "--by", "account"])
+        assert result.exit_code == 0
+        assert "Hdfc" in result.output
+        assert "4,351.50" in result.output
+        assert "150,000.00" in result.output
+
+        result = runner.invoke(cli, ["report", "--top", "1"])
+        assert "POS DMART HOODI" in result.output
+        assert "3,601.50" in result.output
+
+        result = runner.invoke(cli, ["report", "--trend", "all", "--from", "2024-03"])
+        assert "2024-03" in result.output
+
+
+class TestSuggestCommand:
+    """Test cases for the suggest command."""
+
+    def test_suggest(self, statements):
+        """Test that a misspelt merchant is suggested its look-alike's category."""
+        (statements / "expense_mapper.yaml").write_text("food:\n- swiggy\n", encoding="utf-8")
+        (statements / "data" / "statement" / "hdfc_apr.csv").write_text(
+            HDFC_STATEMENT.replace("SWIGGY-412345", "SWIGY-998877"), encoding="utf-8"
+        )
+        runner = CliRunner()
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+
+        result = runner.invoke(cli, ["suggest", "--top", "5"])
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        start = next(i for i, line in enumerate(lines) if line.startswith("UPI-SWIGY-#"))
+        assert "(1 transactions, 250.00 spent)" in lines[start]
+        category, _, keyword = lines[start + 1].split()[:3]
+        assert (category, keyword) == ("food", "swigy")
+        assert lines[start + 1].endswith("like UPI-SWIGGY-#")
+
+    def test_nothing_to_suggest(self, statements):  # pylint: disable=unused-argument
+        """Test the message when every transaction is categorized."""
+        result = CliRunner().invoke(cli, ["suggest"])
+        assert result.exit_code == 0
+        assert "No uncategorized transactions" in result.output
+
+
+class TestArchiveCommand:
+    """Test cases for archive outputs and the archive command."""
+
+    def test_archive_format_matches_json(self, statements):
+        """Test that --format archive holds the same transactions as JSON."""
+        runner = CliRunner()
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        result = runner.invoke(cli, ["parse", "hdfc", "--force", "--format", "archive"])
+        assert result.exit_code == 0
+        json_dir = statements / "data" / "json"
+        for path in json_dir.glob("hdfc_*.json"):
+            expected = json.loads(path.read_text(encoding="utf-8"))
+            assert list(read_transactions(path.with_suffix(".munim"))) == expected
+
+    def test_archive_rejects_chunk_size(self, statements):
+        """Test that archives, written in one piece, cannot be chunked."""
+        args = ["parse", "hdfc", "--format", "archive", "--chunk-size", "2"]
+        result = CliRunner().invoke(cli, args)
+        assert result.exit_code == 2
+        assert "--chunk-size needs a streaming format" in result.output
+        assert not list((statements / "data" / "json").iterdir())
+        with pytest.raises(ValueError):
+            Runner(logging.getLogger("munim"), fmt="archive", chunk_size=2)
+
+    def test_archive_converts_outputs(self, statements):
+        """Test that every output is converted into one archive."""
+        runner = CliRunner()
+        assert runner.invoke(cli, ["parse", "hdfc"]).exit_code == 0
+        result = runner.invoke(cli, ["archive"])
+        assert result.exit_code == 0
+        assert "Archived 9 transactions from 3 outputs" in result.output
+        with Archive(statements / "data" / "history.munim") as archive:
+            assert len(archive) == 9
+            assert sum(archive.column("dr_amount", "2024-03-03")) == 3 * 120050
+
+        result = runner.invoke(cli, ["archive", "-o", "data/json/history.munim"])
+        assert result.exit_code == 2
+        assert "must be outside the output directory" in result.output
+        assert not (statements / "data" / "json" / "history.munim").exists()
+
+
+class TestReconcileOption:
+    """Test cases for the --reconcile option."""
+
+    def test_transfer_is_tagged(self, statements):
+        """Test that a transfer to another account is tagged and left out of reports."""
+        (statements / "data" / "statement" / "icici_mar.csv").write_text(
+            "DATE,MODE,PARTICULARS,DEPOSITS,WITHDRAWALS,BALANCE\n"
+            "03/03/2024,NEFT,HDFC TRANSFER,1200.50,,9000.00\n",
+            encoding="utf-8",
+        )
+        runner = CliRunner()
+        result = runner.invoke(cli, ["-v", "parse-all", "--reconcile"])
+        assert result.exit_code == 0
+        assert "Paired 1 transfer(s)" in result.output
+
+        icici = json.loads(
+            (statements / "data" / "json" / "icici_mar.json").read_text(encoding="utf-8")
+        )
+        assert [t["type"] for t in icici] == ["transfer"]
+        result = runner.invoke(cli, ["report", "--top", "1"])
+        assert "POS DMART HOODI" in result.output
+        assert "2,401.00" in result.output
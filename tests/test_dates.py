@@ -0,0 +1,84 @@
+"""Tests for the memoized date normalizer."""
+import random
+from datetime import datetime
+from parser.dates import DATE_FORMATS, DateNormalizer
+
+import pytest
+
+
+def reference(date_str):
+    """The original strptime loop over every supported format."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str.strip(), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"Unsupported date format: {date_str}")
+
+
+def random_date(rng):
+    """Generate a plausible, sometimes invalid, statement date."""
+    day, month = f"{rng.randint(0, 33):02d}", f"{rng.randint(0, 13):02d}"
+    year = rng.choice([f"{rng.randint(0, 99):02d}", f"{rng.randint(0, 2100):04d}"])
+    sep = rng.choice("-/.")
+    return rng.choice(
+        [
+            f"{day}{sep}{month}{sep}{year}",
+            f"{rng.randint(1, 31)}{sep}{rng.randint(1, 12)}{sep}{year}",
+            f"{day}-{rng.choice(['Mar', 'mar', 'SEP', 'Foo'])}-{year}",
+            f"{day}/{month}/{year} {rng.randint(0, 25):02d}:"
+            f"{rng.randint(0, 61):02d}:{rng.randint(0, 62):02d}",
+            f" {day}/{month}/{year} ",
+        ]
+    )
+
+
+class TestDateNormalizer:
+    """Test cases for DateNormalizer class."""
+
+    @pytest.mark.parametrize(
+        "date_str,expected",
+        [
+            ("15-03-2024", "2024-03-15"),
+            ("15/03/2024", "2024-03-15"),
+            ("15-Mar-24", "2024-03-15"),
+            ("15/03/24", "2024-03-15"),
+            ("15/03/70", "1970-03-15"),
+            ("15/03/2024 10:20:30", "2024-03-15"),
+            ("5/3/2024", "2024-03-05"),
+        ],
+    )
+    def test_supported_formats(self, date_str, expected):
+        """Test each supported format, including a non fixed-width one."""
+        assert DateNormalizer().normalize(date_str) == expected
+
+    def test_unsupported_format_message(self):
+        """Test that unsupported dates raise the original error."""
+        normalizer = DateNormalizer()
+        for date_str in ("invalid-date", "31/02/2024", " 2024-03-15 "):
+            with pytest.raises(ValueError, match=f"^Unsupported date format: {date_str}$"):
+                normalizer.normalize(date_str)
+
+    def test_format_is_pinned(self):
+        """Test that the first matching format is pinned until reset."""
+        normalizer = DateNormalizer()
+        normalizer.normalize("15/03/24")
+        assert normalizer.pinned == "%d/%m/%y"
+        normalizer.reset()
+        assert normalizer.pinned is None
+
+    def test_matches_strptime_loop(self):
+        """Test that results agree with the strptime loop on random input."""
+        rng = random.Random(5)
+        normalizer = DateNormalizer(cache_size=64)
+        for i in range(5000):
+            if i % 500 == 0:
+                normalizer.reset()
+            date_str = random_date(rng)
+            try:
+                expected = reference(date_str)
+            except ValueError as e:
+                with pytest.raises(ValueError, match=str(e)):
+                    normalizer.normalize(date_str)
+            else:
+                assert normalizer.normalize(date_str) == expected
@@ -0,0 +1,43 @@
+"""Tests for the persistent deduplication index."""
+from parser.dedup import DedupIndex
+from parser.record import Transaction
+
+
+def transactions(*descriptions, occurrence=0):
+    """Build one record per description."""
+    return [
+        Transaction(738960, description, 100.0, 0.0, "Hdfc", "food", "expense", occurrence)
+        for description in descriptions
+    ]
+
+
+class TestDedupIndex:
+    """Test cases for DedupIndex class."""
+
+    def test_drops_across_sources(self, tmp_path):
+        """Test that transactions owned by another statement are dropped."""
+        index = DedupIndex(tmp_path)
+        assert len(list(index.filter(transactions("A", "B"), "mar.csv"))) == 2
+        kept = list(index.filter(transactions("A", "B", "C"), "q1.csv"))
+        assert [tx.description for tx in kept] == ["C"]
+        assert index.dropped == {"q1.csv": 2}
+
+    def test_repeats_within_a_statement_are_kept(self, tmp_path):
+        """Test that a statement never drops its own transactions."""
+        index = DedupIndex(tmp_path)
+        assert len(list(index.filter(transactions("A", "A"), "mar.csv"))) == 2
+        index.forget("mar.csv")
+        assert len(list(index.filter(transactions("A"), "mar.csv"))) == 1
+        assert len(list(index.filter(transactions("A", occurrence=1), "q1.csv"))) == 1
+
+    def test_persists_across_runs(self, tmp_path):
+        """Test that a saved index drops duplicates in the next run."""
+        index = DedupIndex(tmp_path)
+        list(index.filter(transactions("A"), "mar.csv"))
+        index.save()
+
+        index = DedupIndex(tmp_path)
+        assert not list(index.filter(transactions("A"), "q1.csv"))
+        index.forget("mar.csv")
+        index.forget("q1.csv")
+        assert len(list(index.filter(transactions("A"), "q1.csv"))) == 1
@@ -0,0 +1,54 @@
+"""Tests for transaction fingerprints."""
+from parser.fingerprint import OccurrenceCounter, fingerprint, normalize_description
+from parser.record import Transaction
+
+
+class TestFingerprint:
+    """Test cases for fingerprint and OccurrenceCounter."""
+
+    def test_normalized_description(self):
+        """Test that case and spacing do not change the fingerprint."""
+        assert normalize_description("  UPI-Swiggy   412345 ") == "upi-swiggy 412345"
+        assert fingerprint("Hdfc", 738960, 250.0, 0.0, "UPI-SWIGGY  1") == fingerprint(
+            "Hdfc", 738960, 250.0, 0.0, "upi-swiggy 1"
+        )
+
+    def test_fields_and_occurrence(self):
+        """Test that every field and the occurrence are part of the fingerprint."""
+        base = ("Hdfc", 738960, 250.0, 0.0, "SWIGGY")
+        variants = [
+            ("Icici", 738960, 250.0, 0.0, "SWIGGY"),
+            ("Hdfc", 738961, 250.0, 0.0, "SWIGGY"),
+            ("Hdfc", 738960, 25.0, 0.0, "SWIGGY"),
+            ("Hdfc", 738960, 250.0, 1.0, "SWIGGY"),
+            ("Hdfc", 738960, 250.0, 0.0, "ZOMATO"),
+        ]
+        fingerprints = {fingerprint(*base), fingerprint(*base, 1)}
+        fingerprints.update(fingerprint(*variant) for variant in variants)
+        assert len(fingerprints) == 7
+        assert len(fingerprint(*base)) == 32
+
+    def test_record_fingerprint(self):
+        """Test that records expose the fingerprint of their fields."""
+        record = Transaction(738960, "SWIGGY", 250.0, 0.0, "Hdfc", "food", "expense", 1)
+        assert record.fingerprint == fingerprint(
+            "Hdfc", 738960, 250.0, 0.0, "SWIGGY", 1
+        )
+
+    def test_occurrence_counter(self):
+        """Test that repeats are numbered per date."""
+        counter = OccurrenceCounter()
+        assert [counter.next(1, "coffee") for _ in range(3)] == [0, 1, 2]
+        assert counter.next(2, "coffee") == 0
+        counter.reset()
+        assert counter.next(2, "coffee") == 0
+
+    def test_interleaved_dates(self):
+        """Test that repeats are numbered alike whatever the row order."""
+        rows = [(1, "coffee"), (2, "coffee"), (1, "coffee"), (2, "tea"), (1, "coffee")]
+        counter = OccurrenceCounter()
+        interleaved = {(row, counter.next(*row)) for row in rows}
+        counter.reset()
+        grouped = {(row, counter.next(*row)) for row in sorted(rows)}
+        assert interleaved == grouped
+        assert ((1, "coffee"), 2) in interleaved
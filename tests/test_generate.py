@@ -0,0 +1,25 @@
+"""Tests for the synthetic statement generator used by the benchmarks."""
+
+import pytest
+from cli import PARSERS
+
+from benchmarks.generate import LAYOUTS, write_statement
+
+
+@pytest.mark.parametrize("bank", sorted(LAYOUTS))
+def test_generated_statement_parses(bank, tmp_path, monkeypatch):
+    """Test that every generated layout parses with its bank's parser."""
+    monkeypatch.chdir(tmp_path)
+    path = write_statement(bank, tmp_path / f"{bank}_bench.csv", 50)
+
+    parser = PARSERS[bank]()
+    rows = [
+        row
+        for row in parser.read_csv(str(path), LAYOUTS[bank][0])
+        if len(row) == parser.tx_row_col_count
+    ]
+    transactions = [parser.parse(row) for row in rows]
+
+    assert len(transactions) == 50
+    assert all(t["dr_amount"] > 0 or t["cr_amount"] > 0 for t in transactions)
+    assert transactions[0]["date"] == "2015-01-01"
@@ -0,0 +1,140 @@
+"""Tests for memory-mapped statement reading and bank detection."""
+import codecs
+from parser import ingest
+from parser.ingest import MappedStatement, route, sniff, sniff_encoding
+from pathlib import Path
+
+import pytest
+from cli import PARSERS
+
+from benchmarks.generate import LAYOUTS, write_statement
+from tests.test_cli import HDFC_STATEMENT
+
+
+@pytest.fixture(name="statement_dir")
+def fixture_statement_dir(tmp_path, monkeypatch):
+    """Create an empty statement directory and construct parsers in it."""
+    monkeypatch.chdir(tmp_path)
+    statement_dir = tmp_path / "data" / "statement"
+    statement_dir.mkdir(parents=True)
+    return statement_dir
+
+
+class TestSniff:
+    """Test cases for sniffing encodings and headers."""
+
+    @pytest.mark.parametrize(
+        "data, encoding",
+        [
+            (b"Date,Narration\n", "utf-8"),
+            (codecs.BOM_UTF8 + b"Date\n", "utf-8-sig"),
+            ("Date,Café\n".encode("utf-16"), "utf-16"),
+            ("Date\n".encode("utf-16-le"), "utf-16-le"),
+            ("CAFÉ,12\n".encode("cp1252"), "cp1252"),
+            (b"\x81\x8d\n", "latin-1"),
+            ("UPI-CAFÉ".encode("utf-8")[:-1], "utf-8"),
+        ],
+    )
+    def test_encoding(self, data, encoding):
+        """Test that encodings are recognized from a sample."""
+        assert sniff_encoding(data) == encoding
+
+    @pytest.mark.parametrize("bank", sorted(LAYOUTS))
+    def test_generated_headers(self, bank, tmp_path):
+        """Test that every bank is recognized from its header and delimiter."""
+        path = write_statement(bank, tmp_path / "statement.csv", 5)
+        sniffed = sniff(path.read_bytes())
+        assert (sniffed.bank, sniffed.delimiter) == (bank, LAYOUTS[bank][0])
+
+    def test_header_after_preamble(self):
+        """Test that a header below a few lines of account details is found."""
+        sample = b"Account,XXXX1234\nPeriod,March\n" + HDFC_STATEMENT.encode("utf-8")
+        assert sniff(sample).bank == "hdfc"
+
+    def test_unknown(self):
+        """Test that files without a known header have no bank or delimiter."""
+        assert sniff(b"Date,Narration\n01/03/24,SWIGGY\n")[1:] == (None, None)
+
+
+class TestRoute:
+    """Test cases for routing statement files to banks."""
+
+    def test_header_before_prefix(self, statement_dir):
+        """Test that the header decides, whatever the file name."""
+        prefixes = {"hdfc": "hdfc_", "icici": "icici_"}
+        path = statement_dir / "hdfc_export.csv"
+        path.write_text("DATE,MODE,PARTICULARS,DEPOSITS,WITHDRAWALS,BALANCE\n")
+        assert route(path, prefixes) == "icici"
+        assert route(path, {"hdfc": "hdfc_"}) is None
+
+    def test_prefix_fallback(self, statement_dir):
+        """Test that files without a known header go by their name."""
+        path = statement_dir / "cc_hdfc_mar.csv"
+        path.write_text("Date\n")
+        assert route(path, {"hdfc": "hdfc_", "cc_hdfc": "cc_hdfc_"}) == "cc_hdfc"
+        assert route(Path("missing.csv"), {"hdfc": "hdfc_"}) is None
+
+    def test_find_files(self, statement_dir):
+        """Test that parsers find statements with generic names by their header."""
+        (statement_dir / "Statement (3).csv").write_text(HDFC_STATEMENT, encoding="utf-8")
+        (statement_dir / "hdfc_old.csv").write_text("Date\n", encoding="utf-8")
+        (statement_dir / "icici_mar.csv").write_text(HDFC_STATEMENT, encoding="utf-8")
+        assert [path.name for path in PARSERS["hdfc"]().files] == [
+            "Statement (3).csv",
+            "hdfc_old.csv",
+            "icici_mar.csv",
+        ]
+        assert not PARSERS["icici"]().files
+
+
+class TestMappedStatement:
+    """Test cases for reading statements in decoded blocks."""
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "cp1252", "utf-16"])
+    @pytest.mark.parametrize("size", [1, 7, 1 << 20])
+    def test_lines_match_text_mode(self, tmp_path, encoding, size):
+        """Test that lines equal those of a text-mode file, for any block size."""
+        path = tmp_path / "statement.csv"
+        text = 'Date,Narration\r\n01/03/24,"CAFÉ\r\nHOODI"\r\n02/03/24,OLD MAC\rLAST'
+        path.write_bytes(text.encode(encoding))
+        with open(path, "r", encoding=encoding) as f:
+            expected = list(f)
+        with MappedStatement(path) as statement:
+            lines = [line for block in statement.blocks(size) for line in block]
+        assert lines == expected
+
+    @pytest.mark.parametrize("size", [1, 3, 1 << 20])
+    def test_carriage_return_before_crlf(self, tmp_path, size):
+        """Test that a lone \\r before \\r\\n ends a line of its own."""
+        assert ingest.split_lines("a\r\r\nb") == ["a\n", "\n", "b"]
+        path = tmp_path / "statement.csv"
+        path.write_bytes(b"A,B\r\r\nC\r\r\r\nD\n")
+        with open(path, "r", encoding="utf-8") as f:
+            expected = list(f)
+        with MappedStatement(path) as statement:
+            lines = [line for block in statement.blocks(size) for line in block]
+        assert lines == expected
+
+    def test_other_line_breaks_are_kept(self, tmp_path):
+        """Test that characters str.splitlines splits on stay inside lines."""
+        path = tmp_path / "statement.csv"
+        path.write_text("A\x0cB C\nD\n", encoding="utf-8")
+        assert list(MappedStatement(path)) == ["A\x0cB C\n", "D\n"]
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file has no lines."""
+        path = tmp_path / "empty.csv"
+        path.write_bytes(b"")
+        with MappedStatement(path) as statement:
+            assert not list(statement)
+            assert statement.encoding == "utf-8"
+
+    def test_cp1252_statement_parses(self, statement_dir, monkeypatch):
+        """Test that a cp1252 statement with a generic name parses end to end."""
+        monkeypatch.setattr(ingest, "BLOCK_BYTES", 64)
+        path = statement_dir / "download.csv"
+        path.write_bytes(HDFC_STATEMENT.replace("DMART", "DMÅRT").encode("cp1252"))
+        parser = PARSERS["hdfc"]()
+        transactions = list(parser.iter_transactions(parser.files[0]))
+        assert [t["description"] for t in transactions][-1] == "POS DMÅRT HOODI"
+        assert transactions[1]["cr_amount"] == 50000.0
@@ -0,0 +1,104 @@
+"""Tests for parsers compiled from declarative bank layouts."""
+import pickle
+from parser.banks import LAYOUTS
+from parser.base import BaseParser
+from parser.layout import Layout, layout_parser
+
+import pytest
+from cli import PARSERS
+
+from tests.test_batch import generated_rows
+
+
+@pytest.fixture(name="parsers")
+def fixture_parsers(tmp_path, monkeypatch):
+    """Construct parsers in an empty working directory."""
+    monkeypatch.chdir(tmp_path)
+    return PARSERS
+
+
+class TestLayoutParsers:
+    """Test cases for the generated parser classes."""
+
+    @pytest.mark.parametrize("bank", ["hdfc", "icici", "sbi", "axis"])
+    def test_matches_generic_parse(self, bank, parsers):
+        """Test that compiled parsing equals the generic BaseParser.parse."""
+        parser = parsers[bank]()
+        rows = generated_rows(bank, 200)
+        compiled = [parser.parse(row).to_dict() for row in rows]
+        parser.occurrences.reset()
+        assert [BaseParser.parse(parser, row).to_dict() for row in rows] == compiled
+
+    def test_skipped_rows(self, parsers):
+        """Test that header repeats and incomplete rows are not transactions."""
+        sbi = parsers["sbi"]()
+        assert not sbi.is_transaction(["Txn Date", "", "", "", "", "", ""])
+        assert not sbi.is_transaction(["1-Jan-24", "", "X", "", "1", "", " "])
+        assert sbi.is_transaction(["1-Jan-24", "", "X", "", "1", "", "9"])
+        cc_hdfc = parsers["cc_hdfc"]()
+        assert not cc_hdfc.is_transaction(["399~", "", "", "", "", "", ""])
+
+    def test_credit_rule(self, parsers):
+        """Test that single-amount layouts split debits and credits."""
+        parser = parsers["cc_icici"]()
+        rows = [
+            ["01/03/2024", "1", "SWIGGY", "0", "", "450.00", ""],
+            ["02/03/2024", "2", "PAYMENT RECEIVED", "0", "", "1,200.50", "CR"],
+        ]
+        debit, credit = [parser.parse(row) for row in rows]
+        assert (debit["dr_amount"], debit["cr_amount"], debit["type"]) == (
+            450.0,
+            0.0,
+            "expense",
+        )
+        assert (credit["dr_amount"], credit["cr_amount"], credit["type"]) == (
+            0.0,
+            1200.5,
+            "deposit",
+        )
+        assert parser.parse_batch(rows) == parser.parse_rows(rows)
+
+    def test_pipe_delimited_statement(self, parsers, tmp_path):
+        """Test that HDFC card statements are read with their own delimiter."""
+        path = tmp_path / "cc_hdfc_mar.csv"
+        path.write_text(
+            "Transaction type~|~Name~|~DATE~|~Description~|~AMT~|~Debit /Credit~|~Coins*\n"
+            "Domestic~|~A~|~01/03/2024 10:00:00~|~SWIGGY~|~ 450.00~|~~|~4\n"
+            "Domestic~|~A~|~02/03/2024 11:30:00~|~PAYMENT~|~ 1,000.00~|~Cr~|~0\n",
+            encoding="utf-8",
+        )
+        transactions = list(parsers["cc_hdfc"]().iter_transactions(path))
+        assert [(t["date"], t["dr_amount"], t["cr_amount"]) for t in transactions] == [
+            ("2024-03-01", 450.0, 0.0),
+            ("2024-03-02", 0.0, 1000.0),
+        ]
+
+    def test_classes_pickle(self):
+        """Test that generated classes can be sent to worker processes."""
+        assert pickle.loads(pickle.dumps(PARSERS["cc_hdfc"])) is PARSERS["cc_hdfc"]
+
+
+class TestLayout:
+    """Test cases for layout validation and new banks."""
+
+    def test_new_bank(self, parsers):
+        """Test that a bank needs only a layout."""
+        spec = dict(LAYOUTS["axis"], account="Kotak", prefix="kotak_")
+        parser = layout_parser("kotak", spec)()
+        row = ["05-03-2024", "", "UPI/ZEPTO/3", "99.00", "", "1.00", "1"]
+        assert parser.parse(row)["account"] == "Kotak"
+        assert parsers["axis"]() is not parser
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"colour": "red"},
+            {"columns": {"date": 0, "description": 1, "dr_amount": 2}},
+            {"columns": {"date": 0, "description": 1, "dr_amount": 2, "cr_amount": 9}},
+            {"required": (7,)},
+        ],
+    )
+    def test_invalid(self, change):
+        """Test that malformed layouts are rejected."""
+        with pytest.raises(ValueError):
+            Layout(dict(LAYOUTS["hdfc"], **change))
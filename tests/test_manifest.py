@@ -0,0 +1,61 @@
+"""Tests for the incremental parsing manifest."""
+import os
+from parser.manifest import PARSE, RECATEGORIZE, SKIP, Manifest
+
+
+class TestManifest:
+    """Test cases for Manifest class."""
+
+    def _setup(self, tmp_path):
+        """Create a statement, its output and an empty manifest."""
+        statement = tmp_path / "hdfc_mar.csv"
+        statement.write_text("Date,Narration\n01/03/24,SWIGGY\n", encoding="utf-8")
+        output = tmp_path / "hdfc_mar.json"
+        output.write_text("[]", encoding="utf-8")
+        return statement, output, Manifest(tmp_path)
+
+    def test_new_file_is_parsed(self, tmp_path):
+        """Test that files missing from the manifest are parsed."""
+        statement, output, manifest = self._setup(tmp_path)
+        action, _ = manifest.plan(statement, output, "HdfcParser/1", "m1")
+        assert action == PARSE
+
+    def test_recorded_file_is_skipped(self, tmp_path):
+        """Test that unchanged files are skipped, even after a touch."""
+        statement, output, manifest = self._setup(tmp_path)
+        _, source = manifest.plan(statement, output, "HdfcParser/1", "m1")
+        manifest.record(output, source, "HdfcParser/1", "m1")
+        manifest.save()
+
+        manifest = Manifest(tmp_path)
+        assert manifest.plan(statement, output, "HdfcParser/1", "m1")[0] == SKIP
+        os.utime(statement, ns=(0, 0))
+        assert manifest.plan(statement, output, "HdfcParser/1", "m1")[0] == SKIP
+
+    def test_changes_are_detected(self, tmp_path):
+        """Test content, parser, mapper and output changes."""
+        statement, output, manifest = self._setup(tmp_path)
+        _, source = manifest.plan(statement, output, "HdfcParser/1", "m1")
+        manifest.record(output, source, "HdfcParser/1", "m1")
+
+        assert manifest.plan(statement, output, "HdfcParser/1", "m2")[0] == RECATEGORIZE
+        assert manifest.plan(statement, output, "HdfcParser/2", "m1")[0] == PARSE
+        output.unlink()
+        assert manifest.plan(statement, output, "HdfcParser/1", "m1")[0] == PARSE
+        output.write_text("[]", encoding="utf-8")
+        statement.write_text("Date,Narration\n02/03/24,ZEPTO\n", encoding="utf-8")
+        assert manifest.plan(statement, output, "HdfcParser/1", "m1")[0] == PARSE
+
+    def test_outputs_are_judged_apart(self, tmp_path):
+        """Test that each output format of a statement keeps its own versions."""
+        statement, output, manifest = self._setup(tmp_path)
+        lines = tmp_path / "hdfc_mar.jsonl"
+        lines.write_text("", encoding="utf-8")
+        _, source = manifest.plan(statement, output, "HdfcParser/1", "m1")
+        manifest.record(output, source, "HdfcParser/1", "m1")
+        assert manifest.plan(statement, lines, "HdfcParser/1", "m2")[0] == PARSE
+        _, source = manifest.plan(statement, lines, "HdfcParser/1", "m2")
+        manifest.record(lines, source, "HdfcParser/1", "m2")
+
+        assert manifest.plan(statement, output, "HdfcParser/1", "m2")[0] == RECATEGORIZE
+        assert manifest.plan(statement, lines, "HdfcParser/1", "m2")[0] == SKIP
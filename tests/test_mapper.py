@@ -0,0 +1,79 @@
+"""Tests for the shared expense mapper registry."""
+import os
+import pickle
+from parser import mapper as mapper_module
+from parser.mapper import ExpenseMapper, expense_mapper
+
+import pytest
+
+
+@pytest.fixture(name="mapper_file")
+def fixture_mapper_file(tmp_path):
+    """Create an expense mapper file and a data directory for its cache."""
+    (tmp_path / "data").mkdir()
+    path = tmp_path / "expense_mapper.yaml"
+    path.write_text("food:\n- swiggy\n", encoding="utf-8")
+    return path
+
+
+def load(mapper_file):
+    """Return a mapper loaded as in a fresh process, caching under the test data directory."""
+    mapper_module._compiled.clear()  # pylint: disable=protected-access
+    return ExpenseMapper(mapper_file, mapper_file.parent / "data" / "cache").refresh()
+
+
+class TestExpenseMapper:
+    """Test cases for ExpenseMapper class."""
+
+    def test_load(self, mapper_file):
+        """Test that the mapping is loaded and compiled."""
+        mapper = load(mapper_file)
+        assert mapper.mapping == {"food": ["swiggy"]}
+        assert mapper.matcher.match("UPI-SWIGGY-1234") == "food"
+        assert mapper.version != "none"
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing mapper file leaves everything uncategorized."""
+        mapper = load(tmp_path / "expense_mapper.yaml")
+        assert mapper.version == "none"
+        assert mapper.matcher.match("UPI-SWIGGY-1234") == "uncategorized"
+
+    def test_reload_on_change(self, mapper_file):
+        """Test that refresh reloads only when the content changes."""
+        mapper = load(mapper_file)
+        matcher = mapper.matcher
+        os.utime(mapper_file, ns=(0, 0))
+        assert mapper.refresh().matcher is matcher
+
+        mapper_file.write_text("travel:\n- swiggy\n", encoding="utf-8")
+        assert mapper.refresh().matcher.match("UPI-SWIGGY-1234") == "travel"
+
+    def test_cache_skips_yaml(self, mapper_file, monkeypatch):
+        """Test that a fresh mapper loads the compiled matcher from the cache."""
+        load(mapper_file)
+        monkeypatch.setattr("yaml.safe_load", pytest.fail)
+        assert load(mapper_file).matcher.match("UPI-SWIGGY-1234") == "food"
+
+    def test_corrupt_cache_is_rebuilt(self, mapper_file):
+        """Test that an unreadable cache falls back to the YAML file."""
+        mapper = load(mapper_file)
+        mapper.cache_path.write_bytes(b"not a pickle")
+        assert load(mapper_file).mapping == {"food": ["swiggy"]}
+
+    def test_registry_is_shared(self, mapper_file, monkeypatch):
+        """Test that every caller in a process gets the same mapper."""
+        monkeypatch.chdir(mapper_file.parent)
+        assert expense_mapper() is expense_mapper(mapper_file)
+
+    def test_registry_is_per_cache_dir(self, mapper_file, tmp_path):
+        """Test that tenants with their own cache share the compiled matcher."""
+        mapper = expense_mapper(mapper_file)
+        other = expense_mapper(mapper_file, tmp_path / "other" / "cache")
+        assert other is not mapper
+        assert other.matcher is mapper.matcher
+        assert other.merchants is not mapper.merchants
+
+    def test_pickles_as_registry_entry(self, mapper_file):
+        """Test that a mapper sent to a worker is looked up, not copied."""
+        mapper = expense_mapper(mapper_file)
+        assert pickle.loads(pickle.dumps(mapper)) is mapper
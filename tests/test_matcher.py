@@ -0,0 +1,109 @@
+"""Tests for the compiled keyword matcher."""
+from parser.matcher import KeywordMatcher
+
+import pytest
+
+MAPPER = {
+    "grocery": ["more", "UPI-MUKESH SEERVE", "dmart"],
+    "shopping": ["amazon", "mart"],
+    "food": ["swiggy", "amazon fresh"],
+    "medical": ["care", "pharmacy"],
+}
+
+
+def nested_loop(expense_mapper, description):
+    """Reference implementation of the original categorization loop."""
+    ret_category = "uncategorized"
+    for category, keywords in expense_mapper.items():
+        for keyword in keywords:
+            if keyword.lower() in description.lower():
+                ret_category = category
+    return ret_category
+
+
+class TestKeywordMatcher:
+    """Test cases for KeywordMatcher class."""
+
+    def test_uncategorized(self):
+        """Test that unmatched descriptions are uncategorized."""
+        assert KeywordMatcher(MAPPER).match("Unknown transaction") == "uncategorized"
+
+    def test_last_category_wins(self):
+        """Test that the later category wins when several keywords match."""
+        matcher = KeywordMatcher(MAPPER)
+        assert matcher.match("POS DMART HOODI") == "shopping"
+        assert matcher.match("AMAZON FRESH ORDER") == "food"
+        assert matcher.match("SWIGGY HEALTHCARE") == "medical"
+
+    def test_matches_nested_loop(self):
+        """Test that the automaton agrees with the nested keyword loop."""
+        matcher = KeywordMatcher(MAPPER)
+        descriptions = [
+            "UPI-MUKESH SEERVE-paytm@okaxis-412345",
+            "upi-mukesh seer",
+            "MOREAMAZON",
+            "pharmac",
+            "smart care",
+            "",
+        ]
+        for description in descriptions:
+            assert matcher.match(description) == nested_loop(MAPPER, description)
+
+    def test_empty_mapper(self):
+        """Test matching against an empty mapping."""
+        assert KeywordMatcher({}).match("anything") == "uncategorized"
+
+
+class TestRules:
+    """Test cases for prefix, regex, exclusion and priority rules."""
+
+    def test_priority(self):
+        """Test that a higher priority beats a category defined later."""
+        matcher = KeywordMatcher(
+            {"food": {"keywords": ["amazon fresh"], "priority": 1}, "shopping": ["amazon"]}
+        )
+        assert matcher.match("AMAZON FRESH ORDER") == "food"
+        assert matcher.match("AMAZON ORDER") == "shopping"
+
+    def test_prefixes(self):
+        """Test that prefixes only match at the start of a description."""
+        matcher = KeywordMatcher({"atm": {"prefixes": ["ATW-"]}})
+        assert matcher.match("ATW-512345XXXXXX6789-BANGALORE") == "atm"
+        assert matcher.match("UPI-ATW-") == "uncategorized"
+
+    def test_exclude(self):
+        """Test that an exclusion word drops only its own category."""
+        matcher = KeywordMatcher(
+            {
+                "shopping": ["amazon"],
+                "food": {"keywords": ["amazon fresh"], "exclude": ["refund"]},
+            }
+        )
+        assert matcher.match("AMAZON FRESH") == "food"
+        assert matcher.match("AMAZON FRESH REFUND") == "shopping"
+
+    def test_regex(self):
+        """Test that regexes ignore case and follow the same precedence."""
+        matcher = KeywordMatcher(
+            {
+                "rent": {"regex": [r"^neft-\d+-landlord", "house rent"]},
+                "food": ["swiggy"],
+            }
+        )
+        assert matcher.match("NEFT-1234-LANDLORD") == "rent"
+        assert matcher.match("HOUSE RENT SWIGGY") == "food"
+        assert matcher.match("UPI-NEFT-1-LANDLORD") == "uncategorized"
+
+    @pytest.mark.parametrize(
+        "mapping",
+        [
+            {"food": {"keyword": ["swiggy"]}},
+            {"food": {"priority": "high"}},
+            {"food": {"regex": ["("]}},
+            {"food": {"exclude": [1]}},
+        ],
+    )
+    def test_invalid_rules(self, mapping):
+        """Test that malformed rules are rejected."""
+        with pytest.raises(ValueError):
+            KeywordMatcher(mapping)
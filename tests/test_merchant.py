@@ -0,0 +1,174 @@
+"""Tests for merchant extraction and the merchant category cache."""
+import random
+from parser.mapper import ExpenseMapper
+from parser.matcher import KeywordMatcher
+from parser.merchant import PLACEHOLDER, MerchantCache, MerchantNormalizer, pinned_keywords
+
+import pytest
+import yaml
+
+from benchmarks.generate import MERCHANTS
+
+ICICI_RULES = (r"(?<=/)\d{1,5}$",)
+
+
+@pytest.fixture(name="mapper_file")
+def fixture_mapper_file(tmp_path):
+    """Create an expense mapper with plain and noise-like keywords."""
+    (tmp_path / "data").mkdir()
+    path = tmp_path / "expense_mapper.yaml"
+    path.write_text(
+        "food:\n- swiggy\n- zepto\n"
+        "rent:\n- '330929174964'\n"
+        "loan:\n- XX1234\n"
+        "grocery:\n- mukesh seerve\n- dmart\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def load(mapper_file):
+    """Return a freshly loaded mapper caching under the test data directory."""
+    return ExpenseMapper(mapper_file, mapper_file.parent / "data" / "cache").refresh()
+
+
+class TestMerchantNormalizer:
+    """Test cases for MerchantNormalizer class."""
+
+    @pytest.mark.parametrize(
+        "description, merchant",
+        [
+            (
+                "UPI-MUKESH SEERVE-paytmqr28100505@paytm-412345678901",
+                "UPI-MUKESH SEERVE-paytmqr28100505@paytm-#",
+            ),
+            ("POS 4591XXXXXXXX1234 DMART HOODI", "POS # DMART HOODI"),
+            ("ATW-512345XXXXXX6789-S1ANBG23-BANGALORE", "ATW-#-S1ANBG23-BANGALORE"),
+            ("IMPS 01/03/24 10:15:00 RAVI", "IMPS # # RAVI"),
+            ("ONE97 COMMUNICATIONS", "ONE97 COMMUNICATIONS"),
+        ],
+    )
+    def test_normalize(self, description, merchant):
+        """Test that per-transaction noise is replaced and the merchant kept.
+
+        ``#`` in ``merchant`` stands for the placeholder.
+        """
+        merchant = merchant.replace("#", PLACEHOLDER)
+        assert MerchantNormalizer().normalize(description) == merchant
+
+    def test_bank_rules(self):
+        """Test that bank-specific rules extend the common ones."""
+        assert MerchantNormalizer(ICICI_RULES).normalize("UPI/SWIGGY/17") == (
+            f"UPI/SWIGGY/{PLACEHOLDER}"
+        )
+        assert MerchantNormalizer().normalize("UPI/SWIGGY/17") == "UPI/SWIGGY/17"
+
+
+class TestPinnedKeywords:
+    """Test cases for pinned_keywords."""
+
+    def test_pinned(self):
+        """Test that only keywords noise could affect are pinned."""
+        pinned = pinned_keywords(
+            ["swiggy", "330929174964", "XX20238", "UPI-XYZ", "UPI-X", "One97", "fedex"]
+        )
+        assert pinned.pattern == "330929174964|one97|upi\\-x|xx20238"
+        assert pinned_keywords(["swiggy"]) is None
+        assert pinned_keywords(["swiggy", f"chq {PLACEHOLDER}"]).search("swiggy")
+
+
+class TestCategorize:
+    """Test cases for ExpenseMapper.categorize."""
+
+    def test_matches_full_description(self, mapper_file):
+        """Test that cached categories equal matching every raw description."""
+        mapper = load(mapper_file)
+        normalizer = MerchantNormalizer(ICICI_RULES)
+        rng = random.Random(3)
+        noise = ["330929174964", "412345678901", "4375XXXXXXXX1234", "XX1234", "01/03/24"]
+        for _ in range(2000):
+            description = "-".join(
+                rng.sample(MERCHANTS, 2) + rng.sample(noise, 2) + [str(rng.randint(1, 99))]
+            )
+            category = mapper.categorize(description, normalizer)
+            assert category == mapper.matcher.match(description), description
+        assert 0 < len(mapper.merchants.entries) < 2000
+
+    def test_repo_mapper(self):
+        """Test the shipped expense_mapper.yaml against generated descriptions."""
+        with open("expense_mapper.yaml", "r", encoding="utf-8") as f:
+            mapping = yaml.safe_load(f)
+        matcher = KeywordMatcher(mapping)
+        pinned = pinned_keywords(matcher.literals)
+        normalizer = MerchantNormalizer()
+        keywords = [keyword for keywords in mapping.values() for keyword in keywords]
+        rng = random.Random(5)
+        for _ in range(2000):
+            description = (
+                f"UPI-{rng.choice(keywords)}-{rng.choice(MERCHANTS)}-"
+                f"{rng.randint(10**11, 10**12 - 1)}"
+            )
+            if pinned.search(description.lower()):
+                continue
+            merchant = normalizer.normalize(description)
+            assert matcher.match(merchant) == matcher.match(description), description
+
+    def test_rules(self, mapper_file):
+        """Test that prefixes, exclusions and regexes agree with full matching."""
+        mapper_file.write_text(
+            "food:\n  keywords: [swiggy]\n  exclude: [refund]\n"
+            "rent:\n  prefixes: [NEFT-]\n  regex: ['-\\d{3}-RENT$']\n",
+            encoding="utf-8",
+        )
+        mapper = load(mapper_file)
+        normalizer = MerchantNormalizer()
+        for description, category in [
+            ("UPI-SWIGGY-412345678901", "food"),
+            ("UPI-SWIGGY REFUND-412345678901", "uncategorized"),
+            ("NEFT-SWIGGY-412345678901", "rent"),
+            ("UPI-NEFT-SWIGGY-412345678901", "food"),
+            ("UPI-412345678901-123-RENT", "rent"),
+            ("UPI-SWIGGY-1234-RENT", "food"),
+        ]:
+            assert mapper.categorize(description, normalizer) == category, description
+            assert mapper.matcher.match(description) == category, description
+
+    def test_keyword_with_hash(self, mapper_file):
+        """Test that a keyword containing ``#`` does not match the placeholder."""
+        mapper_file.write_text("cheque:\n- 'chq #'\n", encoding="utf-8")
+        mapper = load(mapper_file)
+        normalizer = MerchantNormalizer()
+        assert mapper.categorize("CHQ 00012345 DEPOSIT", normalizer) == "uncategorized"
+        assert mapper.categorize("CHQ #00012345 DEPOSIT", normalizer) == "cheque"
+
+    def test_cache_is_saved_per_version(self, mapper_file):
+        """Test that the merchant cache persists until the mapper changes."""
+        mapper = load(mapper_file)
+        normalizer = MerchantNormalizer()
+        assert mapper.categorize("UPI-SWIGGY-412345678901", normalizer) == "food"
+        mapper.save_merchants()
+        assert load(mapper_file).merchants.entries == {f"UPI-SWIGGY-{PLACEHOLDER}": [0, 0]}
+
+        mapper_file.write_text("travel:\n- swiggy\n", encoding="utf-8")
+        mapper = load(mapper_file)
+        assert not mapper.merchants.entries
+        assert mapper.categorize("UPI-SWIGGY-412345678902", normalizer) == "travel"
+
+
+class TestMerchantCache:
+    """Test cases for MerchantCache class."""
+
+    def test_bounded(self, tmp_path):
+        """Test that the oldest merchants are evicted beyond maxsize."""
+        cache = MerchantCache("v1", maxsize=2)
+        for merchant in ("a", "b", "c"):
+            cache.put(merchant, "food")
+        assert list(cache.entries) == ["b", "c"]
+
+        cache.save(tmp_path / "merchants.json")
+        smaller = MerchantCache("v1", maxsize=1)
+        smaller.load(tmp_path / "merchants.json")
+        assert smaller.entries == {"c": "food"}
+        other = MerchantCache("v2")
+        other.load(tmp_path / "merchants.json")
+        assert not other.entries
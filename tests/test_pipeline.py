@@ -0,0 +1,84 @@
+"""Tests for the read/parse/write pipeline."""
+import logging
+from parser import pipeline
+from parser.manifest import PARSE
+from functools import partial
+from parser.runner import TASK_OPTIONS, Runner, run_task
+
+import pytest
+from cli import PARSERS
+
+from tests.test_cli import HDFC_STATEMENT
+
+
+@pytest.fixture(name="workdir")
+def fixture_workdir(tmp_path, monkeypatch):
+    """Create a data directory with a few HDFC statements of different sizes."""
+    monkeypatch.chdir(tmp_path)
+    statement_dir = tmp_path / "data" / "statement"
+    statement_dir.mkdir(parents=True)
+    (tmp_path / "data" / "json").mkdir()
+    header, *rows = HDFC_STATEMENT.splitlines(keepends=True)
+    for month, repeat in (("jan", 1), ("feb", 40), ("mar", 7)):
+        (statement_dir / f"hdfc_{month}.csv").write_text(
+            header + "".join(rows) * repeat, encoding="utf-8"
+        )
+    return tmp_path
+
+
+def outputs(workdir, suffix="json"):
+    """Return the text of every output file."""
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in (workdir / "data" / "json").glob(f"*.{suffix}")
+    }
+
+
+class TestPipeline:
+    """Test cases for the Pipeline class."""
+
+    @pytest.mark.parametrize("fmt", ["json", "jsonl"])
+    def test_output_matches_serial(self, workdir, monkeypatch, fmt):
+        """Test that pipelined outputs are identical to serial ones."""
+        parser = PARSERS["hdfc"]()
+        Runner(logging.getLogger("munim"), fmt=fmt).run([("hdfc", parser)])
+        serial = outputs(workdir, fmt)
+
+        # Tiny blocks and queues make every stage wait on the others.
+        monkeypatch.setattr(pipeline, "READ_BYTES", 1)
+        monkeypatch.setattr(pipeline, "WRITE_ROWS", 2)
+        for path in (workdir / "data" / "json").glob(f"*.{fmt}"):
+            path.unlink()
+        options = dict(TASK_OPTIONS, fmt=fmt)
+        tasks = [(parser, path, PARSE) for path in parser.files]
+        executor = pipeline.Pipeline(tasks, partial(run_task, options=options), depth=1)
+        counts = {path.name: executor.futures[path].result()[0] for _, path, _ in tasks}
+        executor.shutdown()
+
+        assert counts == {"hdfc_jan.csv": 3, "hdfc_feb.csv": 120, "hdfc_mar.csv": 21}
+        assert outputs(workdir, fmt) == serial
+        assert "open_statement" not in vars(parser)
+
+    def test_bad_file_fails_alone(self, workdir, caplog):
+        """Test that a failing file leaves no output and the others are written."""
+        bad = workdir / "data" / "statement" / "hdfc_bad.csv"
+        bad.write_text(HDFC_STATEMENT + "31/02/24,BROKEN,,1,,,\n", encoding="utf-8")
+        runner = Runner(logging.getLogger("munim"), pipeline=True)
+        parser = PARSERS["hdfc"]()
+
+        with caplog.at_level(logging.INFO, logger="munim"):
+            assert runner.run([("hdfc", parser)]) == 1
+        assert sorted(outputs(workdir)) == ["hdfc_feb.json", "hdfc_jan.json", "hdfc_mar.json"]
+        assert not list((workdir / "data" / "json").glob("*.tmp"))
+        processed = [r.message for r in caplog.records if r.message.startswith("Processing")]
+        assert processed == [f"Processing file: {path}" for path in parser.files]
+
+    def test_recategorize(self, workdir):
+        """Test that a mapper change re-categorizes outputs through the pipeline."""
+        runner = Runner(logging.getLogger("munim"), pipeline=True)
+        assert runner.run([("hdfc", PARSERS["hdfc"]())]) == 0
+        (workdir / "expense_mapper.yaml").write_text("food:\n- swiggy\n", encoding="utf-8")
+
+        runner = Runner(logging.getLogger("munim"), pipeline=True)
+        assert runner.run([("hdfc", PARSERS["hdfc"]())]) == 0
+        assert all('"category": "food"' in text for text in outputs(workdir).values())
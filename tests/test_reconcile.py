@@ -0,0 +1,150 @@
+"""Tests for pairing transfers across accounts."""
+import json
+import random
+from parser.reconcile import pair_transfers, reconcile_outputs
+
+
+def transaction(date, account, dr_amount=0.0, cr_amount=0.0):
+    """Return an output transaction with the fields reconciliation reads."""
+    return {
+        "date": date,
+        "description": "CARD PAYMENT",
+        "dr_amount": dr_amount,
+        "cr_amount": cr_amount,
+        "account": account,
+        "category": "cc_payment",
+        "type": "expense" if dr_amount > 0 else "deposit",
+    }
+
+
+def nested_loop(transactions, window):
+    """Reference pairing: every debit against every credit, in the same order."""
+    order = sorted(
+        (i for i, t in enumerate(transactions) if t["dr_amount"] > 0),
+        key=lambda i: (round(transactions[i]["dr_amount"] * 100), transactions[i]["date"], i),
+    )
+    credits = sorted(
+        (i for i, t in enumerate(transactions) if not t["dr_amount"] and t["cr_amount"] > 0),
+        key=lambda i: (transactions[i]["date"], i),
+    )
+    paired, pairs = set(), []
+    for debit in order:
+        d = transactions[debit]
+        if d["account"].endswith("-CC"):
+            continue
+        candidates = []
+        for credit in credits:
+            c = transactions[credit]
+            days = abs(int(d["date"][-2:]) - int(c["date"][-2:]))
+            if (
+                credit not in paired
+                and round(d["dr_amount"] * 100) == round(c["cr_amount"] * 100)
+                and days <= window
+                and d["account"] != c["account"]
+            ):
+                candidates.append((days, c["date"], credit))
+        if candidates:
+            credit = min(candidates)[2]
+            paired.add(credit)
+            pairs.append((debit, credit))
+    return sorted(pairs)
+
+
+class TestPairTransfers:
+    """Test cases for pair_transfers."""
+
+    def test_card_payment(self):
+        """Test that a debit pairs with a credit of the same amount elsewhere."""
+        transactions = [
+            transaction("2024-03-01", "Hdfc", dr_amount=15000.5),
+            transaction("2024-03-03", "Icici-CC", cr_amount=15000.5),
+            transaction("2024-03-03", "Icici-CC", dr_amount=15000.5),
+        ]
+        assert pair_transfers(transactions) == [(0, 1)]
+
+    def test_window_and_account(self):
+        """Test that credits too far away or on the same account are not paired."""
+        transactions = [
+            transaction("2024-03-01", "Hdfc", dr_amount=500.0),
+            transaction("2024-03-05", "Icici-CC", cr_amount=500.0),
+            transaction("2024-03-02", "Hdfc", cr_amount=500.0),
+        ]
+        assert not pair_transfers(transactions)
+        assert pair_transfers(transactions, window=4) == [(0, 1)]
+
+    def test_card_purchase_never_pairs(self):
+        """Test that a card purchase is not taken for a transfer to another account."""
+        transactions = [
+            transaction("2024-03-01", "Hdfc-CC", dr_amount=500.0),
+            transaction("2024-03-02", "Icici", cr_amount=500.0),
+        ]
+        assert not pair_transfers(transactions)
+
+    def test_nearest_credit(self):
+        """Test that a debit pairs with the nearest credit, not the earliest."""
+        transactions = [
+            transaction("2024-03-04", "Hdfc", dr_amount=100.0),
+            transaction("2024-03-01", "Sbi", cr_amount=100.0),
+            transaction("2024-03-05", "Icici-CC", cr_amount=100.0),
+        ]
+        assert pair_transfers(transactions) == [(0, 2)]
+
+    def test_each_credit_pairs_once(self):
+        """Test that repeated amounts pair one to one in date order."""
+        transactions = [
+            transaction("2024-03-01", "Hdfc", dr_amount=100.0),
+            transaction("2024-03-02", "Hdfc", dr_amount=100.0),
+            transaction("2024-03-02", "Sbi", cr_amount=100.0),
+            transaction("2024-03-03", "Sbi", cr_amount=100.0),
+            transaction("2024-03-04", "Sbi", cr_amount=100.0),
+        ]
+        assert sorted(pair_transfers(transactions)) == [(0, 2), (1, 3)]
+
+    def test_matches_nested_loop(self):
+        """Test that the sort-merge join pairs like comparing every pair."""
+        rng = random.Random(11)
+        accounts = ["Hdfc", "Icici", "Sbi", "Hdfc-CC", "Icici-CC", "Axis"]
+        transactions = []
+        for _ in range(400):
+            amount = rng.choice([100.0, 250.5, 999.99, 15000.0])
+            side = "dr_amount" if rng.random() < 0.5 else "cr_amount"
+            transactions.append(
+                transaction(
+                    f"2024-03-{rng.randint(1, 28):02}",
+                    rng.choice(accounts),
+                    **{side: amount},
+                )
+            )
+        assert sorted(pair_transfers(transactions)) == nested_loop(transactions, 3)
+
+
+class TestReconcileOutputs:
+    """Test cases for reconcile_outputs."""
+
+    def test_tags_and_untags(self, tmp_path):
+        """Test that pairs are tagged, and untagged once the counterpart is gone."""
+        savings = [
+            transaction("2024-03-01", "Hdfc", dr_amount=15000.5),
+            transaction("2024-03-02", "Hdfc", dr_amount=99.0),
+        ]
+        card = [transaction("2024-03-03", "Icici-CC", cr_amount=15000.5)]
+        (tmp_path / "hdfc_mar.json").write_text(json.dumps(savings), encoding="utf-8")
+        (tmp_path / "cc_icici_mar.jsonl").write_text(
+            json.dumps(card[0]) + "\n", encoding="utf-8"
+        )
+
+        assert reconcile_outputs(tmp_path) == 1
+        saved = json.loads((tmp_path / "hdfc_mar.json").read_text(encoding="utf-8"))
+        assert [t["type"] for t in saved] == ["transfer", "expense"]
+        assert dict(saved[0], type="expense") == savings[0]
+        line = (tmp_path / "cc_icici_mar.jsonl").read_text(encoding="utf-8")
+        assert json.loads(line)["type"] == "transfer"
+
+        mtime = (tmp_path / "hdfc_mar.json").stat().st_mtime_ns
+        assert reconcile_outputs(tmp_path) == 1
+        assert (tmp_path / "hdfc_mar.json").stat().st_mtime_ns == mtime
+
+        (tmp_path / "cc_icici_mar.jsonl").unlink()
+        assert reconcile_outputs(tmp_path) == 0
+        saved = json.loads((tmp_path / "hdfc_mar.json").read_text(encoding="utf-8"))
+        assert saved == savings
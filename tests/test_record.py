@@ -0,0 +1,46 @@
+"""Tests for compact transaction records."""
+import json
+from parser.record import Transaction
+
+import pytest
+
+TRANSACTION = {
+    "date": "2024-03-15",
+    "description": "UPI-SWIGGY-412345",
+    "dr_amount": 250.0,
+    "cr_amount": 0.0,
+    "account": "Hdfc",
+    "category": "food",
+    "type": "expense",
+}
+
+
+class TestTransaction:
+    """Test cases for Transaction class."""
+
+    def test_round_trip(self):
+        """Test that records serialize to exactly the JSON schema."""
+        record = Transaction.from_dict(TRANSACTION)
+        assert record.to_dict() == TRANSACTION
+        assert list(record.to_dict()) == list(TRANSACTION)
+        assert json.dumps(record.to_dict()) == json.dumps(TRANSACTION)
+        assert dict(record) == TRANSACTION
+        assert record == TRANSACTION
+
+    def test_compact_fields(self):
+        """Test that dates are ordinals and repeated strings are interned."""
+        first = Transaction.from_dict(TRANSACTION)
+        second = Transaction.from_dict(dict(TRANSACTION, category="".join(["fo", "od"])))
+        assert first.date_ordinal == 738960
+        assert first.category is second.category
+        assert not hasattr(first, "__dict__")
+
+    def test_item_access(self):
+        """Test dict-style reads and updates."""
+        record = Transaction.from_dict(TRANSACTION)
+        record["category"] = "grocery"
+        record["date"] = "2024-03-16"
+        assert record["category"] == "grocery"
+        assert record.date == "2024-03-16"
+        with pytest.raises(KeyError):
+            record["balance"]  # pylint: disable=pointless-statement
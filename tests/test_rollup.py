@@ -0,0 +1,147 @@
+"""Tests for incremental rollups."""
+import json
+import os
+from parser import rollup
+from parser.rollup import Rollups, rollup_transactions
+
+import pytest
+
+TRANSACTIONS = [
+    {
+        "date": "2024-03-01",
+        "description": "UPI-SWIGGY",
+        "dr_amount": 250.1,
+        "cr_amount": 0.0,
+        "account": "hdfc",
+        "category": "food",
+        "type": "expense",
+    },
+    {
+        "date": "2024-03-09",
+        "description": "UPI-SWIGGY",
+        "dr_amount": 100.2,
+        "cr_amount": 0.0,
+        "account": "hdfc",
+        "category": "food",
+        "type": "expense",
+    },
+    {
+        "date": "2024-04-02",
+        "description": "SALARY",
+        "dr_amount": 0.0,
+        "cr_amount": 50000.0,
+        "account": "hdfc",
+        "category": "income",
+        "type": "deposit",
+    },
+    {
+        "date": "2024-04-05",
+        "description": "DMART",
+        "dr_amount": 1200.5,
+        "cr_amount": 0.0,
+        "account": "icici",
+        "category": "grocery",
+        "type": "expense",
+    },
+]
+
+
+@pytest.fixture(name="json_dir")
+def fixture_json_dir(tmp_path):
+    """Create an output directory with two outputs."""
+    (tmp_path / "hdfc_mar.json").write_text(json.dumps(TRANSACTIONS[:3]), encoding="utf-8")
+    (tmp_path / "icici_apr.jsonl").write_text(
+        json.dumps(TRANSACTIONS[3]) + "\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+class TestRollups:
+    """Test cases for the Rollups class."""
+
+    def test_totals(self, json_dir):
+        """Test totals by month and category, with month ranges."""
+        rollups = Rollups(json_dir)
+        assert rollups.refresh() == 2
+        assert rollups.totals() == {
+            ("2024-03", "food"): [35030, 0, 2],
+            ("2024-04", "grocery"): [120050, 0, 1],
+            ("2024-04", "income"): [0, 5000000, 1],
+        }
+        assert rollups.totals(("account",), start="2024-04") == {
+            ("hdfc",): [0, 5000000, 1],
+            ("icici",): [120050, 0, 1],
+        }
+        assert rollups.totals(("category",), end="2024-03") == {("food",): [35030, 0, 2]}
+
+    def test_top_merchants_and_trend(self, json_dir):
+        """Test top merchants and a monthly trend."""
+        rollups = Rollups(json_dir)
+        rollups.refresh()
+        assert rollups.top_merchants(1) == [("DMART", 120050, 1)]
+        assert rollups.top_merchants(5, end="2024-03") == [("UPI-SWIGGY", 35030, 2)]
+        assert rollups.trend("food") == [("2024-03", 35030, 0)]
+        assert rollups.trend() == [("2024-03", 35030, 0), ("2024-04", 120050, 5000000)]
+
+    def test_merchant_categories(self, json_dir):
+        """Test per-merchant category totals across outputs."""
+        rollups = Rollups(json_dir)
+        rollups.refresh()
+        assert rollups.merchant_categories() == {
+            "UPI-SWIGGY": {"food": [35030, 2]},
+            "SALARY": {"income": [0, 1]},
+            "DMART": {"grocery": [120050, 1]},
+        }
+
+    def test_refresh_is_incremental(self, json_dir, monkeypatch):
+        """Test that only new or rewritten outputs are read again."""
+        Rollups(json_dir).refresh()
+        read = []
+        monkeypatch.setattr(
+            rollup, "read_transactions", lambda path: read.append(path.name) or []
+        )
+
+        rollups = Rollups(json_dir)
+        assert rollups.refresh() == 0
+        assert not read
+
+        output = json_dir / "icici_apr.jsonl"
+        output.write_text("", encoding="utf-8")
+        os.utime(output, ns=(0, 0))
+        assert rollups.refresh() == 1
+        assert read == ["icici_apr.jsonl"]
+        assert ("2024-04", "grocery") not in rollups.totals()
+
+        (json_dir / "hdfc_mar.json").unlink()
+        assert rollups.refresh() == 1
+        assert not rollups.cells and not rollups.merchants and not rollups.categories
+        assert Rollups(json_dir).totals() == {}
+
+    def test_newest_format_wins(self, json_dir):
+        """Test that a statement written in two formats is counted once."""
+        jsonl = json_dir / "hdfc_mar.jsonl"
+        jsonl.write_text(json.dumps(TRANSACTIONS[0]) + "\n", encoding="utf-8")
+        os.utime(json_dir / "hdfc_mar.json", ns=(0, 0))
+        rollups = Rollups(json_dir)
+        rollups.refresh()
+        assert rollups.totals(("category",))[("food",)] == [25010, 0, 1]
+
+    def test_corrupt_output_and_rollups(self, json_dir):
+        """Test that unreadable outputs and rollups are skipped with a warning."""
+        (json_dir / "broken.json").write_text("[{", encoding="utf-8")
+        (json_dir / rollup.ROLLUP_NAME).write_text("{", encoding="utf-8")
+        rollups = Rollups(json_dir)
+        assert rollups.refresh() == 2
+        assert "broken" not in rollups.sources
+
+    def test_amounts_sum_exactly(self):
+        """Test that amounts are summed in whole paise."""
+        totals = rollup_transactions(TRANSACTIONS[:2] * 1000)
+        assert totals["cells"]["2024-03\tfood\thdfc"] == [35030000, 0, 2000]
+
+    def test_transfers_are_left_out(self):
+        """Test that transactions tagged as transfers are not counted."""
+        transfer = dict(TRANSACTIONS[0], type="transfer")
+        totals = rollup_transactions([transfer, TRANSACTIONS[1]])
+        assert totals["cells"] == {"2024-03\tfood\thdfc": [10020, 0, 1]}
+        assert totals["merchants"] == {"2024-03\tUPI-SWIGGY": [10020, 1]}
@@ -0,0 +1,51 @@
+"""Tests for the CLI startup budget and the lazy parser registry."""
+from parser import batch
+from parser.registry import PARSERS, ParserRegistry
+from parser.writer import WRITERS
+
+from cli import ENGINES, FORMATS
+
+from benchmarks.startup import IMPORT_BUDGET_MS, LAZY_MODULES, import_times
+
+
+class TestStartup:
+    """Test cases for CLI startup cost."""
+
+    def test_heavy_modules_are_lazy(self):
+        """Test that importing cli loads no parser, YAML or storage modules."""
+        times = import_times()
+        assert [name for name in LAZY_MODULES if name in times] == []
+
+    def test_import_budget(self):
+        """Test that importing cli stays within the startup budget."""
+        best = min(import_times()["cli"][1] for _ in range(3))
+        assert best / 1000 < IMPORT_BUDGET_MS
+
+    def test_formats_match_writers(self):
+        """Test that the CLI's format choices match the available writers."""
+        assert FORMATS == tuple(WRITERS)
+
+    def test_engines_match_batch(self):
+        """Test that the CLI's engine choices match the parse engines."""
+        assert ENGINES == batch.ENGINES
+
+
+class TestParserRegistry:
+    """Test cases for ParserRegistry class."""
+
+    def test_lists_banks_without_importing(self):
+        """Test that listing banks does not import parser modules."""
+        registry = ParserRegistry({"demo": "parser.missing_module:Missing"})
+        assert list(registry) == ["demo"]
+        assert "demo" in registry
+
+    def test_resolves_classes(self):
+        """Test that every registered parser resolves to its class."""
+        for bank in PARSERS:
+            assert PARSERS[bank].__name__.lower().startswith(bank.replace("_", ""))
+
+    def test_register(self):
+        """Test that parsers can be registered after construction."""
+        registry = ParserRegistry({})
+        registry.register("hdfc", "parser.layout:HdfcParser")
+        assert registry["hdfc"] is PARSERS["hdfc"]
@@ -0,0 +1,61 @@
+"""Tests for the SQLite transaction store."""
+from parser.store import SqliteStore, open_store
+
+import pytest
+
+
+def make_transaction(date, description, dr_amount, category="food"):
+    """Build a normalized transaction dict."""
+    return {
+        "date": date,
+        "description": description,
+        "dr_amount": dr_amount,
+        "cr_amount": 0.0,
+        "account": "Hdfc",
+        "category": category,
+        "type": "expense",
+    }
+
+
+TRANSACTIONS = [
+    make_transaction("2024-03-01", "UPI-SWIGGY", 250.0),
+    make_transaction("2024-03-01", "UPI-SWIGGY", 250.0),
+    make_transaction("2024-04-02", "POS DMART", 1200.5, "grocery"),
+]
+
+
+class TestSqliteStore:
+    """Test cases for SqliteStore class."""
+
+    def test_upsert_is_idempotent(self, tmp_path):
+        """Test that re-storing a statement keeps repeats but adds no duplicates."""
+        with SqliteStore(str(tmp_path / "munim.db")) as store:
+            assert store.upsert(TRANSACTIONS, "hdfc_mar.csv") == 3
+            store.upsert(TRANSACTIONS, "hdfc_mar.csv")
+            count = store.connection.execute("SELECT COUNT(*) FROM transactions")
+            assert count.fetchone()[0] == 3
+
+    def test_upsert_updates_category(self, tmp_path):
+        """Test that re-categorized transactions are updated in place."""
+        with SqliteStore(str(tmp_path / "munim.db")) as store:
+            store.upsert(TRANSACTIONS[:1], "hdfc_mar.csv")
+            store.upsert([dict(TRANSACTIONS[0], category="travel")], "hdfc_mar.csv")
+            rows = store.connection.execute("SELECT category FROM transactions")
+            assert rows.fetchall() == [("travel",)]
+
+    def test_monthly_totals(self, tmp_path):
+        """Test monthly category totals with and without a date range."""
+        with SqliteStore(str(tmp_path / "munim.db"), batch_size=2) as store:
+            store.upsert(TRANSACTIONS, "hdfc_mar.csv")
+            assert store.monthly_totals() == [
+                ("2024-03", "food", 500.0, 0.0, 2),
+                ("2024-04", "grocery", 1200.5, 0.0, 1),
+            ]
+            assert store.monthly_totals(start="2024-04-01") == [
+                ("2024-04", "grocery", 1200.5, 0.0, 1)
+            ]
+
+    def test_open_store_rejects_unknown_scheme(self):
+        """Test that unsupported store specs raise ValueError."""
+        with pytest.raises(ValueError):
+            open_store("postgres://localhost/munim")
@@ -0,0 +1,94 @@
+"""Tests for the suggestion index over categorized merchants."""
+from parser import suggest
+from parser.suggest import SuggestionIndex, grams, suggestions, tokens
+
+import pytest
+
+HISTORY = {
+    "UPI-ZEPTO-#": {"grocery": 5},
+    "UPI-SWIGGY-#": {"food": 3},
+    "POS # DMART HOODI": {"grocery": 2, "shopping": 2},
+    "UPI-NEWSHOP-#": {"uncategorized": 4},
+}
+
+
+@pytest.fixture(name="index")
+def fixture_index():
+    """Index a small categorized history."""
+    return SuggestionIndex(HISTORY)
+
+
+class TestTokens:
+    """Test cases for splitting merchants into keywords and trigrams."""
+
+    def test_tokens(self):
+        """Test that placeholders, numbers and short words are not keywords."""
+        assert tokens("UPI-ZEPTO-#-123/BLR 42 X") == ["upi", "zepto", "blr"]
+
+    def test_grams(self):
+        """Test that trigrams mark the ends of a token."""
+        assert grams("zepto") == {" ze", "zep", "ept", "pto", "to "}
+
+
+class TestSuggestionIndex:
+    """Test cases for SuggestionIndex lookups."""
+
+    def test_uncategorized_are_not_indexed(self, index):
+        """Test that only categorized merchants are candidates."""
+        assert len(index) == 3
+        assert "UPI-NEWSHOP-#" not in index.merchants
+
+    def test_similar_merchant(self, index):
+        """Test that a new spelling gets its look-alike's category and a keyword."""
+        best = index.suggest("UPI-ZEPTOMART-#")[0]
+        assert (best.category, best.keyword, best.merchant) == (
+            "grocery",
+            "zeptomart",
+            "UPI-ZEPTO-#",
+        )
+        assert 0 < best.score < 1
+        assert index.suggest("UPI-ZEPTO-#")[0].score == 1
+
+    def test_categories_are_ranked_by_share(self, index):
+        """Test that a merchant's categories are scaled by their share."""
+        ranked = index.suggest("POS # DMART WHITEFIELD", count=5)
+        assert [s.category for s in ranked][:2] in (
+            ["grocery", "shopping"],
+            ["shopping", "grocery"],
+        )
+        assert ranked[0].score == ranked[1].score
+        assert all(s.keyword == "dmart" for s in ranked[:2])
+
+    def test_common_grams_are_skipped(self, monkeypatch):
+        """Test that trigrams found in too many merchants neither match nor cost."""
+        monkeypatch.setattr(suggest, "COMMON_POSTINGS", 1)
+        index = SuggestionIndex(HISTORY)
+        assert "upi" not in index.postings and " up" not in index.postings
+        assert not index.suggest("UPI-PHARMEASY-#")
+        assert index.suggest("UPI-SWIGGYIT-#")[0].category == "food"
+
+    def test_no_match(self, index):
+        """Test that an unrelated merchant gets no suggestion."""
+        assert not index.suggest("ATW-#-S1ANBG23")
+        assert not index.suggest("# 123")
+
+
+class TestSuggestions:
+    """Test cases for grouping uncategorized merchants."""
+
+    def test_variants_are_grouped(self):
+        """Test that merchants with the same words are reviewed once."""
+        merchants = {
+            "UPI-ZEPTO-#": {"grocery": [5000, 5]},
+            "ZEPTOMART/123": {"uncategorized": [10000, 1]},
+            "ZEPTOMART/456": {"uncategorized": [20000, 2]},
+            "UPI-NEWSHOP-#": {"uncategorized": [100, 1], "shopping": [50, 1]},
+        }
+        groups = suggestions(merchants)
+        assert [(g.merchant, g.count, g.debit, g.variants) for g in groups] == [
+            ("ZEPTOMART/456", 3, 30000, 2),
+            ("UPI-NEWSHOP-#", 1, 100, 1),
+        ]
+        assert groups[0].suggestions[0].category == "grocery"
+        assert groups[1].suggestions[0].category == "shopping"
+        assert len(suggestions(merchants, top=1)) == 1
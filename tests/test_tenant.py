@@ -0,0 +1,97 @@
+"""Tests for parsing many households from one process."""
+import json
+import pickle
+from parser.tenant import Tenant, parse_tenants
+
+import pytest
+from cli import PARSERS
+
+from tests.test_cli import HDFC_STATEMENT
+
+
+def make_tenant(root, mapper="food:\n- swiggy\n", months=("jan", "feb")):
+    """Create a tenant directory with HDFC statements and its own mapper."""
+    statement_dir = root / "data" / "statement"
+    statement_dir.mkdir(parents=True)
+    (root / "data" / "json").mkdir()
+    (root / "expense_mapper.yaml").write_text(mapper, encoding="utf-8")
+    for month in months:
+        (statement_dir / f"hdfc_{month}.csv").write_text(HDFC_STATEMENT, encoding="utf-8")
+    return Tenant(root)
+
+
+def categories(tenant):
+    """Return ``{output name: categories}`` for a tenant's outputs."""
+    return {
+        path.name: [t["category"] for t in json.loads(path.read_text(encoding="utf-8"))]
+        for path in sorted(tenant.output_dir.glob("*.json"))
+        if path.name != "manifest.json"
+    }
+
+
+class TestParsers:
+    """Test cases for independent parser instances."""
+
+    def test_instances_are_independent(self, tmp_path):
+        """Test that every construction gives a parser with its own directories."""
+        first = PARSERS["hdfc"](tmp_path / "a" / "in", tmp_path / "a" / "out")
+        second = PARSERS["hdfc"](tmp_path / "b" / "in", tmp_path / "b" / "out")
+        assert first is not second
+        assert first.json_path(tmp_path / "hdfc_jan.csv").parent == tmp_path / "a" / "out"
+        assert second.date_normalizer is not first.date_normalizer
+        assert second.occurrences is not first.occurrences
+
+    def test_parser_pickles_without_state(self, tmp_path):
+        """Test that a parser reaches a worker as a fresh instance."""
+        tenant = make_tenant(tmp_path / "asha")
+        _, parser = tenant.parsers(["hdfc"])[0]
+        list(parser.iter_transactions(parser.files[0]))
+        copy = pickle.loads(pickle.dumps(parser))
+        assert (copy.input_dir, copy.output_dir) == (parser.input_dir, parser.output_dir)
+        assert copy.mapper is parser.mapper
+        assert copy.files == parser.files
+
+
+class TestTenants:
+    """Test cases for parsing several tenants concurrently."""
+
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_tenants_parse_in_isolation(self, tmp_path, processes):
+        """Test that each tenant's outputs use only its statements and mapper."""
+        asha = make_tenant(tmp_path / "asha")
+        ravi = make_tenant(tmp_path / "ravi", "travel:\n- swiggy\n", months=("mar",))
+        assert parse_tenants([asha, ravi], jobs=2, processes=processes) == {
+            "asha": 0,
+            "ravi": 0,
+        }
+        assert categories(asha) == {
+            "hdfc_feb.json": ["food", "uncategorized", "uncategorized"],
+            "hdfc_jan.json": ["food", "uncategorized", "uncategorized"],
+        }
+        assert categories(ravi) == {
+            "hdfc_mar.json": ["travel", "uncategorized", "uncategorized"]
+        }
+        assert (ravi.cache_dir / "expense_mapper.pickle").exists()
+
+    def test_failures_are_per_tenant(self, tmp_path):
+        """Test that a broken statement only fails its own tenant."""
+        asha = make_tenant(tmp_path / "asha")
+        ravi = make_tenant(tmp_path / "ravi")
+        (ravi.input_dir / "hdfc_bad.csv").write_text(
+            HDFC_STATEMENT.replace("250.00", "abc"), encoding="utf-8"
+        )
+        assert parse_tenants([asha, ravi], banks=["hdfc"]) == {"asha": 0, "ravi": 1}
+
+    def test_equal_mappers_share_the_matcher(self, tmp_path):
+        """Test that tenants with the same mapper content compile it once."""
+        asha = make_tenant(tmp_path / "asha")
+        ravi = make_tenant(tmp_path / "ravi")
+        assert asha.mapper is not ravi.mapper
+        assert asha.mapper.matcher is ravi.mapper.matcher
+
+    def test_shared_mapper_file(self, tmp_path):
+        """Test that households can point at one mapper file."""
+        asha = make_tenant(tmp_path / "asha")
+        ravi = Tenant(tmp_path / "ravi", name="ravi", mapper_file=asha.mapper_file)
+        assert ravi.mapper.path == asha.mapper.path
+        assert ravi.parsers(["sbi"])[0][1].input_dir == tmp_path / "ravi" / "data" / "statement"
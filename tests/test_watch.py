@@ -0,0 +1,72 @@
+"""Tests for watch mode."""
+import logging
+import time
+from parser.runner import Runner
+from parser.watch import StatementWatcher, route, watch_statements
+from pathlib import Path
+
+import pytest
+from cli import PARSERS
+
+from tests.test_cli import HDFC_STATEMENT
+
+
+@pytest.fixture(name="workdir")
+def fixture_workdir(tmp_path, monkeypatch):
+    """Create empty statement and output directories."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "statement").mkdir(parents=True)
+    (tmp_path / "data" / "json").mkdir()
+    return tmp_path
+
+
+class TestStatementWatcher:
+    """Test cases for StatementWatcher class."""
+
+    def test_reports_settled_files(self, tmp_path):
+        """Test that a file is reported once it stops changing."""
+        watcher = StatementWatcher(tmp_path)
+        statement = tmp_path / "hdfc_mar.csv"
+        statement.write_text("Date\n", encoding="utf-8")
+        (tmp_path / "notes.txt").write_text("", encoding="utf-8")
+        assert not watcher.poll()
+        assert watcher.poll() == [statement]
+        assert not watcher.poll()
+
+        statement.write_text("Date\n01/03/24\n", encoding="utf-8")
+        assert not watcher.poll()
+        assert watcher.poll() == [statement]
+
+        watcher.rescan()
+        assert watcher.poll() == [statement]
+
+    def test_route_longest_prefix(self):
+        """Test that files go to the parser with the longest matching prefix."""
+        parsers = {bank: PARSERS[bank]() for bank in ("hdfc", "cc_hdfc")}
+        assert route(parsers, Path("cc_hdfc_mar.csv"))[0] == "cc_hdfc"
+        assert route(parsers, Path("hdfc_mar.csv"))[0] == "hdfc"
+        assert route(parsers, Path("sbi_mar.csv")) is None
+
+
+class TestWatch:
+    """Test cases for watch_statements."""
+
+    def test_new_statement_is_parsed(self, workdir):
+        """Test that a dropped statement is parsed well within a second."""
+        parsers = {bank: parser_class() for bank, parser_class in PARSERS.items()}
+        runner = Runner(logging.getLogger("munim"))
+        output = workdir / "data" / "json" / "hdfc_apr.json"
+        polls = []
+
+        def stop():
+            polls.append(time.perf_counter())
+            if len(polls) == 2:
+                (workdir / "data" / "statement" / "hdfc_apr.csv").write_text(
+                    HDFC_STATEMENT, encoding="utf-8"
+                )
+            return output.exists() or len(polls) > 100
+
+        watch_statements(runner, parsers, StatementWatcher(), interval=0.02, stop=stop)
+        assert output.exists()
+        assert polls[-1] - polls[1] < 1.0
+        assert "UPI-SWIGGY-412345" in output.read_text(encoding="utf-8")
@@ -0,0 +1,58 @@
+"""Tests for streaming transaction writers."""
+import json
+from parser.writer import JsonLinesWriter, JsonWriter, read_transactions
+
+import pytest
+
+TRANSACTIONS = [
+    {"date": "2024-03-01", "description": "UPI-SWIGGY ₹", "dr_amount": 250.0},
+    {"date": "2024-03-02", "description": "line\nbreak", "dr_amount": 0.0},
+    {"date": "2024-03-03", "description": "POS DMART", "dr_amount": 1200.5},
+]
+
+
+class TestJsonWriter:
+    """Test cases for JsonWriter and JsonLinesWriter."""
+
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_matches_json_dump(self, tmp_path, count):
+        """Test that streamed output equals json.dump with indent=2."""
+        path = tmp_path / "out.json"
+        with JsonWriter(path) as writer:
+            writer.write_many(iter(TRANSACTIONS[:count]))
+        expected = json.dumps(TRANSACTIONS[:count], indent=2, ensure_ascii=False)
+        assert path.read_text(encoding="utf-8") == expected
+
+    def test_jsonl_round_trip(self, tmp_path):
+        """Test that JSON Lines output reads back unchanged."""
+        path = tmp_path / "out.jsonl"
+        with JsonLinesWriter(path) as writer:
+            assert writer.write_many(TRANSACTIONS) == 3
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+        assert list(read_transactions(path)) == TRANSACTIONS
+
+    def test_failure_keeps_previous_output(self, tmp_path):
+        """Test that an error while writing leaves the old output in place."""
+        path = tmp_path / "out.json"
+        path.write_text("[]", encoding="utf-8")
+        with pytest.raises(ValueError):
+            with JsonWriter(path) as writer:
+                writer.write(TRANSACTIONS[0])
+                raise ValueError("bad row")
+        assert path.read_text(encoding="utf-8") == "[]"
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.parametrize("writer_class", [JsonWriter, JsonLinesWriter])
+    def test_resume_from_checkpoint(self, tmp_path, writer_class):
+        """Test that a suspended output resumes at its last checkpoint."""
+        path = tmp_path / ("out" + writer_class.suffix)
+        writer = writer_class(path)
+        writer.write_many(TRANSACTIONS[:2])
+        offset = writer.checkpoint()
+        writer.write(TRANSACTIONS[2])
+        writer.suspend()
+        assert not path.exists()
+
+        with writer_class(path, offset, 2) as writer:
+            assert writer.write_many(TRANSACTIONS[2:]) == 3
+        assert list(read_transactions(path)) == TRANSACTIONS